@@ -43,5 +43,6 @@ setuptools.setup(
         "Programming Language :: Python :: 3.10",
     ],
     install_requires=["absl-py", "protobuf"],
+    extras_require={"arrays": ["numpy"]},
     python_requires='>=3.9',
 )
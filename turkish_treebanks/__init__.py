@@ -12,3 +12,40 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+"""Python API to read annotations of the Turkish Web Treebank (TWT)."""
+
+import importlib.util
+import sys
+
+
+def _import_lazily(name: str) -> None:
+  """Imports the module the first time one of its attributes is accessed.
+
+  Modules of the package import the module as usual (from the package), and
+  get the lazily imported module.
+
+  Args:
+    name: absolute name of the module.
+  """
+  if name in sys.modules:
+    return
+
+  spec = importlib.util.find_spec(name)
+  if spec is None or spec.loader is None:
+    return  # Importing the module raises the error on first use.
+
+  spec.loader = importlib.util.LazyLoader(spec.loader)
+  module = importlib.util.module_from_spec(spec)
+  sys.modules[name] = module
+  spec.loader.exec_module(module)
+  # Importing the module from its package finds it as an attribute of the
+  # package, without looking up its spec, which would load it.
+  package, _, attribute = name.rpartition(".")
+  setattr(sys.modules[package], attribute, module)
+
+
+# Protobuf module of the annotations imports the protobuf runtime, which would
+# dominate the import time of the package, but is not needed to read sentence
+# annotations in CoNLL-U format.
+_import_lazily(f"{__name__}.twt_pb2")
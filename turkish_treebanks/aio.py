@@ -0,0 +1,122 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Functions to read Turkish Web Treebank sentence annotations with asyncio.
+
+Treebank files are read and parsed in an executor, so that reading does not
+block the event loop.
+"""
+
+import asyncio
+import collections
+from concurrent import futures
+import itertools
+from typing import AsyncGenerator, Iterator, List, Optional
+
+from turkish_treebanks import read
+from turkish_treebanks import twt_pb2
+
+
+def _read_batch(sentences: Iterator[str], batch_size: int) -> List[str]:
+  """Reads the next batch of sentence annotations."""
+  return list(itertools.islice(sentences, batch_size))
+
+
+def _parse_batch(sentences: List[str]) -> List[twt_pb2.Sentence]:
+  """Parses a batch of sentence annotations into sentence protobufs.
+
+  Sentence annotations are already validated as they are read, so they are
+  not checked again.
+  """
+  return [read.from_conllu(s, validate=False) for s in sentences]
+
+
+async def sentences(
+    section: Optional[str] = None,
+    split: Optional[str] = None,
+    batch_size: int = 64,
+    max_in_flight: int = 4,
+    executor: Optional[futures.Executor] = None
+) -> AsyncGenerator[twt_pb2.Sentence, None]:
+  """Reads and yields sentences of Turkish Web Treebank as sentence protobufs.
+
+  Sentence annotations are read from treebank files in batches, and each batch
+  is parsed in the executor while following batches are read. At most
+  max_in_flight batches are read ahead of the consumer. Closing the generator,
+  or cancelling the task that iterates over it, cancels batches that are not
+  parsed yet.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentence
+        annotations will be read (could be either 'web' or 'wiki'). If
+        unspecified sentence annotations from both web and Wikipedia sections
+        will be read.
+    split: optional, treebank split whose sentence annotations will be read
+        (could be 'train', 'test', 'dev'). If unspecified sentence annotations
+        from all three splits will be read.
+    batch_size: optional, number of sentence annotations that are read and
+        parsed at a time.
+    max_in_flight: optional, maximum number of batches that are read or parsed
+        ahead of the consumer.
+    executor: optional, executor in which treebank files are read and sentence
+        annotations are parsed. If unspecified the default executor of the
+        event loop is used.
+
+  Raises:
+    ValueError: invalid section name or split specifier, invalid batch size
+        or number of batches in flight, or source treebank files from which
+        the sentence annotations are read is not valid with respect to the
+        CoNLL-U format.
+
+  Yields:
+    Sentence protobufs which contain annotations for the specified treebank
+    section and split, in the order they appear in the treebank files.
+  """
+  if batch_size < 1:
+    raise ValueError(f"Invalid batch size {batch_size}."
+                     f" It should be a positive integer.")
+
+  if max_in_flight < 1:
+    raise ValueError(f"Invalid number of batches in flight {max_in_flight}."
+                     f" It should be a positive integer.")
+
+  annotations = read.iter_conllu(section, split)
+  loop = asyncio.get_running_loop()
+  pending = collections.deque()
+  reading = None
+  try:
+    exhausted = False
+    while not exhausted or pending:
+      if pending and (exhausted or pending[0].done()
+                      or len(pending) >= max_in_flight):
+        for sentence in await pending.popleft():
+          yield sentence
+        continue
+
+      reading = loop.run_in_executor(executor, _read_batch, annotations,
+                                     batch_size)
+      batch = await reading
+      reading = None
+      if batch:
+        pending.append(loop.run_in_executor(executor, _parse_batch, batch))
+      else:
+        exhausted = True
+  finally:
+    for parsing in pending:
+      parsing.cancel()
+    # If the treebank file is still being read in the executor, it is closed
+    # once the annotations iterator is garbage collected instead.
+    if reading is None:
+      annotations.close()
@@ -0,0 +1,133 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.aio."""
+
+import asyncio
+import os
+from unittest import mock
+
+from turkish_treebanks import aio
+from turkish_treebanks import read
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+
+async def _read_all(*args, **kwargs):
+  return [s async for s in aio.sentences(*args, **kwargs)]
+
+
+class SentencesTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.enter_context(
+        mock.patch.dict(os.environ, {
+            "TURKISH_TREEBANKS_CACHE_DIR": self.create_tempdir().full_path,
+        }))
+    self.addCleanup(read.clear_cache)
+
+  @parameterized.parameters([(1, 1), (64, 4), (1000, 2)])
+  def test_reads_sentences(self, batch_size, max_in_flight):
+    expected = list(read.sentences("web", "dev", use_cache=False))
+    actual = asyncio.run(
+        _read_all(
+            "web", "dev", batch_size=batch_size, max_in_flight=max_in_flight))
+    self.assertEqual(expected, actual)
+
+  def test_validates_sentence_annotations_once(self):
+    with mock.patch.object(
+        read, "_validate_header", wraps=read._validate_header) as validate:
+      sentences = asyncio.run(_read_all("web", "dev"))
+    self.assertLen(validate.call_args_list, len(sentences))
+
+  def test_raises_exception_for_illformed_sentence_annotation(self):
+    treebank = self.create_tempfile(
+        "web.conllu", content="# sent_id = 1\n# text = a\n1\ta")
+    with mock.patch.dict(read._PATHS_BY_SECTION,
+                         {"web": treebank.full_path}):
+      with self.assertRaisesRegex(ValueError, "Illformed CoNNL-U format"):
+        asyncio.run(_read_all("web"))
+
+  def test_does_not_block_event_loop(self):
+    ticks = 0
+
+    async def _tick():
+      nonlocal ticks
+      while True:
+        ticks += 1
+        await asyncio.sleep(0)
+
+    async def _read_while_ticking():
+      ticker = asyncio.create_task(_tick())
+      sentences = await _read_all("web", "test")
+      ticker.cancel()
+      return sentences
+
+    self.assertLen(asyncio.run(_read_while_ticking()), 254)
+    self.assertGreater(ticks, 10)
+
+  def test_closes_mid_stream(self):
+
+    async def _read_first():
+      sentences = aio.sentences("web", batch_size=8)
+      first = await sentences.__anext__()
+      await sentences.aclose()
+      return first
+
+    self.assertEqual(next(read.sentences("web")), asyncio.run(_read_first()))
+
+  def test_cancels_mid_stream(self):
+
+    async def _cancel_after_first():
+      first = asyncio.Event()
+
+      async def _consume():
+        async for _ in aio.sentences("web", batch_size=8):
+          first.set()
+
+      task = asyncio.create_task(_consume())
+      await first.wait()
+      task.cancel()
+      await task
+
+    with self.assertRaises(asyncio.CancelledError):
+      asyncio.run(_cancel_after_first())
+
+  @parameterized.named_parameters([
+      {
+          "testcase_name": "InvalidSection",
+          "kwargs": {"section": "foo"},
+          "error": "Invalid section name 'foo'.",
+      },
+      {
+          "testcase_name": "InvalidBatchSize",
+          "kwargs": {"batch_size": 0},
+          "error": "Invalid batch size 0.",
+      },
+      {
+          "testcase_name": "InvalidMaxInFlight",
+          "kwargs": {"max_in_flight": 0},
+          "error": "Invalid number of batches in flight 0.",
+      },
+  ])
+  def test_raises_exception(self, kwargs, error):
+    with self.assertRaisesRegex(ValueError, error):
+      asyncio.run(_read_all(**kwargs))
+
+
+if __name__ == "__main__":
+  absltest.main()
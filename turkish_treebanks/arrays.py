@@ -0,0 +1,240 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar NumPy representation of Turkish Web Treebank sentences.
+
+Token annotations of all sentences are stored in flat arrays, one element per
+token, and sentences are delimited by offsets into them. String annotations
+are interned into sorted vocabularies and stored as integer ids. Features of
+tokens are stored in a CSR layout, delimited by per-token offsets.
+"""
+
+from typing import Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from turkish_treebanks import twt_pb2
+
+
+class Arrays(NamedTuple):
+  """Columnar annotations of a sequence of sentences.
+
+  Attributes:
+    sentence_id: identifier of each sentence.
+    text: raw text of each sentence.
+    sentence_offset: offsets of the first token of each sentence into the
+        token arrays, followed by the total number of tokens. Tokens of the
+        i-th sentence are in [sentence_offset[i], sentence_offset[i + 1]).
+    form: id of the surface form of each token in form_vocabulary.
+    lemma: id of the lemma of each token in lemma_vocabulary.
+    coarse: id of the coarse part-of-speech tag of each token in
+        coarse_vocabulary.
+    fine: id of the fine part-of-speech tag of each token in fine_vocabulary.
+    head: head of each token, as annotated (1-based index of the head token
+        within the sentence, or 0 for the root).
+    dependency_relation: id of the dependency relation of each token in
+        dependency_relation_vocabulary.
+    feature_offset: offsets of the first morphological feature of each token
+        into the feature arrays, followed by the total number of features.
+    feature_category: id of the category of each morphological feature in
+        feature_category_vocabulary.
+    feature_value: id of the value of each morphological feature in
+        feature_value_vocabulary.
+    misc_feature_offset: offsets of the first miscellaneous feature of each
+        token into the miscellaneous feature arrays, followed by the total
+        number of miscellaneous features.
+    misc_feature_category: id of the category of each miscellaneous feature in
+        feature_category_vocabulary.
+    misc_feature_value: id of the value of each miscellaneous feature in
+        feature_value_vocabulary.
+    form_vocabulary: sorted surface forms.
+    lemma_vocabulary: sorted lemmas.
+    coarse_vocabulary: sorted coarse part-of-speech tags.
+    fine_vocabulary: sorted fine part-of-speech tags.
+    dependency_relation_vocabulary: sorted dependency relations.
+    feature_category_vocabulary: sorted feature categories.
+    feature_value_vocabulary: sorted feature values.
+  """
+  sentence_id: np.ndarray
+  text: np.ndarray
+  sentence_offset: np.ndarray
+  form: np.ndarray
+  lemma: np.ndarray
+  coarse: np.ndarray
+  fine: np.ndarray
+  head: np.ndarray
+  dependency_relation: np.ndarray
+  feature_offset: np.ndarray
+  feature_category: np.ndarray
+  feature_value: np.ndarray
+  misc_feature_offset: np.ndarray
+  misc_feature_category: np.ndarray
+  misc_feature_value: np.ndarray
+  form_vocabulary: np.ndarray
+  lemma_vocabulary: np.ndarray
+  coarse_vocabulary: np.ndarray
+  fine_vocabulary: np.ndarray
+  dependency_relation_vocabulary: np.ndarray
+  feature_category_vocabulary: np.ndarray
+  feature_value_vocabulary: np.ndarray
+
+
+def _interned(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+  """Interns strings into a sorted vocabulary and ids into it."""
+  vocabulary, ids = np.unique(np.asarray(values, dtype=str),
+                              return_inverse=True)
+  return vocabulary, ids.astype(np.int32).reshape(-1)
+
+
+def _offsets(lengths: List[int]) -> np.ndarray:
+  """Converts lengths into offsets of a CSR layout."""
+  offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+  np.cumsum(lengths, out=offsets[1:])
+  return offsets
+
+
+def from_sentences(sentences: Iterable[twt_pb2.Sentence]) -> Arrays:
+  """Converts sentence protobufs into columnar annotations.
+
+  Annotations are collected into flat lists in a single pass over the
+  sentences, and then interned into vocabularies at once.
+
+  Args:
+    sentences: sentence protobufs.
+
+  Returns:
+    Columnar annotations of the sentences.
+  """
+  sentence_id, text, sentence_length = [], [], []
+  form, lemma, coarse, fine, head, dependency_relation = [], [], [], [], [], []
+  feature_length, misc_feature_length = [], []
+  category, value = [], []
+  misc_category, misc_value = [], []
+  for sentence in sentences:
+    sentence_id.append(sentence.sentence_id)
+    text.append(sentence.text)
+    sentence_length.append(len(sentence.token))
+    for token in sentence.token:
+      form.append(token.form)
+      lemma.append(token.lemma)
+      coarse.append(token.tag.coarse)
+      fine.append(token.tag.fine)
+      head.append(token.head)
+      dependency_relation.append(token.dependency_relation)
+      feature_length.append(len(token.feature))
+      for feature in token.feature:
+        category.append(feature.category)
+        value.append(feature.value)
+      misc_feature_length.append(len(token.misc_feature))
+      for feature in token.misc_feature:
+        misc_category.append(feature.category)
+        misc_value.append(feature.value)
+
+  form_vocabulary, form_ids = _interned(form)
+  lemma_vocabulary, lemma_ids = _interned(lemma)
+  coarse_vocabulary, coarse_ids = _interned(coarse)
+  fine_vocabulary, fine_ids = _interned(fine)
+  relation_vocabulary, relation_ids = _interned(dependency_relation)
+  category_vocabulary, category_ids = _interned(category + misc_category)
+  value_vocabulary, value_ids = _interned(value + misc_value)
+  return Arrays(
+      sentence_id=np.asarray(sentence_id, dtype=str),
+      text=np.asarray(text, dtype=str),
+      sentence_offset=_offsets(sentence_length),
+      form=form_ids,
+      lemma=lemma_ids,
+      coarse=coarse_ids,
+      fine=fine_ids,
+      head=np.asarray(head, dtype=np.int32),
+      dependency_relation=relation_ids,
+      feature_offset=_offsets(feature_length),
+      feature_category=category_ids[:len(category)],
+      feature_value=value_ids[:len(value)],
+      misc_feature_offset=_offsets(misc_feature_length),
+      misc_feature_category=category_ids[len(category):],
+      misc_feature_value=value_ids[len(value):],
+      form_vocabulary=form_vocabulary,
+      lemma_vocabulary=lemma_vocabulary,
+      coarse_vocabulary=coarse_vocabulary,
+      fine_vocabulary=fine_vocabulary,
+      dependency_relation_vocabulary=relation_vocabulary,
+      feature_category_vocabulary=category_vocabulary,
+      feature_value_vocabulary=value_vocabulary,
+  )
+
+
+def to_sentence(arrays: Arrays, index: int) -> twt_pb2.Sentence:
+  """Converts columnar annotations of a sentence back into a protobuf.
+
+  Args:
+    arrays: columnar annotations.
+    index: index of the sentence in the columnar annotations.
+
+  Returns:
+    Sentence protobuf which contains annotations of the sentence.
+  """
+
+  def _features(offset, category, value, token):
+    start, end = offset[token], offset[token + 1]
+    return (twt_pb2.Feature(
+        category=arrays.feature_category_vocabulary[c],
+        value=arrays.feature_value_vocabulary[v],
+    ) for c, v in zip(category[start:end], value[start:end]))
+
+  tokens = range(arrays.sentence_offset[index],
+                 arrays.sentence_offset[index + 1])
+  return twt_pb2.Sentence(
+      sentence_id=arrays.sentence_id[index],
+      text=arrays.text[index],
+      token=(twt_pb2.Token(
+          form=arrays.form_vocabulary[arrays.form[t]],
+          lemma=arrays.lemma_vocabulary[arrays.lemma[t]],
+          tag=twt_pb2.Tag(
+              coarse=arrays.coarse_vocabulary[arrays.coarse[t]],
+              fine=arrays.fine_vocabulary[arrays.fine[t]],
+          ),
+          feature=_features(arrays.feature_offset, arrays.feature_category,
+                            arrays.feature_value, t),
+          head=arrays.head[t],
+          dependency_relation=arrays.dependency_relation_vocabulary[
+              arrays.dependency_relation[t]],
+          misc_feature=_features(arrays.misc_feature_offset,
+                                 arrays.misc_feature_category,
+                                 arrays.misc_feature_value, t),
+      ) for t in tokens),
+  )
+
+
+def save(arrays: Arrays, path: str) -> None:
+  """Saves columnar annotations into a NumPy .npz file.
+
+  Args:
+    arrays: columnar annotations.
+    path: path to the .npz file.
+  """
+  np.savez(path, **arrays._asdict())
+
+
+def load(path: str) -> Arrays:
+  """Loads columnar annotations from a NumPy .npz file.
+
+  Args:
+    path: path to an .npz file that is written by save.
+
+  Returns:
+    Columnar annotations that are stored in the file.
+  """
+  with np.load(path, allow_pickle=False) as stored:
+    return Arrays(**{field: stored[field] for field in Arrays._fields})
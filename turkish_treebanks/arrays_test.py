@@ -0,0 +1,111 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.arrays."""
+
+import os
+
+import numpy as np
+
+from turkish_treebanks import arrays
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+
+_SENTENCES = (
+    twt_pb2.Sentence(
+        sentence_id="s1",
+        text="Kitap okudum.",
+        token=(
+            twt_pb2.Token(
+                form="Kitap",
+                lemma="kitap",
+                tag=twt_pb2.Tag(coarse="NOUN", fine="NN"),
+                feature=(
+                    twt_pb2.Feature(category="Case", value="Bare"),
+                    twt_pb2.Feature(category="Proper", value="False"),
+                ),
+                head=2,
+                dependency_relation="dobj",
+            ),
+            twt_pb2.Token(
+                form="okudum",
+                lemma="oku",
+                tag=twt_pb2.Tag(coarse="VERB", fine="VB"),
+                feature=(twt_pb2.Feature(category="Proper", value="False"),),
+                head=0,
+                dependency_relation="root",
+                misc_feature=(
+                    twt_pb2.Feature(category="SpaceAfter", value="No"),),
+            ),
+        ),
+    ),
+    twt_pb2.Sentence(
+        sentence_id="s2",
+        text="Evet",
+        token=(twt_pb2.Token(
+            form="Evet",
+            lemma="evet",
+            tag=twt_pb2.Tag(coarse="INTJ", fine="UH"),
+            head=0,
+            dependency_relation="root",
+        ),),
+    ),
+)
+
+
+class ArraysTest(absltest.TestCase):
+
+  def test_converts_sentences_into_columns(self):
+    actual = arrays.from_sentences(_SENTENCES)
+    np.testing.assert_array_equal(["s1", "s2"], actual.sentence_id)
+    np.testing.assert_array_equal([0, 2, 3], actual.sentence_offset)
+    np.testing.assert_array_equal(["Evet", "Kitap", "okudum"],
+                                  actual.form_vocabulary)
+    np.testing.assert_array_equal([1, 2, 0], actual.form)
+    np.testing.assert_array_equal([2, 0, 0], actual.head)
+    np.testing.assert_array_equal(["dobj", "root"],
+                                  actual.dependency_relation_vocabulary)
+    np.testing.assert_array_equal([0, 1, 1], actual.dependency_relation)
+    np.testing.assert_array_equal([0, 2, 3, 3], actual.feature_offset)
+    np.testing.assert_array_equal(["Case", "Proper", "SpaceAfter"],
+                                  actual.feature_category_vocabulary)
+    np.testing.assert_array_equal([0, 1, 1], actual.feature_category)
+    np.testing.assert_array_equal([0, 0, 1, 1], actual.misc_feature_offset)
+    np.testing.assert_array_equal([2], actual.misc_feature_category)
+
+  def test_converts_columns_back_into_sentences(self):
+    actual = arrays.from_sentences(_SENTENCES)
+    for index, expected in enumerate(_SENTENCES):
+      self.assertEqual(expected, arrays.to_sentence(actual, index))
+
+  def test_converts_no_sentences(self):
+    actual = arrays.from_sentences([])
+    self.assertEmpty(actual.sentence_id)
+    np.testing.assert_array_equal([0], actual.sentence_offset)
+    self.assertEmpty(actual.form)
+
+  def test_saves_and_loads(self):
+    path = os.path.join(self.create_tempdir().full_path, "arrays.npz")
+    expected = arrays.from_sentences(_SENTENCES)
+    arrays.save(expected, path)
+    actual = arrays.load(path)
+    for field in arrays.Arrays._fields:
+      np.testing.assert_array_equal(
+          getattr(expected, field), getattr(actual, field), err_msg=field)
+
+
+if __name__ == "__main__":
+  absltest.main()
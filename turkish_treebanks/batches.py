@@ -0,0 +1,215 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Length-bucketed padded batches of Turkish Web Treebank sentences.
+
+Sentences are grouped into buckets by their length, and each bucket is cut
+into batches whose padded size (number of sentences times the upper bound of
+the length of the bucket) is within a token budget, so that little of the
+batch is padding. Batches are gathered from the columnar arrays of
+turkish_treebanks.arrays, so that sentences are parsed once and batched again
+in each epoch.
+
+Batching is deterministic. Without a shuffle seed batches follow the order of
+the sentences, and with a seed both the sentences within buckets and the order
+of batches are shuffled with a random generator that is seeded by the seed and
+the epoch.
+"""
+
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from turkish_treebanks import arrays as arrays_lib
+
+DEFAULT_BUCKETS = (8, 16, 32, 64, 128)
+
+# Token annotations that are gathered into padded arrays of batches.
+_PADDED_FIELDS = ("form", "lemma", "coarse", "fine", "head",
+                  "dependency_relation")
+
+
+class Batch(NamedTuple):
+  """Padded token annotations of a batch of sentences.
+
+  Token arrays are of shape [sentences, length], where length is that of the
+  longest sentence of the batch, and padded with zeros.
+
+  Attributes:
+    sentence_index: index of each sentence of the batch in the columnar
+        arrays.
+    length: number of tokens of each sentence.
+    mask: whether each element of the token arrays is a token of the sentence
+        rather than padding.
+    form: id of the surface form of each token in form_vocabulary of the
+        columnar arrays.
+    lemma: id of the lemma of each token in lemma_vocabulary.
+    coarse: id of the coarse part-of-speech tag of each token in
+        coarse_vocabulary.
+    fine: id of the fine part-of-speech tag of each token in fine_vocabulary.
+    head: head of each token, as annotated (1-based index of the head token
+        within the sentence, or 0 for the root).
+    dependency_relation: id of the dependency relation of each token in
+        dependency_relation_vocabulary.
+  """
+  sentence_index: np.ndarray
+  length: np.ndarray
+  mask: np.ndarray
+  form: np.ndarray
+  lemma: np.ndarray
+  coarse: np.ndarray
+  fine: np.ndarray
+  head: np.ndarray
+  dependency_relation: np.ndarray
+
+
+def _check_arguments(max_tokens: int, buckets: Sequence[int],
+                     epochs: Optional[int]) -> None:
+  """Checks if batching arguments are valid.
+
+  Raises:
+    ValueError: invalid token budget, bucket boundaries or number of epochs.
+  """
+  if max_tokens < 1:
+    raise ValueError(f"Invalid token budget {max_tokens}."
+                     f" It should be a positive integer.")
+  if (not buckets or buckets[0] < 1
+      or any(a >= b for a, b in zip(buckets, buckets[1:]))):
+    raise ValueError(f"Invalid buckets {list(buckets)}. They should be strictly"
+                     f" increasing positive sentence lengths.")
+  if epochs is not None and epochs < 1:
+    raise ValueError(f"Invalid number of epochs {epochs}."
+                     f" It should be a positive integer or None.")
+
+
+def batch_indices(length: np.ndarray,
+                  max_tokens: int,
+                  buckets: Sequence[int] = DEFAULT_BUCKETS,
+                  shuffle_seed: Optional[int] = None,
+                  epoch: int = 0) -> List[np.ndarray]:
+  """Groups sentences into length-bucketed batches.
+
+  Args:
+    length: number of tokens of each sentence.
+    max_tokens: token budget of a batch. Each batch of a bucket has at most
+        max_tokens // bound sentences, where bound is the upper bound of the
+        length of the sentences of the bucket, and sentences that are longer
+        than the last bucket boundary are bounded by the longest sentence.
+        Sentences that are longer than the budget are batched on their own.
+    buckets: strictly increasing upper bounds of the length of the sentences
+        of each bucket.
+    shuffle_seed: optional, seed of the shuffling of sentences and batches.
+        If unspecified sentences are not shuffled.
+    epoch: epoch whose batches are formed, which seeds the shuffling together
+        with the shuffle seed.
+
+  Returns:
+    Indices of the sentences of each batch, in the order of the batches.
+  """
+  length = np.asarray(length, dtype=np.int64)
+  order = np.arange(len(length))
+  random = None
+  if shuffle_seed is not None:
+    random = np.random.default_rng([shuffle_seed, epoch])
+    order = random.permutation(order)
+
+  bound = np.append(np.asarray(buckets, dtype=np.int64),
+                    max(length.max(initial=0), buckets[-1]))
+  bucket = np.searchsorted(bound, length[order])
+  order = order[np.argsort(bucket, kind="stable")]
+  bucket_sizes = np.bincount(bucket, minlength=len(bound))
+
+  batches = []
+  start = 0
+  for bucket_bound, bucket_size in zip(bound, bucket_sizes):
+    batch_size = max(1, max_tokens // int(bucket_bound))
+    members = order[start:start + bucket_size]
+    start += bucket_size
+    batches.extend(members[i:i + batch_size]
+                   for i in range(0, bucket_size, batch_size))
+
+  if random is None:
+    batches.sort(key=lambda b: b[0])
+  else:
+    batches = [batches[i] for i in random.permutation(len(batches))]
+  return batches
+
+
+def padded(arrays: arrays_lib.Arrays, sentence_index: np.ndarray) -> Batch:
+  """Gathers token annotations of sentences into padded arrays.
+
+  Args:
+    arrays: columnar annotations.
+    sentence_index: indices of the sentences of the batch in the columnar
+        annotations.
+
+  Returns:
+    Padded token annotations of the sentences.
+  """
+  sentence_index = np.asarray(sentence_index, dtype=np.int64)
+  start = arrays.sentence_offset[sentence_index]
+  length = arrays.sentence_offset[sentence_index + 1] - start
+  column = np.arange(length.max(initial=0))
+  mask = column < length[:, np.newaxis]
+  position = np.where(mask, start[:, np.newaxis] + column, 0)
+  return Batch(
+      sentence_index=sentence_index,
+      length=length,
+      mask=mask,
+      **{
+          field: np.where(mask, getattr(arrays, field)[position], 0)
+          for field in _PADDED_FIELDS
+      })
+
+
+def from_arrays(arrays: arrays_lib.Arrays,
+                max_tokens: int,
+                buckets: Optional[Sequence[int]] = None,
+                shuffle_seed: Optional[int] = None,
+                epochs: Optional[int] = 1) -> Iterator[Batch]:
+  """Batches sentences of columnar annotations across epochs.
+
+  See batch_indices for how sentences are batched.
+
+  Args:
+    arrays: columnar annotations.
+    max_tokens: token budget of a batch.
+    buckets: optional, strictly increasing upper bounds of the length of the
+        sentences of each bucket. If unspecified DEFAULT_BUCKETS are used.
+    shuffle_seed: optional, seed of the shuffling of sentences and batches.
+        If unspecified sentences are not shuffled.
+    epochs: optional, number of passes over the sentences. If None batches are
+        yielded indefinitely.
+
+  Raises:
+    ValueError: invalid token budget, bucket boundaries or number of epochs.
+
+  Returns:
+    Iterator over padded batches of all of the sentences in each epoch, one
+    epoch after the other.
+  """
+  buckets = tuple(DEFAULT_BUCKETS if buckets is None else buckets)
+  _check_arguments(max_tokens, buckets, epochs)
+  length = np.diff(arrays.sentence_offset)
+
+  def _batches() -> Iterator[Batch]:
+    epoch = 0
+    while epochs is None or epoch < epochs:
+      for sentence_index in batch_indices(length, max_tokens, buckets,
+                                          shuffle_seed, epoch):
+        yield padded(arrays, sentence_index)
+      epoch += 1
+
+  return _batches()
@@ -0,0 +1,134 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.batches."""
+
+import itertools
+
+import numpy as np
+from turkish_treebanks import arrays
+from turkish_treebanks import batches
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+# Lengths of the sentences, which span all of the buckets below.
+_LENGTHS = [3, 1, 7, 2, 12, 4, 5, 9, 1, 6, 3, 15, 2, 8]
+_BUCKETS = (2, 4, 8)
+
+
+def _arrays():
+  return arrays.from_sentences(
+      twt_pb2.Sentence(
+          sentence_id=f"s{i}",
+          token=[
+              twt_pb2.Token(form=f"w{i}.{t}", head=t, lemma="l",
+                            dependency_relation="dep")
+              for t in range(length)
+          ]) for i, length in enumerate(_LENGTHS))
+
+
+class BatchesTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.arrays = _arrays()
+
+  @parameterized.parameters(None, 7)
+  def test_batches_each_sentence_once_per_epoch(self, shuffle_seed):
+    epochs = list(
+        batches.from_arrays(self.arrays, 16, _BUCKETS, shuffle_seed, epochs=2))
+    indices = np.concatenate([b.sentence_index for b in epochs])
+    self.assertLen(indices, 2 * len(_LENGTHS))
+    self.assertCountEqual(range(len(_LENGTHS)), indices[:len(_LENGTHS)])
+    self.assertCountEqual(range(len(_LENGTHS)), indices[len(_LENGTHS):])
+
+  def test_batches_within_token_budget(self):
+    for batch in batches.from_arrays(self.arrays, 16, _BUCKETS):
+      if len(batch.sentence_index) > 1:
+        self.assertLessEqual(batch.mask.size, 16)
+
+  def test_batches_sentences_of_same_bucket(self):
+    for batch in batches.from_arrays(self.arrays, 16, _BUCKETS, 3):
+      buckets = np.searchsorted(_BUCKETS, batch.length)
+      self.assertLen(set(buckets.tolist()), 1)
+
+  def test_batches_long_sentences_on_their_own(self):
+    long_batches = [
+        b for b in batches.from_arrays(self.arrays, 10, _BUCKETS)
+        if b.length.max() > 10
+    ]
+    self.assertEqual([[4], [11]], [b.sentence_index.tolist()
+                                   for b in long_batches])
+
+  def test_batches_in_order_of_sentences_without_shuffle_seed(self):
+    first = [
+        b.sentence_index[0] for b in batches.from_arrays(self.arrays, 16,
+                                                         _BUCKETS)
+    ]
+    self.assertEqual(sorted(first), first)
+
+  def test_pads_token_annotations(self):
+    batch = batches.padded(self.arrays, np.array([1, 0]))
+    np.testing.assert_array_equal([1, 3], batch.length)
+    np.testing.assert_array_equal([[True, False, False], [True, True, True]],
+                                  batch.mask)
+    np.testing.assert_array_equal([[0, 0, 0], [0, 1, 2]], batch.head)
+    forms = self.arrays.form_vocabulary[batch.form]
+    np.testing.assert_array_equal(["w1.0", "w0.0", "w0.1", "w0.2"],
+                                  forms[batch.mask])
+    self.assertTrue(np.all(batch.form[~batch.mask] == 0))
+
+  def test_is_deterministic_under_shuffle_seed(self):
+
+    def _indices(seed):
+      return [
+          b.sentence_index.tolist()
+          for b in batches.from_arrays(self.arrays, 16, _BUCKETS, seed, 3)
+      ]
+
+    self.assertEqual(_indices(5), _indices(5))
+    self.assertNotEqual(_indices(5), _indices(6))
+
+  def test_shuffles_each_epoch_differently(self):
+    first, second = (
+        batches.batch_indices(np.diff(self.arrays.sentence_offset), 16,
+                              _BUCKETS, 5, epoch) for epoch in (0, 1))
+    self.assertNotEqual([b.tolist() for b in first],
+                        [b.tolist() for b in second])
+
+  def test_batches_indefinitely(self):
+    batched = batches.from_arrays(self.arrays, 16, _BUCKETS, 1, epochs=None)
+    self.assertLen(list(itertools.islice(batched, 100)), 100)
+
+  def test_batches_no_sentences(self):
+    self.assertEmpty(list(batches.from_arrays(arrays.from_sentences([]), 16)))
+
+  @parameterized.parameters(
+      (0, _BUCKETS, 1, "Invalid token budget"),
+      (16, (), 1, "Invalid buckets"),
+      (16, (4, 4), 1, "Invalid buckets"),
+      (16, (0, 4), 1, "Invalid buckets"),
+      (16, _BUCKETS, 0, "Invalid number of epochs"),
+  )
+  def test_raises_exception_for_invalid_arguments(self, max_tokens, buckets,
+                                                  epochs, message):
+    with self.assertRaisesRegex(ValueError, message):
+      batches.from_arrays(self.arrays, max_tokens, buckets, epochs=epochs)
+
+
+if __name__ == "__main__":
+  absltest.main()
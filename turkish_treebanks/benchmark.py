@@ -0,0 +1,403 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Benchmarks throughput and memory usage of reading the treebank.
+
+Each benchmark runs in a fresh process for each section, split and scale, and
+reports the number of sentences and tokens read per second, the time it takes
+to read the first sentence, and the peak resident memory of the process.
+Synthetic treebanks are built by replicating the sentences of the treebank
+files as many times as the scale.
+
+Results are written as JSON, and can be compared against the results of an
+earlier run, in which case the benchmark fails if throughput of any of the
+benchmarks regresses more than the tolerance.
+
+Time it takes to import the read module in a fresh process is also reported,
+and the benchmark fails if it exceeds the maximum import time when one is
+given.
+
+Usage:
+
+  bazel run -c opt //turkish_treebanks:benchmark -- \
+      --sections=web,wiki --scales=1,10 --output=/tmp/results.json
+  python -m turkish_treebanks.benchmark --baseline=/tmp/results.json \
+      --max_import_ms=20
+"""
+
+from concurrent import futures
+import contextlib
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import (Callable, Dict, Iterable, Iterator, List, NamedTuple,
+                    Optional, Sequence)
+
+from absl import app
+from absl import flags
+
+from turkish_treebanks import read
+
+# pylint: disable=protected-access
+# Private hot paths of the read module are benchmarked individually.
+_parse_sentence = read._parse_sentence
+_validate_sentence = read._validate_sentence
+# Synthetic treebank files are read in place of the ones of sections.
+_PATHS_BY_SECTION = read._PATHS_BY_SECTION
+# pylint: enable=protected-access
+
+_CACHE_DIR_ENV_VAR = "TURKISH_TREEBANKS_CACHE_DIR"
+# Measures the time it takes to import the read module, in seconds.
+_IMPORT_CODE = """
+import time
+start = time.perf_counter()
+import turkish_treebanks.read
+print(time.perf_counter() - start)
+"""
+
+_BENCHMARKS = flags.DEFINE_list(
+    "benchmarks", ["as_conllu", "sentences", "validate", "decompose"],
+    "Benchmarks to run.")
+_SECTIONS = flags.DEFINE_list("sections", ["web", "wiki"],
+                              "Treebank sections to read.")
+_SPLITS = flags.DEFINE_list("splits", ["all", "train", "dev", "test"],
+                            "Treebank splits to read, 'all' for no split.")
+_SCALES = flags.DEFINE_list(
+    "scales", ["1"],
+    "Number of times the sentences of the treebank files are replicated.")
+_OUTPUT = flags.DEFINE_string("output", None,
+                              "Path to the JSON file to write results into.")
+_BASELINE = flags.DEFINE_string(
+    "baseline", None, "Path to the JSON results file to compare results to.")
+_TOLERANCE = flags.DEFINE_float(
+    "tolerance", 0.1,
+    "Fraction by which throughput may regress relative to the baseline.")
+_MAX_IMPORT_MS = flags.DEFINE_float(
+    "max_import_ms", None,
+    "Maximum time it may take to import the read module, in milliseconds.")
+_IMPORT_REPEATS = flags.DEFINE_integer(
+    "import_repeats", 5,
+    "Number of fresh processes the import time is measured in.")
+
+
+class Result(NamedTuple):
+  """Measurements of a single benchmark run."""
+  benchmark: str
+  section: str
+  split: str
+  scale: int
+  sentences: int
+  tokens: int
+  seconds: float
+  sentences_per_second: float
+  tokens_per_second: float
+  time_to_first_sentence_seconds: float
+  peak_rss_bytes: int
+
+
+def _peak_rss_bytes() -> int:
+  """Returns the peak resident memory of the process."""
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _token_count(sentence: str) -> int:
+  """Counts the tokens of a CoNLL-U format sentence annotation."""
+  return sentence.count("\n") - 1
+
+
+def _as_conllu(section: str, split: Optional[str]) -> Iterator[int]:
+  """Reads the treebank as a single CoNLL-U string."""
+  conllu = read.as_conllu(section, split)
+  for sentence in conllu.split("\n\n") if conllu else ():
+    yield _token_count(sentence)
+
+
+def _iter_conllu(section: str, split: Optional[str]) -> Iterator[int]:
+  """Reads the treebank incrementally as CoNLL-U sentence annotations."""
+  for sentence in read.iter_conllu(section, split):
+    yield _token_count(sentence)
+
+
+def _sentences(section: str, split: Optional[str]) -> Iterator[int]:
+  """Reads and parses the treebank into sentence protobufs."""
+  for sentence in read.sentences(section, split, use_cache=False):
+    yield len(sentence.token)
+
+
+def _cached_sentences(section: str, split: Optional[str]) -> Iterator[int]:
+  """Reads sentence protobufs of the treebank from the on disk cache."""
+  for sentence in read.sentences(section, split):
+    yield len(sentence.token)
+
+
+def _validated_token_count(sentence: str) -> int:
+  """Validates a CoNLL-U sentence annotation and counts its tokens."""
+  _validate_sentence(sentence)
+  return _token_count(sentence)
+
+
+def _validate(section: str, split: Optional[str]) -> Iterator[int]:
+  """Validates CoNLL-U sentence annotations of the treebank."""
+  sentences = list(read.iter_conllu(section, split))
+  return (_validated_token_count(s) for s in sentences)
+
+
+def _decompose(section: str, split: Optional[str]) -> Iterator[int]:
+  """Validates and parses CoNLL-U sentence annotations into protobufs."""
+  sentences = list(read.iter_conllu(section, split))
+  return (len(_parse_sentence(s).token) for s in sentences)
+
+
+# Benchmarked functions, which return an iterator over the number of tokens of
+# each sentence. Only iterating is measured, so functions that are not
+# generators can prepare their input beforehand.
+_FUNCTIONS: Dict[str, Callable[[str, Optional[str]], Iterator[int]]] = {
+    "as_conllu": _as_conllu,
+    "iter_conllu": _iter_conllu,
+    "sentences": _sentences,
+    "cached_sentences": _cached_sentences,
+    "validate": _validate,
+    "decompose": _decompose,
+}
+
+
+def run(benchmark: str, section: str, split: str, scale: int) -> Result:
+  """Runs a benchmark in the current process.
+
+  Args:
+    benchmark: name of the benchmark.
+    section: section of the treebank to read (could be either 'web' or
+        'wiki').
+    split: split of the treebank to read (could be 'train', 'dev', 'test' or
+        'all').
+    scale: number of times sentences of the treebank are replicated.
+
+  Raises:
+    ValueError: invalid benchmark name.
+
+  Returns:
+    Measurements of the benchmark run.
+  """
+  if benchmark not in _FUNCTIONS:
+    raise ValueError(f"Invalid benchmark name '{benchmark}'. It can only be"
+                     f" one of: {', '.join(_FUNCTIONS)}.")
+
+  with _synthetic_treebank(section, scale):
+    if benchmark == "cached_sentences":
+      read.build_cache(section)
+
+    token_counts = _FUNCTIONS[benchmark](section,
+                                         None if split == "all" else split)
+    start = time.perf_counter()
+    sentences = tokens = 0
+    time_to_first_sentence = 0.0
+    for token_count in token_counts:
+      if not sentences:
+        time_to_first_sentence = time.perf_counter() - start
+      sentences += 1
+      tokens += token_count
+    seconds = time.perf_counter() - start
+
+  return Result(
+      benchmark=benchmark,
+      section=section,
+      split=split,
+      scale=scale,
+      sentences=sentences,
+      tokens=tokens,
+      seconds=seconds,
+      sentences_per_second=sentences / seconds,
+      tokens_per_second=tokens / seconds,
+      time_to_first_sentence_seconds=time_to_first_sentence,
+      peak_rss_bytes=_peak_rss_bytes(),
+  )
+
+
+def _replicated(path: str, scale: int, directory: str) -> str:
+  """Writes a treebank file that replicates sentences of the file at path."""
+  replicated_path = os.path.join(directory, os.path.basename(path))
+  with open(path, "rb") as reader, open(replicated_path, "wb") as writer:
+    for _ in range(scale):
+      reader.seek(0)
+      shutil.copyfileobj(reader, writer)
+      writer.write(b"\n\n")
+  return replicated_path
+
+
+@contextlib.contextmanager
+def _synthetic_treebank(section: str, scale: int) -> Iterator[None]:
+  """Reads the section from a replicated treebank file within the context.
+
+  Parsed sentences are also cached into a temporary directory within the
+  context.
+
+  Args:
+    section: section of the treebank (could be either 'web' or 'wiki').
+    scale: number of times sentences of the treebank file are replicated.
+
+  Yields:
+    Nothing.
+  """
+  original_path = _PATHS_BY_SECTION[section]
+  original_cache_dir = os.environ.get(_CACHE_DIR_ENV_VAR)
+  with tempfile.TemporaryDirectory() as directory:
+    try:
+      if scale > 1:
+        _PATHS_BY_SECTION[section] = _replicated(original_path, scale,
+                                                 directory)
+      os.environ[_CACHE_DIR_ENV_VAR] = directory
+      yield
+    finally:
+      _PATHS_BY_SECTION[section] = original_path
+      if original_cache_dir is None:
+        del os.environ[_CACHE_DIR_ENV_VAR]
+      else:
+        os.environ[_CACHE_DIR_ENV_VAR] = original_cache_dir
+
+
+def run_isolated(benchmark: str, section: str, split: str,
+                 scale: int) -> Result:
+  """Runs a benchmark in a fresh process, so that its peak memory is isolated.
+
+  See run.
+  """
+  context = multiprocessing.get_context("spawn")
+  with futures.ProcessPoolExecutor(max_workers=1,
+                                   mp_context=context) as executor:
+    return executor.submit(run, benchmark, section, split, scale).result()
+
+
+def import_seconds(repeats: int = 5) -> float:
+  """Measures the time it takes to import the read module in fresh processes.
+
+  Args:
+    repeats: number of fresh processes the import time is measured in.
+
+  Raises:
+    ValueError: invalid number of repeats.
+
+  Returns:
+    Minimum import time across the processes in seconds, since noise only
+    adds to it.
+  """
+  if repeats < 1:
+    raise ValueError(f"Invalid number of repeats {repeats}.")
+
+  environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+  seconds = []
+  for _ in range(repeats):
+    completed = subprocess.run([sys.executable, "-c", _IMPORT_CODE],
+                               check=True,
+                               capture_output=True,
+                               text=True,
+                               env=environment)
+    seconds.append(float(completed.stdout))
+  return min(seconds)
+
+
+def find_regressions(results: Iterable[Result], baseline: Iterable[Result],
+                     tolerance: float) -> List[str]:
+  """Finds benchmarks whose throughput regressed relative to the baseline.
+
+  Args:
+    results: measurements of the benchmark runs.
+    baseline: measurements of earlier benchmark runs to compare to. Runs that
+        do not have a matching baseline run are not compared.
+    tolerance: fraction by which throughput may regress.
+
+  Returns:
+    Descriptions of the regressions.
+  """
+  baseline_by_key = {(b.benchmark, b.section, b.split, b.scale): b
+                     for b in baseline}
+  regressions = []
+  for result in results:
+    key = (result.benchmark, result.section, result.split, result.scale)
+    expected = baseline_by_key.get(key)
+    if expected is None:
+      continue
+    minimum = expected.sentences_per_second * (1 - tolerance)
+    if result.sentences_per_second < minimum:
+      regressions.append(
+          f"{'/'.join(str(k) for k in key)}: {result.sentences_per_second:.1f}"
+          f" sentences/sec, baseline {expected.sentences_per_second:.1f}")
+  return regressions
+
+
+def load_results(path: str) -> List[Result]:
+  """Loads benchmark results from a JSON file."""
+  with open(path, "r", encoding="utf-8") as reader:
+    return [Result(**r) for r in json.load(reader)]
+
+
+def save_results(results: Sequence[Result], path: str) -> None:
+  """Saves benchmark results into a JSON file."""
+  with open(path, "w", encoding="utf-8") as writer:
+    json.dump([r._asdict() for r in results], writer, indent=2)
+
+
+def _run_all() -> List[Result]:
+  """Runs the benchmarks of the flags in fresh processes, printing results."""
+  results = []
+  for benchmark in _BENCHMARKS.value:
+    for section in _SECTIONS.value:
+      for split in _SPLITS.value:
+        for scale in (int(s) for s in _SCALES.value):
+          result = run_isolated(benchmark, section, split, scale)
+          results.append(result)
+          print(f"{benchmark:>16} {section:>4} {split:>5} x{scale:<4}"
+                f" {result.sentences_per_second:>10.1f} sentences/sec"
+                f" {result.tokens_per_second:>11.1f} tokens/sec"
+                f" {result.time_to_first_sentence_seconds * 1000:>9.2f} ms"
+                f" to first sentence"
+                f" {result.peak_rss_bytes / (1 << 20):>8.1f} MiB peak RSS")
+  return results
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError("Too many command-line arguments.")
+
+  import_ms = import_seconds(_IMPORT_REPEATS.value) * 1000
+  print(f"Imported read module in {import_ms:.2f} ms")
+
+  results = _run_all()
+
+  if _OUTPUT.value:
+    save_results(results, _OUTPUT.value)
+
+  regressions = []
+  if _BASELINE.value:
+    regressions.extend(
+        find_regressions(results, load_results(_BASELINE.value),
+                         _TOLERANCE.value))
+  if _MAX_IMPORT_MS.value is not None and import_ms > _MAX_IMPORT_MS.value:
+    regressions.append(f"import: {import_ms:.2f} ms, maximum"
+                       f" {_MAX_IMPORT_MS.value:.2f} ms")
+  for regression in regressions:
+    print(f"Regression: {regression}")
+  if regressions:
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+  app.run(main)
@@ -0,0 +1,92 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.benchmark."""
+
+import os
+
+from turkish_treebanks import benchmark
+from turkish_treebanks import read
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+
+def _result(benchmark_name: str, sentences_per_second: float):
+  return benchmark.Result(
+      benchmark=benchmark_name,
+      section="web",
+      split="dev",
+      scale=1,
+      sentences=254,
+      tokens=3260,
+      seconds=1.0,
+      sentences_per_second=sentences_per_second,
+      tokens_per_second=3260.0,
+      time_to_first_sentence_seconds=0.001,
+      peak_rss_bytes=1 << 20,
+  )
+
+
+class BenchmarkTest(parameterized.TestCase):
+
+  @parameterized.parameters(["as_conllu", "iter_conllu", "sentences",
+                             "cached_sentences", "validate", "decompose"])
+  def test_runs_benchmark(self, benchmark_name):
+    result = benchmark.run(benchmark_name, "web", "dev", scale=1)
+    self.assertEqual(254, result.sentences)
+    self.assertEqual(3260, result.tokens)
+    self.assertGreater(result.sentences_per_second, 0)
+    self.assertGreater(result.peak_rss_bytes, 0)
+
+  def test_runs_benchmark_on_synthetic_treebank(self):
+    path = read._PATHS_BY_SECTION["web"]
+    result = benchmark.run("iter_conllu", "web", "all", scale=3)
+    self.assertEqual(3 * 2541, result.sentences)
+    self.assertEqual(3 * 32422, result.tokens)
+    self.assertEqual(path, read._PATHS_BY_SECTION["web"])
+
+  def test_raises_exception_for_invalid_benchmark(self):
+    with self.assertRaisesRegex(ValueError, "Invalid benchmark name 'foo'."):
+      benchmark.run("foo", "web", "dev", scale=1)
+
+  def test_measures_import_time(self):
+    self.assertGreater(benchmark.import_seconds(repeats=2), 0)
+
+  def test_raises_exception_for_invalid_import_repeats(self):
+    with self.assertRaisesRegex(ValueError, "Invalid number of repeats 0."):
+      benchmark.import_seconds(repeats=0)
+
+  def test_finds_regressions(self):
+    baseline = [_result("sentences", 100.0), _result("decompose", 100.0)]
+    results = [
+        _result("sentences", 95.0),
+        _result("decompose", 85.0),
+        _result("validate", 1.0),
+    ]
+    regressions = benchmark.find_regressions(results, baseline, tolerance=0.1)
+    self.assertEqual(
+        ["decompose/web/dev/1: 85.0 sentences/sec, baseline 100.0"],
+        regressions)
+
+  def test_saves_and_loads_results(self):
+    path = os.path.join(self.create_tempdir().full_path, "results.json")
+    results = [_result("sentences", 100.0), _result("decompose", 50.0)]
+    benchmark.save_results(results, path)
+    self.assertEqual(results, benchmark.load_results(path))
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,188 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact in-memory representation of Turkish Web Treebank sentences.
+
+Sentences and tokens are plain objects with __slots__ instead of protobufs.
+Annotation strings are interned, and tags and feature tuples that are equal
+are shared between tokens, so that repeating annotations (such as the
+'Proper=False' feature) are stored only once.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Dict, Sequence, Tuple
+
+from turkish_treebanks import mapped
+from turkish_treebanks import twt_pb2
+
+Feature = mapped.Feature
+Tag = mapped.Tag
+
+
+class Interner:
+  """Interns annotation strings and shares equal tags and features."""
+
+  __slots__ = ("_tags", "_features")
+
+  def __init__(self):
+    self._tags: Dict[Tuple[str, str], Tag] = {}
+    self._features: Dict[str, Tuple[Feature, ...]] = {}
+
+  def string(self, value: str) -> str:
+    """Returns the interned copy of the string."""
+    return sys.intern(value)
+
+  def tag(self, coarse: str, fine: str) -> Tag:
+    """Returns the shared tag with given part-of-speech tags."""
+    tag = self._tags.get((coarse, fine))
+    if tag is None:
+      tag = Tag(self.string(coarse), self.string(fine))
+      self._tags[coarse, fine] = tag
+    return tag
+
+  def features(self, raw_features: str) -> Tuple[Feature, ...]:
+    """Returns the shared features parsed from CoNLL-U format annotation."""
+    features = self._features.get(raw_features)
+    if features is None:
+      features = tuple(
+          Feature(*(self.string(s) for s in f.split("=")))
+          for f in raw_features.split("|")
+          if f != "_")
+      self._features[self.string(raw_features)] = features
+    return features
+
+  def proto_features(
+      self, features: Sequence[twt_pb2.Feature]) -> Tuple[Feature, ...]:
+    """Returns the shared features equivalent to feature protobufs."""
+    raw_features = "|".join(f"{f.category}={f.value}" for f in features)
+    return self.features(raw_features or "_")
+
+
+class Token:
+  """Token annotations, see twt_pb2.Token."""
+
+  __slots__ = ("form", "lemma", "tag", "feature", "head",
+               "dependency_relation", "misc_feature")
+
+  def __init__(self, form: str, lemma: str, tag: Tag,
+               feature: Tuple[Feature, ...], head: int,
+               dependency_relation: str, misc_feature: Tuple[Feature, ...]):
+    self.form = form
+    self.lemma = lemma
+    self.tag = tag
+    self.feature = feature
+    self.head = head
+    self.dependency_relation = dependency_relation
+    self.misc_feature = misc_feature
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, Token):
+      return NotImplemented
+    return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+  def __repr__(self) -> str:
+    fields = ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+    return f"Token({fields})"
+
+  def to_proto(self) -> twt_pb2.Token:
+    """Converts the token into a token protobuf."""
+    return twt_pb2.Token(
+        form=self.form,
+        lemma=self.lemma,
+        tag=twt_pb2.Tag(coarse=self.tag.coarse, fine=self.tag.fine),
+        feature=(twt_pb2.Feature(category=c, value=v)
+                 for c, v in self.feature),
+        head=self.head,
+        dependency_relation=self.dependency_relation,
+        misc_feature=(twt_pb2.Feature(category=c, value=v)
+                      for c, v in self.misc_feature),
+    )
+
+
+class Sentence:
+  """Sentence annotations, see twt_pb2.Sentence."""
+
+  __slots__ = ("sentence_id", "text", "token")
+
+  def __init__(self, sentence_id: str, text: str, token: Tuple[Token, ...]):
+    self.sentence_id = sentence_id
+    self.text = text
+    self.token = token
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, Sentence):
+      return NotImplemented
+    return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+  def __repr__(self) -> str:
+    fields = ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+    return f"Sentence({fields})"
+
+  def to_proto(self) -> twt_pb2.Sentence:
+    """Converts the sentence into a sentence protobuf."""
+    return twt_pb2.Sentence(
+        sentence_id=self.sentence_id,
+        text=self.text,
+        token=(t.to_proto() for t in self.token),
+    )
+
+
+def token_from_columns(column: Sequence[str], interner: Interner) -> Token:
+  """Parses columns of a CoNLL-U format token annotation into a token.
+
+  Args:
+    column: tab separated columns of a CoNLL-U format token annotation line.
+    interner: interner of the annotations of the token.
+
+  Returns:
+    Token that contains the annotations of the token line.
+  """
+  return Token(
+      form=interner.string(column[1]),
+      lemma=interner.string(column[2]),
+      tag=interner.tag(column[3], column[4]),
+      feature=interner.features(column[5]),
+      head=int(column[6]),
+      dependency_relation=interner.string(column[7]),
+      misc_feature=interner.features(column[9]),
+  )
+
+
+def from_proto(sentence: twt_pb2.Sentence, interner: Interner) -> Sentence:
+  """Converts a sentence protobuf into a compact sentence.
+
+  Args:
+    sentence: sentence protobuf.
+    interner: interner of the annotations of the sentence.
+
+  Returns:
+    Compact sentence that contains the annotations of the sentence protobuf.
+  """
+  return Sentence(
+      sentence_id=sentence.sentence_id,
+      text=sentence.text,
+      token=tuple(
+          Token(
+              form=interner.string(t.form),
+              lemma=interner.string(t.lemma),
+              tag=interner.tag(t.tag.coarse, t.tag.fine),
+              feature=interner.proto_features(t.feature),
+              head=t.head,
+              dependency_relation=interner.string(t.dependency_relation),
+              misc_feature=interner.proto_features(t.misc_feature),
+          ) for t in sentence.token),
+  )
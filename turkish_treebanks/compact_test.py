@@ -0,0 +1,73 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.compact."""
+
+from turkish_treebanks import compact
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+
+_COLUMNS = ("1", "Kitap", "kitap", "NOUN", "NN", "Case=Bare|Proper=False", "2",
+            "dobj", "_", "SpaceAfter=No")
+_TOKEN = twt_pb2.Token(
+    form="Kitap",
+    lemma="kitap",
+    tag=twt_pb2.Tag(coarse="NOUN", fine="NN"),
+    feature=(
+        twt_pb2.Feature(category="Case", value="Bare"),
+        twt_pb2.Feature(category="Proper", value="False"),
+    ),
+    head=2,
+    dependency_relation="dobj",
+    misc_feature=(twt_pb2.Feature(category="SpaceAfter", value="No"),),
+)
+
+
+class CompactTest(absltest.TestCase):
+
+  def test_parses_token_from_columns(self):
+    token = compact.token_from_columns(_COLUMNS, compact.Interner())
+    self.assertEqual("Kitap", token.form)
+    self.assertEqual(compact.Tag(coarse="NOUN", fine="NN"), token.tag)
+    self.assertEqual((compact.Feature("Case", "Bare"),
+                      compact.Feature("Proper", "False")), token.feature)
+    self.assertEqual(2, token.head)
+    self.assertEqual((compact.Feature("SpaceAfter", "No"),),
+                     token.misc_feature)
+    self.assertEqual(_TOKEN, token.to_proto())
+
+  def test_shares_equal_annotations(self):
+    interner = compact.Interner()
+    first = compact.token_from_columns(_COLUMNS, interner)
+    second = compact.token_from_columns(list(_COLUMNS), interner)
+    self.assertIs(first.tag, second.tag)
+    self.assertIs(first.feature, second.feature)
+    self.assertIs(first.misc_feature, second.misc_feature)
+    from_proto = compact.from_proto(
+        twt_pb2.Sentence(token=[_TOKEN]), interner).token[0]
+    self.assertIs(first.feature, from_proto.feature)
+    self.assertEqual(first, from_proto)
+
+  def test_converts_sentence_from_and_to_proto(self):
+    expected = twt_pb2.Sentence(sentence_id="s1", text="Kitap", token=[_TOKEN])
+    sentence = compact.from_proto(expected, compact.Interner())
+    self.assertEqual("s1", sentence.sentence_id)
+    self.assertLen(sentence.token, 1)
+    self.assertEqual(expected, sentence.to_proto())
+
+
+if __name__ == "__main__":
+  absltest.main()
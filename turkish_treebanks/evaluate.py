@@ -0,0 +1,336 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Attachment scores of dependency parses against Turkish Web Treebank.
+
+Gold heads and dependency relations are loaded once into flat arrays, one
+element per token, from the columnar arrays of turkish_treebanks.arrays.
+Predicted heads and dependency relations of the same sentences are read from
+CoNLL-U format sentence annotations (such as the output of a parser) without
+parsing them into sentences, and a batch of predictions is matched against
+the gold annotations at once with vectorized NumPy operations.
+
+Scores are unlabeled and labeled attachment scores (UAS and LAS) over all
+tokens, over tokens that are not punctuation (as told by their gold coarse
+part-of-speech tag) and over the tokens of each section, together with the
+precision and recall of each dependency relation. A token is correctly
+attached if its head is correct, and correctly labeled if both its head and
+its dependency relation are correct.
+"""
+
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence
+
+import numpy as np
+
+from turkish_treebanks import arrays as arrays_lib
+
+_PUNCTUATION_TAG = "PUNCT"
+_SENTENCE_ID_PREFIX = "# sent_id = "
+
+
+class Gold(NamedTuple):
+  """Gold heads and dependency relations of a sequence of sentences.
+
+  Attributes:
+    sentence_id: identifier of each sentence.
+    sentence_offset: offsets of the first token of each sentence, followed by
+        the total number of tokens, as in turkish_treebanks.arrays.
+    head: head of each token (1-based index of the head token within the
+        sentence, or 0 for the root).
+    dependency_relation: dependency relation of each token.
+    punctuation: whether each token is punctuation.
+    section: id of the section of each token in section_vocabulary.
+    section_vocabulary: names of the sections, in the order they are given.
+  """
+  sentence_id: np.ndarray
+  sentence_offset: np.ndarray
+  head: np.ndarray
+  dependency_relation: np.ndarray
+  punctuation: np.ndarray
+  section: np.ndarray
+  section_vocabulary: np.ndarray
+
+
+class Predictions(NamedTuple):
+  """Predicted heads and dependency relations of a sequence of sentences.
+
+  Attributes:
+    sentence_id: identifier of each sentence.
+    sentence_offset: offsets of the first token of each sentence, followed by
+        the total number of tokens.
+    head: predicted head of each token.
+    dependency_relation: predicted dependency relation of each token.
+  """
+  sentence_id: np.ndarray
+  sentence_offset: np.ndarray
+  head: np.ndarray
+  dependency_relation: np.ndarray
+
+
+class AttachmentScores(NamedTuple):
+  """Attachment scores over a set of tokens.
+
+  Attributes:
+    tokens: number of tokens that are scored.
+    unlabeled: fraction of the tokens whose head is correct (UAS).
+    labeled: fraction of the tokens whose head and dependency relation are
+        correct (LAS).
+  """
+  tokens: int
+  unlabeled: float
+  labeled: float
+
+
+class Scores(NamedTuple):
+  """Scores of the predictions of a parser.
+
+  Attributes:
+    all: attachment scores over all tokens.
+    without_punctuation: attachment scores over tokens that are not
+        punctuation.
+    by_section: attachment scores over the tokens of each section, keyed by
+        the name of the section.
+    precision: fraction of the tokens that are predicted with each dependency
+        relation whose head and dependency relation are correct, keyed by the
+        dependency relations that are predicted.
+    recall: fraction of the tokens that are annotated with each dependency
+        relation whose head and dependency relation are predicted correctly,
+        keyed by the dependency relations of the gold annotations.
+  """
+  all: AttachmentScores
+  without_punctuation: AttachmentScores
+  by_section: Dict[str, AttachmentScores]
+  precision: Dict[str, float]
+  recall: Dict[str, float]
+
+
+def _offsets(lengths: Sequence[int]) -> np.ndarray:
+  """Converts lengths into offsets of a CSR layout."""
+  offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+  np.cumsum(lengths, out=offsets[1:])
+  return offsets
+
+
+def gold_from_arrays(
+    arrays_by_section: Mapping[str, arrays_lib.Arrays]) -> Gold:
+  """Loads gold heads and dependency relations from columnar arrays.
+
+  Args:
+    arrays_by_section: columnar annotations of the sentences of each section,
+        keyed by the name of the section, in the order the sentences of the
+        sections are predicted.
+
+  Raises:
+    ValueError: no sections are given.
+
+  Returns:
+    Gold annotations of the sentences of all sections, in order.
+  """
+  if not arrays_by_section:
+    raise ValueError("No gold sections are given.")
+
+  arrays = list(arrays_by_section.values())
+  lengths = np.concatenate([np.diff(a.sentence_offset) for a in arrays])
+  return Gold(
+      sentence_id=np.concatenate([a.sentence_id for a in arrays]),
+      sentence_offset=_offsets(lengths),
+      head=np.concatenate([a.head for a in arrays]),
+      dependency_relation=np.concatenate([
+          a.dependency_relation_vocabulary[a.dependency_relation]
+          for a in arrays
+      ]),
+      punctuation=np.concatenate(
+          [a.coarse_vocabulary[a.coarse] == _PUNCTUATION_TAG for a in arrays]),
+      section=np.repeat(
+          np.arange(len(arrays), dtype=np.int32),
+          [len(a.head) for a in arrays]),
+      section_vocabulary=np.array(list(arrays_by_section), dtype=str),
+  )
+
+
+def predictions_from_conllu(sentences: Iterable[str]) -> Predictions:
+  """Reads predicted heads and dependency relations of sentence annotations.
+
+  Multiword token and empty node lines (whose ids are ranges or decimals) are
+  skipped, since they are not attached.
+
+  Args:
+    sentences: CoNLL-U format sentence annotations.
+
+  Raises:
+    ValueError: sentence annotation does not have a sentence id, or its token
+        annotations do not have a head.
+
+  Returns:
+    Predictions of the sentence annotations, in order.
+  """
+  sentence_ids = []
+  lengths = []
+  heads = []
+  relations = []
+  for sentence in sentences:
+    sentence_id = None
+    length = 0
+    for line in sentence.split("\n"):
+      if line.startswith("#"):
+        if line.startswith(_SENTENCE_ID_PREFIX):
+          sentence_id = line[len(_SENTENCE_ID_PREFIX):].strip()
+        continue
+      column = line.split("\t", 8)
+      if "-" in column[0] or "." in column[0]:
+        continue
+      if len(column) < 8 or not column[6].isdigit():
+        raise ValueError(f"Illformed predicted token annotation:\n{line}")
+      heads.append(int(column[6]))
+      relations.append(column[7])
+      length += 1
+    if sentence_id is None:
+      raise ValueError(
+          f"Predicted sentence annotation does not have a sentence id"
+          f" annotation:\n{sentence}")
+    sentence_ids.append(sentence_id)
+    lengths.append(length)
+
+  return Predictions(
+      sentence_id=np.array(sentence_ids, dtype=str),
+      sentence_offset=_offsets(lengths),
+      head=np.array(heads, dtype=np.int32),
+      dependency_relation=np.array(relations, dtype=str),
+  )
+
+
+def _check_alignment(gold: Gold, predictions: Predictions) -> None:
+  """Checks that predictions are of the sentences and tokens of gold."""
+  if not np.array_equal(gold.sentence_id, predictions.sentence_id):
+    raise ValueError(
+        f"Predicted sentences do not match the gold sentences, expecting"
+        f" {len(gold.sentence_id)} sentences in the same order.")
+
+  mismatched = np.flatnonzero(
+      gold.sentence_offset != predictions.sentence_offset)
+  if mismatched.size:
+    raise ValueError(
+        f"Predicted tokens of sentence"
+        f" '{gold.sentence_id[max(mismatched[0] - 1, 0)]}' do not match its"
+        f" gold tokens.")
+
+
+def _counts(ids: np.ndarray, weights: np.ndarray, size: int) -> np.ndarray:
+  """Sums weights of each id, separately for each row of the weights.
+
+  Args:
+    ids: id of each token, in [0, size), either shared by all rows or of each
+        row (of shape [tokens] or [rows, tokens]).
+    weights: weight of each token in each row, of shape [rows, tokens].
+    size: number of ids.
+
+  Returns:
+    Sum of the weights of the tokens of each id, of shape [rows, size].
+  """
+  rows = weights.shape[0]
+  offset_ids = np.arange(rows)[:, np.newaxis] * size + ids
+  return np.bincount(
+      offset_ids.ravel(),
+      weights=weights.ravel().astype(np.float64),
+      minlength=rows * size).reshape(rows, size)
+
+
+def _attachment_scores(tokens: int, attached: float,
+                       labeled: float) -> AttachmentScores:
+  """Computes attachment scores from counts of correct tokens."""
+  if not tokens:
+    return AttachmentScores(0, 0.0, 0.0)
+
+  return AttachmentScores(
+      int(tokens), float(attached / tokens), float(labeled / tokens))
+
+
+def score(gold: Gold, predictions: Sequence[Predictions]) -> List[Scores]:
+  """Scores a batch of predictions of the gold sentences.
+
+  Args:
+    gold: gold annotations of the sentences.
+    predictions: predictions of the gold sentences, such as those of many
+        parser checkpoints, which are matched against the gold annotations
+        at once.
+
+  Raises:
+    ValueError: predictions are not of the sentences or tokens of the gold
+        annotations.
+
+  Returns:
+    Scores of each predictions, in order.
+  """
+  if not predictions:
+    return []
+
+  for predicted in predictions:
+    _check_alignment(gold, predicted)
+
+  # Dependency relations are interned into a vocabulary of both gold and
+  # predicted relations, so that they are compared as integers.
+  vocabulary, relation_ids = np.unique(
+      np.concatenate([gold.dependency_relation]
+                     + [p.dependency_relation for p in predictions]),
+      return_inverse=True)
+  relation_ids = relation_ids.reshape(len(predictions) + 1, -1)
+  gold_relation, predicted_relation = relation_ids[0], relation_ids[1:]
+  predicted_head = np.stack([p.head for p in predictions])
+
+  attached = predicted_head == gold.head
+  labeled = attached & (predicted_relation == gold_relation)
+  not_punctuation = ~gold.punctuation
+
+  sections = len(gold.section_vocabulary)
+  section_tokens = np.bincount(gold.section, minlength=sections)
+  section_attached = _counts(gold.section, attached, sections)
+  section_labeled = _counts(gold.section, labeled, sections)
+
+  relations = len(vocabulary)
+  gold_counts = np.bincount(gold_relation, minlength=relations)
+  predicted_counts = _counts(predicted_relation,
+                             np.ones(predicted_relation.shape), relations)
+  labeled_counts = _counts(gold_relation, labeled, relations)
+
+  tokens = len(gold.head)
+  punctuation_free_tokens = int(np.count_nonzero(not_punctuation))
+  scores = []
+  for row in range(len(predictions)):
+    scores.append(
+        Scores(
+            all=_attachment_scores(tokens, attached[row].sum(),
+                                   labeled[row].sum()),
+            without_punctuation=_attachment_scores(
+                punctuation_free_tokens,
+                attached[row][not_punctuation].sum(),
+                labeled[row][not_punctuation].sum()),
+            by_section={
+                str(name): _attachment_scores(int(section_tokens[s]),
+                                              section_attached[row, s],
+                                              section_labeled[row, s])
+                for s, name in enumerate(gold.section_vocabulary)
+            },
+            precision={
+                str(vocabulary[r]):
+                float(labeled_counts[row, r] / predicted_counts[row, r])
+                for r in np.flatnonzero(predicted_counts[row])
+            },
+            recall={
+                str(vocabulary[r]):
+                float(labeled_counts[row, r] / gold_counts[r])
+                for r in np.flatnonzero(gold_counts)
+            },
+        ))
+  return scores
@@ -0,0 +1,139 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.evaluate."""
+
+import numpy as np
+from turkish_treebanks import arrays
+from turkish_treebanks import evaluate
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+
+
+def _sentence(sentence_id, annotations):
+  return twt_pb2.Sentence(
+      sentence_id=sentence_id,
+      token=[
+          twt_pb2.Token(form=f"w{i}", head=head, dependency_relation=relation,
+                        tag=twt_pb2.Tag(coarse=coarse))
+          for i, (head, relation, coarse) in enumerate(annotations)
+      ])
+
+
+def _gold():
+  return evaluate.gold_from_arrays({
+      "web":
+          arrays.from_sentences([
+              _sentence("a", [(2, "nsubj", "NOUN"), (0, "root", "VERB"),
+                              (2, "punct", "PUNCT")]),
+          ]),
+      "wiki":
+          arrays.from_sentences([
+              _sentence("b", [(0, "root", "VERB"), (1, "obj", "NOUN")]),
+          ]),
+  })
+
+
+def _conllu(sentence_id, annotations):
+  lines = [f"# sent_id = {sentence_id}", "# text = _"]
+  lines.extend(f"{i + 1}\tw{i}\t_\t_\t_\t_\t{head}\t{relation}\t_\t_"
+               for i, (head, relation) in enumerate(annotations))
+  return "\n".join(lines)
+
+
+class EvaluateTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.gold = _gold()
+
+  def test_loads_gold_annotations(self):
+    np.testing.assert_array_equal(["a", "b"], self.gold.sentence_id)
+    np.testing.assert_array_equal([0, 3, 5], self.gold.sentence_offset)
+    np.testing.assert_array_equal([2, 0, 2, 0, 1], self.gold.head)
+    np.testing.assert_array_equal(["nsubj", "root", "punct", "root", "obj"],
+                                  self.gold.dependency_relation)
+    np.testing.assert_array_equal([False, False, True, False, False],
+                                  self.gold.punctuation)
+    np.testing.assert_array_equal([0, 0, 0, 1, 1], self.gold.section)
+
+  def test_reads_predictions(self):
+    multiword = _conllu("b", [(0, "root"), (1, "obj")]).replace(
+        "\n1\t", "\n1-2\tw\t_\t_\t_\t_\t_\t_\t_\t_\n1\t")
+    predictions = evaluate.predictions_from_conllu([
+        _conllu("a", [(2, "nsubj"), (0, "root"), (2, "punct")]),
+        multiword,
+    ])
+    np.testing.assert_array_equal(["a", "b"], predictions.sentence_id)
+    np.testing.assert_array_equal([0, 3, 5], predictions.sentence_offset)
+    np.testing.assert_array_equal([2, 0, 2, 0, 1], predictions.head)
+
+  def test_scores_batch_of_predictions(self):
+    perfect = evaluate.predictions_from_conllu([
+        _conllu("a", [(2, "nsubj"), (0, "root"), (2, "punct")]),
+        _conllu("b", [(0, "root"), (1, "obj")]),
+    ])
+    flawed = evaluate.predictions_from_conllu([
+        _conllu("a", [(2, "obj"), (0, "root"), (1, "punct")]),
+        _conllu("b", [(0, "root"), (1, "nsubj")]),
+    ])
+    perfect_scores, flawed_scores = evaluate.score(self.gold,
+                                                   [perfect, flawed])
+
+    self.assertEqual(evaluate.AttachmentScores(5, 1.0, 1.0),
+                     perfect_scores.all)
+    self.assertEqual({"nsubj": 1.0, "obj": 1.0, "punct": 1.0, "root": 1.0},
+                     perfect_scores.precision)
+
+    self.assertEqual(evaluate.AttachmentScores(5, 0.8, 0.4), flawed_scores.all)
+    self.assertEqual(evaluate.AttachmentScores(4, 1.0, 0.5),
+                     flawed_scores.without_punctuation)
+    self.assertEqual(
+        {
+            "web": evaluate.AttachmentScores(3, 2 / 3, 1 / 3),
+            "wiki": evaluate.AttachmentScores(2, 1.0, 0.5),
+        }, flawed_scores.by_section)
+    self.assertEqual({"nsubj": 0.0, "obj": 0.0, "punct": 0.0, "root": 1.0},
+                     flawed_scores.precision)
+    self.assertEqual({"nsubj": 0.0, "obj": 0.0, "punct": 0.0, "root": 1.0},
+                     flawed_scores.recall)
+
+  def test_scores_no_predictions(self):
+    self.assertEmpty(evaluate.score(self.gold, []))
+
+  def test_raises_exception_for_mismatched_sentences(self):
+    predictions = evaluate.predictions_from_conllu(
+        [_conllu("a", [(2, "nsubj"), (0, "root"), (2, "punct")])])
+    with self.assertRaisesRegex(ValueError, "do not match the gold sentences"):
+      evaluate.score(self.gold, [predictions])
+
+  def test_raises_exception_for_mismatched_tokens(self):
+    predictions = evaluate.predictions_from_conllu([
+        _conllu("a", [(2, "nsubj"), (0, "root")]),
+        _conllu("b", [(0, "root"), (1, "obj"), (1, "punct")]),
+    ])
+    with self.assertRaisesRegex(ValueError, "sentence 'a' do not match"):
+      evaluate.score(self.gold, [predictions])
+
+  def test_raises_exception_for_illformed_predictions(self):
+    with self.assertRaisesRegex(ValueError, "Illformed predicted token"):
+      evaluate.predictions_from_conllu(["# sent_id = a\n1\tw0\t_"])
+    with self.assertRaisesRegex(ValueError, "does not have a sentence id"):
+      evaluate.predictions_from_conllu([_conllu("a", [(0, "root")])[14:]])
+
+
+if __name__ == "__main__":
+  absltest.main()
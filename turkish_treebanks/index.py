@@ -0,0 +1,395 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Inverted index of Turkish Web Treebank token annotations.
+
+Tokens are identified by their position in the sequence of all tokens of the
+indexed sentences. The index maps each (field, value) pair of token
+annotations to the sorted list of positions of the tokens that have it, and
+queries are evaluated by intersecting, merging and subtracting these posting
+lists.
+
+Queries are built from terms and combined with '&' (and), '|' (or) and '~'
+(not), or with the head-dependent constraints HeadIs and HasDependent. For
+example, locative tokens that are attached as 'npadvmod':
+
+  query = (index.Term("feature", "Case=Loc")
+           & index.Term("dependency_relation", "npadvmod"))
+  positions = treebank_index.search(query)
+"""
+
+from __future__ import annotations
+
+import array
+import bisect
+import functools
+import heapq
+from typing import (TYPE_CHECKING, Dict, Iterable, Iterator, List, Sequence,
+                    Tuple, Union)
+
+if TYPE_CHECKING:
+  from turkish_treebanks import compact
+  from turkish_treebanks import twt_pb2
+
+  _Sentence = Union[twt_pb2.Sentence, compact.Sentence]
+
+_VALID_FIELDS = [
+    "form",
+    "lemma",
+    "coarse",
+    "fine",
+    "feature",
+    "misc_feature",
+    "dependency_relation",
+]
+
+# Tokens matched by a query, as sorted positions together with whether they
+# are negated. Negated positions are those of the tokens that do not match, so
+# that negations are not expanded into the positions of all indexed tokens.
+_Matches = Tuple[Sequence[int], bool]
+
+
+def _check_field(field: str) -> None:
+  """Checks if the annotation field of tokens is indexed.
+
+  Args:
+    field: annotation field of tokens.
+
+  Raises:
+    ValueError: invalid field name.
+  """
+  if field not in _VALID_FIELDS:
+    raise ValueError(f"Invalid field name '{field}'. It can only be one of:"
+                     f" {', '.join(repr(f) for f in _VALID_FIELDS)}.")
+
+
+class Query:
+  """Query over token annotations, which matches a set of tokens."""
+
+  __slots__ = ()
+
+  def __and__(self, other: "Query") -> "Query":
+    return And(self, other)
+
+  def __or__(self, other: "Query") -> "Query":
+    return Or(self, other)
+
+  def __invert__(self) -> "Query":
+    return Not(self)
+
+
+class Term(Query):
+  """Matches tokens whose field has the value.
+
+  Attributes:
+    field: annotation field of tokens (could be 'form', 'lemma', 'coarse',
+        'fine', 'feature', 'misc_feature' or 'dependency_relation').
+    value: value of the field. Values of 'feature' and 'misc_feature' fields
+        are category=value pairs, such as 'Case=Loc'.
+  """
+
+  __slots__ = ("field", "value")
+
+  def __init__(self, field: str, value: str):
+    _check_field(field)
+    self.field = field
+    self.value = value
+
+  def __repr__(self) -> str:
+    return f"Term({self.field!r}, {self.value!r})"
+
+
+class And(Query):
+  """Matches tokens that are matched by all of the queries."""
+
+  __slots__ = ("queries",)
+
+  def __init__(self, *queries: Query):
+    self.queries = queries
+
+  def __repr__(self) -> str:
+    return f"And{self.queries!r}"
+
+
+class Or(Query):
+  """Matches tokens that are matched by any of the queries."""
+
+  __slots__ = ("queries",)
+
+  def __init__(self, *queries: Query):
+    self.queries = queries
+
+  def __repr__(self) -> str:
+    return f"Or{self.queries!r}"
+
+
+class Not(Query):
+  """Matches tokens that are not matched by the query."""
+
+  __slots__ = ("query",)
+
+  def __init__(self, query: Query):
+    self.query = query
+
+  def __repr__(self) -> str:
+    return f"Not({self.query!r})"
+
+
+class HeadIs(Query):
+  """Matches tokens of the query whose head is matched by the head query."""
+
+  __slots__ = ("query", "head")
+
+  def __init__(self, query: Query, head: Query):
+    self.query = query
+    self.head = head
+
+  def __repr__(self) -> str:
+    return f"HeadIs({self.query!r}, {self.head!r})"
+
+
+class HasDependent(Query):
+  """Matches tokens of the query with a dependent of the dependent query."""
+
+  __slots__ = ("query", "dependent")
+
+  def __init__(self, query: Query, dependent: Query):
+    self.query = query
+    self.dependent = dependent
+
+  def __repr__(self) -> str:
+    return f"HasDependent({self.query!r}, {self.dependent!r})"
+
+
+def _contains(positions: Sequence[int], position: int) -> bool:
+  """Checks if sorted positions contain the position."""
+  i = bisect.bisect_left(positions, position)
+  return i < len(positions) and positions[i] == position
+
+
+def _intersection(positions: Sequence[int],
+                  other: Sequence[int]) -> List[int]:
+  """Intersects sorted positions, searching the longer for the shorter."""
+  if len(other) < len(positions):
+    positions, other = other, positions
+  intersection = []
+  i = 0
+  for position in positions:
+    i = bisect.bisect_left(other, position, i)
+    if i == len(other):
+      break
+    if other[i] == position:
+      intersection.append(position)
+  return intersection
+
+
+def _difference(positions: Sequence[int],
+                other: Sequence[int]) -> List[int]:
+  """Subtracts the other sorted positions from the sorted positions."""
+  difference = []
+  i = 0
+  for position in positions:
+    i = bisect.bisect_left(other, position, i)
+    if i == len(other) or other[i] != position:
+      difference.append(position)
+  return difference
+
+
+def _union(positions: Sequence[Sequence[int]]) -> Sequence[int]:
+  """Merges sequences of sorted positions into sorted unique positions."""
+  if len(positions) == 1:
+    return positions[0]
+  union = []
+  for position in heapq.merge(*positions):
+    if not union or union[-1] != position:
+      union.append(position)
+  return union
+
+
+def _conjunction(matches: Sequence[_Matches]) -> _Matches:
+  """Intersects tokens matched by queries, subtracting negated ones."""
+  # Intersection starts from the smallest posting list.
+  included = sorted((p for p, n in matches if not n), key=len)
+  excluded = _union([p for p, n in matches if n])
+  if not included:
+    return excluded, True
+  return _difference(functools.reduce(_intersection, included), excluded), False
+
+
+def _complement(positions: Sequence[int], size: int) -> Iterator[int]:
+  """Generates the positions below size that are not in sorted positions."""
+  start = 0
+  for position in positions:
+    yield from range(start, position)
+    start = position + 1
+  yield from range(start, size)
+
+
+class Index:
+  """Inverted index of token annotations of a sequence of sentences.
+
+  Attributes:
+    sentence_id: identifier of each indexed sentence, in the order they are
+        indexed.
+  """
+
+  __slots__ = ("sentence_id", "_sentence_offset", "_head", "_postings")
+
+  def __init__(self, sentence_id: Sequence[str],
+               sentence_offset: Sequence[int], head: Sequence[int],
+               postings: Dict[Tuple[str, str], Sequence[int]]):
+    self.sentence_id = tuple(sentence_id)
+    self._sentence_offset = sentence_offset
+    self._head = head
+    self._postings = postings
+
+  def __len__(self) -> int:
+    """Returns the number of indexed tokens."""
+    return len(self._head)
+
+  def values(self, field: str) -> List[str]:
+    """Returns the sorted values of the field that are indexed."""
+    _check_field(field)
+    return sorted(v for f, v in self._postings if f == field)
+
+  def _evaluate(self, query: Query) -> _Matches:
+    """Evaluates the query into the sorted positions of matching tokens."""
+    if isinstance(query, Term):
+      return self._postings.get((query.field, query.value), ()), False
+
+    if isinstance(query, Not):
+      positions, negated = self._evaluate(query.query)
+      return positions, not negated
+
+    if isinstance(query, And):
+      return _conjunction([self._evaluate(q) for q in query.queries])
+
+    if isinstance(query, Or):
+      # Disjunctions are evaluated as negated conjunctions of negations.
+      positions, negated = _conjunction(
+          [(p, not n) for p, n in map(self._evaluate, query.queries)])
+      return positions, not negated
+
+    if isinstance(query, HeadIs):
+      heads, negated = self._evaluate(query.head)
+      head = self._head
+      positions = []
+      for t in self._positions(query.query):
+        # Root tokens, whose head is -1, have no head to match.
+        if head[t] >= 0 and _contains(heads, head[t]) != negated:
+          positions.append(t)
+      return positions, False
+
+    if isinstance(query, HasDependent):
+      head = self._head
+      heads = sorted(
+          {head[t] for t in self._positions(query.dependent) if head[t] >= 0})
+      positions, negated = self._evaluate(query.query)
+      if negated:
+        return _difference(heads, positions), False
+      return _intersection(positions, heads), False
+
+    raise ValueError(f"Invalid query {query!r}.")
+
+  def _positions(self, query: Query) -> Iterable[int]:
+    """Evaluates the query into the positions of matching tokens, in order."""
+    positions, negated = self._evaluate(query)
+    if negated:
+      return _complement(positions, len(self))
+    return positions
+
+  def count(self, query: Query) -> int:
+    """Counts the tokens that are matched by the query."""
+    positions, negated = self._evaluate(query)
+    return len(self) - len(positions) if negated else len(positions)
+
+  def search(self, query: Query) -> List[Tuple[int, int]]:
+    """Finds the tokens that are matched by the query.
+
+    Args:
+      query: query over token annotations.
+
+    Raises:
+      ValueError: invalid query.
+
+    Returns:
+      Ordinal position of the sentence of each matching token in the indexed
+      sentences, together with the 0-based index of the token in the
+      sentence, in the order they are indexed.
+    """
+    offset = self._sentence_offset
+    positions = []
+    sentence = 0
+    for token in self._positions(query):
+      if offset[sentence + 1] <= token:
+        sentence = bisect.bisect_right(offset, token, lo=sentence) - 1
+      positions.append((sentence, token - offset[sentence]))
+    return positions
+
+  def sentence_ids(self, query: Query) -> List[str]:
+    """Finds identifiers of the sentences that have a matching token.
+
+    Args:
+      query: query over token annotations.
+
+    Raises:
+      ValueError: invalid query.
+
+    Returns:
+      Identifiers of the sentences that have at least one token that is
+      matched by the query, in the order they are indexed.
+    """
+    sentences = sorted({s for s, _ in self.search(query)})
+    return [self.sentence_id[s] for s in sentences]
+
+
+def from_sentences(sentences: Iterable[_Sentence]) -> Index:
+  """Indexes token annotations of sentences.
+
+  Args:
+    sentences: sentence protobufs or compact sentences.
+
+  Returns:
+    Inverted index of the token annotations of the sentences.
+  """
+  sentence_id = []
+  sentence_offset = array.array("q", [0])
+  head = array.array("q")
+  postings: Dict[Tuple[str, str], array.array] = {}
+
+  def _post(field: str, value: str, position: int) -> None:
+    posting = postings.get((field, value))
+    if posting is None:
+      posting = postings[field, value] = array.array("q")
+    posting.append(position)
+
+  for sentence in sentences:
+    sentence_id.append(sentence.sentence_id)
+    offset = len(head)
+    for position, token in enumerate(sentence.token, start=offset):
+      # Heads are converted into positions, -1 for the root.
+      head.append(offset + token.head - 1 if token.head else -1)
+      _post("form", token.form, position)
+      _post("lemma", token.lemma, position)
+      _post("coarse", token.tag.coarse, position)
+      _post("fine", token.tag.fine, position)
+      _post("dependency_relation", token.dependency_relation, position)
+      for feature in token.feature:
+        _post("feature", f"{feature.category}={feature.value}", position)
+      for feature in token.misc_feature:
+        _post("misc_feature", f"{feature.category}={feature.value}", position)
+    sentence_offset.append(len(head))
+
+  return Index(sentence_id, sentence_offset, head, postings)
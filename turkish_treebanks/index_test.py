@@ -0,0 +1,106 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.index."""
+
+from turkish_treebanks import index
+from turkish_treebanks import test_util
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+
+
+_SENTENCES = (
+    twt_pb2.Sentence(
+        sentence_id="s1",
+        token=[
+            test_util.token("Evde", "NOUN", 2, "npadvmod", Case="Loc"),
+            test_util.token("uyudum", "VERB", 0, "ROOT"),
+        ]),
+    twt_pb2.Sentence(sentence_id="s2"),
+    twt_pb2.Sentence(
+        sentence_id="s3",
+        token=[
+            test_util.token("Okulda", "NOUN", 3, "nmod", Case="Loc"),
+            test_util.token("kitap", "NOUN", 3, "dobj", Case="Bare"),
+            test_util.token("okudum", "VERB", 0, "ROOT"),
+        ]),
+)
+
+
+class IndexTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.index = index.from_sentences(_SENTENCES)
+
+  def test_indexes_tokens(self):
+    self.assertLen(self.index, 5)
+    self.assertEqual(("s1", "s2", "s3"), self.index.sentence_id)
+    self.assertEqual(["Case=Bare", "Case=Loc"], self.index.values("feature"))
+
+  def test_searches_terms(self):
+    self.assertEqual([(0, 0), (2, 0)],
+                     self.index.search(index.Term("feature", "Case=Loc")))
+    self.assertEqual([(2, 1)], self.index.search(index.Term("lemma", "kitap")))
+    self.assertEqual([], self.index.search(index.Term("form", "yok")))
+
+  def test_searches_boolean_queries(self):
+    loc = index.Term("feature", "Case=Loc")
+    npadvmod = index.Term("dependency_relation", "npadvmod")
+    verb = index.Term("coarse", "VERB")
+    self.assertEqual([(0, 0)], self.index.search(loc & npadvmod))
+    self.assertEqual([(0, 0), (0, 1), (2, 0), (2, 2)],
+                     self.index.search(loc | verb))
+    self.assertEqual([(2, 1)], self.index.search(~(loc | verb)))
+    self.assertEqual(3, self.index.count(index.Not(verb)))
+
+  def test_searches_negated_queries(self):
+    loc = index.Term("feature", "Case=Loc")
+    npadvmod = index.Term("dependency_relation", "npadvmod")
+    noun = index.Term("coarse", "NOUN")
+    verb = index.Term("coarse", "VERB")
+    self.assertEqual([(2, 0)], self.index.search(loc & ~npadvmod))
+    self.assertEqual([(0, 1), (2, 1), (2, 2)], self.index.search(verb | ~loc))
+    self.assertEqual([(0, 1), (2, 2)], self.index.search(~~verb))
+    self.assertEqual([(0, 0), (2, 0), (2, 1)],
+                     self.index.search(index.HeadIs(~verb, ~noun)))
+    self.assertEqual([(0, 1), (2, 2)],
+                     self.index.search(index.HasDependent(~noun, ~verb)))
+    self.assertEqual(5, self.index.count(index.And()))
+    self.assertEqual(0, self.index.count(index.Or()))
+
+  def test_searches_head_dependent_constraints(self):
+    noun = index.Term("coarse", "NOUN")
+    root = index.Term("dependency_relation", "ROOT")
+    self.assertEqual([(0, 0), (2, 0), (2, 1)],
+                     self.index.search(index.HeadIs(noun, root)))
+    self.assertEqual(
+        [(0, 1)],
+        self.index.search(
+            index.HasDependent(root, index.Term("dependency_relation",
+                                                "npadvmod"))))
+
+  def test_finds_sentence_ids(self):
+    self.assertEqual(["s1", "s3"],
+                     self.index.sentence_ids(index.Term("coarse", "VERB")))
+
+  def test_raises_exception_for_invalid_field(self):
+    with self.assertRaisesRegex(ValueError, "Invalid field name 'foo'."):
+      index.Term("foo", "bar")
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,140 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Least recently used cache bounded by its number of entries and their size.
+
+Caches are safe to use from multiple threads, such as the threads that read
+treebank files concurrently.
+"""
+
+import collections
+import threading
+from typing import Generic, Hashable, Optional, OrderedDict, Tuple, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+def _check_limits(max_entries: int, max_size: int) -> None:
+  """Checks the limits of a cache."""
+  if max_entries < 0:
+    raise ValueError(f"Invalid maximum number of entries {max_entries}.")
+  if max_size < 0:
+    raise ValueError(f"Invalid maximum size {max_size}.")
+
+
+class Cache(Generic[_K, _V]):
+  """Least recently used cache of values, bounded by count and total size.
+
+  Values that are larger than the maximum size on their own are not cached.
+  A cache with a maximum of zero entries or zero size caches nothing.
+  """
+
+  def __init__(self, max_entries: int, max_size: int):
+    """Initializes an empty cache.
+
+    Args:
+      max_entries: maximum number of cached values.
+      max_size: maximum total size of cached values, in the units of the sizes
+          they are put into the cache with (such as bytes).
+
+    Raises:
+      ValueError: invalid limits.
+    """
+    _check_limits(max_entries, max_size)
+    self._max_entries = max_entries
+    self._max_size = max_size
+    self._size = 0
+    self._entries: OrderedDict[_K, Tuple[_V, int]] = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  @property
+  def size(self) -> int:
+    """Total size of the cached values."""
+    return self._size
+
+  def get(self, key: _K) -> Optional[_V]:
+    """Returns the cached value of the key, marking it most recently used."""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        return None
+
+      self._entries.move_to_end(key)
+      return entry[0]
+
+  def put(self, key: _K, value: _V, size: int) -> bool:
+    """Caches the value of the key, evicting least recently used values.
+
+    Args:
+      key: key of the value.
+      value: value to cache.
+      size: size of the value.
+
+    Returns:
+      True if the value is cached, or False if it does not fit the cache.
+    """
+    with self._lock:
+      self._pop(key)
+      if not self._max_entries or size > self._max_size:
+        return False
+
+      self._entries[key] = (value, size)
+      self._size += size
+      self._evict()
+      return True
+
+  def pop(self, key: _K) -> None:
+    """Removes the cached value of the key, if there is one."""
+    with self._lock:
+      self._pop(key)
+
+  def clear(self) -> None:
+    """Removes all cached values."""
+    with self._lock:
+      self._entries.clear()
+      self._size = 0
+
+  def resize(self, max_entries: int, max_size: int) -> None:
+    """Changes the limits of the cache, evicting values that do not fit.
+
+    Args:
+      max_entries: maximum number of cached values.
+      max_size: maximum total size of cached values.
+
+    Raises:
+      ValueError: invalid limits.
+    """
+    _check_limits(max_entries, max_size)
+    with self._lock:
+      self._max_entries = max_entries
+      self._max_size = max_size
+      self._evict()
+
+  def _pop(self, key: _K) -> None:
+    """Removes the cached value of the key, while the lock is held."""
+    entry = self._entries.pop(key, None)
+    if entry is not None:
+      self._size -= entry[1]
+
+  def _evict(self) -> None:
+    """Evicts least recently used values until limits hold."""
+    while self._entries and (len(self._entries) > self._max_entries
+                             or self._size > self._max_size):
+      _, (_, size) = self._entries.popitem(last=False)
+      self._size -= size
@@ -0,0 +1,84 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.lru."""
+
+from turkish_treebanks import lru
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+
+class CacheTest(parameterized.TestCase):
+
+  def test_evicts_least_recently_used_values_beyond_max_entries(self):
+    cache = lru.Cache(max_entries=2, max_size=100)
+    cache.put("a", 1, size=1)
+    cache.put("b", 2, size=1)
+    self.assertEqual(1, cache.get("a"))
+    cache.put("c", 3, size=1)
+    self.assertEqual([1, None, 3], [cache.get(k) for k in "abc"])
+    self.assertLen(cache, 2)
+
+  def test_evicts_least_recently_used_values_beyond_max_size(self):
+    cache = lru.Cache(max_entries=10, max_size=10)
+    cache.put("a", 1, size=4)
+    cache.put("b", 2, size=4)
+    cache.put("c", 3, size=4)
+    self.assertEqual([None, 2, 3], [cache.get(k) for k in "abc"])
+    self.assertEqual(8, cache.size)
+
+  def test_does_not_cache_values_larger_than_max_size(self):
+    cache = lru.Cache(max_entries=10, max_size=10)
+    self.assertTrue(cache.put("a", 1, size=4))
+    self.assertFalse(cache.put("b", 2, size=11))
+    self.assertEqual([1, None], [cache.get(k) for k in "ab"])
+
+  def test_replaces_value_of_key(self):
+    cache = lru.Cache(max_entries=10, max_size=10)
+    cache.put("a", 1, size=4)
+    cache.put("a", 2, size=6)
+    self.assertEqual(2, cache.get("a"))
+    self.assertEqual(6, cache.size)
+
+  def test_pops_and_clears_values(self):
+    cache = lru.Cache(max_entries=10, max_size=10)
+    cache.put("a", 1, size=4)
+    cache.put("b", 2, size=4)
+    cache.pop("a")
+    self.assertEqual([None, 2], [cache.get(k) for k in "ab"])
+    cache.clear()
+    self.assertEmpty(cache)
+    self.assertEqual(0, cache.size)
+
+  def test_resizes_cache(self):
+    cache = lru.Cache(max_entries=10, max_size=10)
+    for key in "abc":
+      cache.put(key, key, size=1)
+    cache.resize(max_entries=1, max_size=10)
+    self.assertEqual([None, None, "c"], [cache.get(k) for k in "abc"])
+    cache.resize(max_entries=0, max_size=10)
+    cache.put("d", "d", size=1)
+    self.assertEmpty(cache)
+
+  @parameterized.parameters((-1, 10, "number of entries"), (10, -1, "size"))
+  def test_raises_exception_for_invalid_limits(self, max_entries, max_size,
+                                               message):
+    with self.assertRaisesRegex(ValueError, f"Invalid maximum {message}"):
+      lru.Cache(max_entries, max_size)
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,279 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Lazily decoded views of sentence annotations over CoNLL-U format bytes.
+
+Views do not copy the annotations they refer to. Boundaries of sentences,
+lines and columns are found over the raw bytes of the buffer (which is
+typically a memory-mapped treebank file) and fields are only decoded when
+they are read.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+from typing import Generator, List, NamedTuple, Optional, Tuple, Union
+
+from turkish_treebanks import twt_pb2
+
+Buffer = Union[bytes, mmap.mmap]
+
+_WHITESPACE = frozenset(b" \t\n\r\x0b\x0c")
+_SENTENCE_ID_PREFIX = b"# sent_id = "
+_TEXT_PREFIX = b"# text = "
+_COLUMN_COUNT = 10
+# Line breaks of treebank files read in text mode with universal newlines.
+_LINE_BREAK = rb"(?:\r\n|\r(?!\n)|\n)"
+_LINE_BREAKS = re.compile(_LINE_BREAK)
+# UTF-8 encoded whitespace characters (as told by str.isspace) which do not
+# break lines.
+_BLANK = (rb"(?:[ \t\x0b\x0c\x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80"
+          rb"|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)")
+# Sentence annotations are separated by lines that are empty or only contain
+# whitespace, that is, by a line break followed by such lines.
+_SEPARATOR = re.compile(
+    _LINE_BREAK + rb"(?:" + _BLANK + rb"*" + _LINE_BREAK + rb")+")
+
+
+class Tag(NamedTuple):
+  """Part-of-speech tags of a token."""
+  coarse: str
+  fine: str
+
+
+class Feature(NamedTuple):
+  """Feature category-value pair of a token."""
+  category: str
+  value: str
+
+
+def _trimmed(buffer: Buffer, start: int, end: int) -> Tuple[int, int]:
+  """Returns the byte range without leading and trailing whitespace."""
+  while start < end and buffer[start] in _WHITESPACE:
+    start += 1
+  while end > start and buffer[end - 1] in _WHITESPACE:
+    end -= 1
+  return start, end
+
+
+def _starts_with(buffer: Buffer, prefix: bytes, start: int) -> bool:
+  """Checks if the bytes of the buffer at the offset start with the prefix."""
+  return buffer.find(prefix, start, start + len(prefix)) == start
+
+
+def _decoded(buffer: Buffer, start: int, end: int) -> str:
+  """Decodes the byte range of the buffer as UTF-8 string."""
+  return str(buffer[start:end], "utf-8")
+
+
+def _decompose_features(raw_features: str) -> Tuple[Feature, ...]:
+  """Parses CoNLL-U format features annotations into Feature tuples."""
+  return tuple(
+      Feature(*f.split("=")) for f in raw_features.split("|") if f != "_")
+
+
+class TokenView:
+  """Token annotations of a single CoNLL-U format token line."""
+
+  __slots__ = ("_buffer", "_start", "_end", "_columns")
+
+  def __init__(self, buffer: Buffer, start: int, end: int):
+    self._buffer = buffer
+    self._start = start
+    self._end = end
+    self._columns: Optional[List[int]] = None
+
+  def _column(self, index: int) -> str:
+    """Decodes the column with given index of the token line."""
+    if self._columns is None:
+      self._columns = self._find_columns()
+    return _decoded(self._buffer, self._columns[index] + 1,
+                    self._columns[index + 1])
+
+  def _find_columns(self) -> List[int]:
+    """Finds byte offsets of column separators of the token line."""
+    columns = [self._start - 1]
+    find = self._buffer.find
+    for _ in range(_COLUMN_COUNT - 1):
+      separator = find(b"\t", columns[-1] + 1, self._end)
+      if separator == -1:
+        break
+      columns.append(separator)
+    columns.append(self._end)
+    if (len(columns) != _COLUMN_COUNT + 1
+        or find(b"\t", columns[-2] + 1, self._end) != -1):
+      raise ValueError(f"Illformed CoNNL-U format token annotation:\n"
+                       f"{_decoded(self._buffer, self._start, self._end)}")
+    return columns
+
+  @property
+  def form(self) -> str:
+    return self._column(1)
+
+  @property
+  def lemma(self) -> str:
+    return self._column(2)
+
+  @property
+  def tag(self) -> Tag:
+    return Tag(coarse=self._column(3), fine=self._column(4))
+
+  @property
+  def feature(self) -> Tuple[Feature, ...]:
+    return _decompose_features(self._column(5))
+
+  @property
+  def head(self) -> int:
+    return int(self._column(6))
+
+  @property
+  def dependency_relation(self) -> str:
+    return self._column(7)
+
+  @property
+  def misc_feature(self) -> Tuple[Feature, ...]:
+    return _decompose_features(self._column(9))
+
+  def to_proto(self) -> twt_pb2.Token:
+    """Decodes all annotations of the token into a token protobuf."""
+    coarse, fine = self.tag
+    return twt_pb2.Token(
+        form=self.form,
+        lemma=self.lemma,
+        tag=twt_pb2.Tag(coarse=coarse, fine=fine),
+        feature=(twt_pb2.Feature(category=c, value=v)
+                 for c, v in self.feature),
+        head=self.head,
+        dependency_relation=self.dependency_relation,
+        misc_feature=(twt_pb2.Feature(category=c, value=v)
+                      for c, v in self.misc_feature),
+    )
+
+
+class SentenceView:
+  """Sentence annotations of a single CoNLL-U format sentence block.
+
+  Sentence annotations are validated lazily, the first time one of their
+  fields is read.
+  """
+
+  __slots__ = ("_buffer", "_start", "_end", "_lines")
+
+  def __init__(self, buffer: Buffer, start: int, end: int):
+    self._buffer = buffer
+    self._start = start
+    self._end = end
+    self._lines: Optional[List[Tuple[int, int]]] = None
+
+  def _find_lines(self) -> List[Tuple[int, int]]:
+    """Finds byte ranges of whitespace trimmed lines of the sentence."""
+    lines = []
+    start = self._start
+    for line_break in _LINE_BREAKS.finditer(self._buffer, self._start,
+                                            self._end):
+      lines.append(_trimmed(self._buffer, start, line_break.start()))
+      start = line_break.end()
+    lines.append(_trimmed(self._buffer, start, self._end))
+
+    if len(lines) <= 2:
+      raise ValueError(
+          f"Expecting a sentence to be at least 3 lines in CoNLL-U format,"
+          f" but found a {len(lines)} line sentence annotation:\n"
+          f"{self.to_conllu()}")
+
+    if not _starts_with(self._buffer, _SENTENCE_ID_PREFIX, lines[0][0]):
+      raise ValueError(
+          f"First line of the CoNNL-U format sentence annotation does not have"
+          f" a valid sentence id annotation:\n{self.to_conllu()}")
+
+    if not _starts_with(self._buffer, _TEXT_PREFIX, lines[1][0]):
+      raise ValueError(
+          f"Second line of the CoNNL-U format sentence annotation does not"
+          f" have a valid sentence text annotation:\n{self.to_conllu()}")
+
+    return lines
+
+  def _line(self, index: int) -> Tuple[int, int]:
+    """Returns byte range of the line with given index of the sentence."""
+    if self._lines is None:
+      self._lines = self._find_lines()
+    return self._lines[index]
+
+  @property
+  def sentence_id(self) -> str:
+    start, end = self._line(0)
+    return _decoded(self._buffer, start + len(_SENTENCE_ID_PREFIX), end)
+
+  @property
+  def text(self) -> str:
+    start, end = self._line(1)
+    return _decoded(self._buffer, start + len(_TEXT_PREFIX), end)
+
+  @property
+  def token(self) -> List[TokenView]:
+    self._line(0)
+    return [TokenView(self._buffer, s, e) for s, e in self._lines[2:]]
+
+  def to_conllu(self) -> str:
+    """Decodes the sentence annotation in CoNLL-U format."""
+    return _decoded(self._buffer, self._start, self._end)
+
+  def to_proto(self) -> twt_pb2.Sentence:
+    """Decodes all annotations of the sentence into a sentence protobuf."""
+    return twt_pb2.Sentence(
+        sentence_id=self.sentence_id,
+        text=self.text,
+        token=(t.to_proto() for t in self.token),
+    )
+
+
+def sentence_ranges(
+    buffer: Buffer) -> Generator[Tuple[int, int], None, None]:
+  """Finds byte ranges of sentence annotations in CoNLL-U format bytes.
+
+  Sentence annotations are separated by lines that are empty or only contain
+  whitespace, with any of the '\\n', '\\r\\n' and '\\r' line breaks, as when
+  treebank files are read line by line in text mode.
+
+  Args:
+    buffer: contents of a CoNLL-U format treebank file.
+
+  Yields:
+    Start and end byte offsets of the whitespace trimmed sentence annotations
+    in the buffer, in the order they appear.
+  """
+  start = 0
+  for separator in _SEPARATOR.finditer(buffer):
+    sentence_start, sentence_end = _trimmed(buffer, start, separator.start())
+    if sentence_start < sentence_end:
+      yield sentence_start, sentence_end
+    start = separator.end()
+  sentence_start, sentence_end = _trimmed(buffer, start, len(buffer))
+  if sentence_start < sentence_end:
+    yield sentence_start, sentence_end
+
+
+def sentence_views(buffer: Buffer) -> Generator[SentenceView, None, None]:
+  """Finds sentence annotations in CoNLL-U format bytes.
+
+  Args:
+    buffer: contents of a CoNLL-U format treebank file.
+
+  Yields:
+    Views of the sentence annotations in the buffer, in the order they appear.
+  """
+  for start, end in sentence_ranges(buffer):
+    yield SentenceView(buffer, start, end)
@@ -0,0 +1,121 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.mapped."""
+
+from turkish_treebanks import mapped
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+_TOKEN_LINE = b"1\tEvet\tevet\tINTJ\tUH\t_\t0\troot\t_\t_"
+_CONLLU = """
+# sent_id = s1
+# text = Kitap okudum.
+1\tKitap\tkitap\tNOUN\tNN\tPersonNumber=A3sg|Case=Bare\t2\tdobj\t_\t_
+2\toku\toku\tVERB\tVB\tPolarity=Pos\t0\troot\t_\tSpaceAfter=No
+3\t.\t.\tPUNCT\t.\tProper=False\t2\tp\t_\t_
+
+# sent_id = s2
+# text = Evet
+1\tEvet\tevet\tINTJ\tUH\t_\t0\troot\t_\t_
+""".encode("utf-8")
+
+
+class SentenceViewsTest(parameterized.TestCase):
+
+  def test_finds_sentences(self):
+    views = list(mapped.sentence_views(_CONLLU))
+    self.assertEqual(["s1", "s2"], [v.sentence_id for v in views])
+    self.assertEqual(["Kitap okudum.", "Evet"], [v.text for v in views])
+    self.assertEqual([3, 1], [len(v.token) for v in views])
+    self.assertStartsWith(views[1].to_conllu(), "# sent_id = s2\n")
+
+  @parameterized.named_parameters([
+      ("CrLf", b"\r\n", b"\r\n"),
+      ("Cr", b"\r", b"\r"),
+      ("WhitespaceOnlySeparator", b"\n", b"\n \t\n"),
+      ("CrLfWhitespaceOnlySeparator", b"\r\n", b"\r\n \r\n\r\n"),
+  ])
+  def test_finds_sentences_separated_by_blank_lines(self, line_break,
+                                                    separator):
+    conllu = _CONLLU.strip().replace(b"\n\n", b"\0").replace(
+        b"\n", line_break).replace(b"\0", line_break + separator)
+    views = list(mapped.sentence_views(conllu))
+    self.assertEqual(["s1", "s2"], [v.sentence_id for v in views])
+    self.assertEqual(["Kitap okudum.", "Evet"], [v.text for v in views])
+    self.assertEqual([3, 1], [len(v.token) for v in views])
+    self.assertEqual("Bare", views[0].token[0].feature[1].value)
+
+  def test_decodes_tokens(self):
+    token = next(mapped.sentence_views(_CONLLU)).token[1]
+    self.assertEqual("oku", token.form)
+    self.assertEqual("oku", token.lemma)
+    self.assertEqual(mapped.Tag(coarse="VERB", fine="VB"), token.tag)
+    self.assertEqual((mapped.Feature("Polarity", "Pos"),), token.feature)
+    self.assertEqual(0, token.head)
+    self.assertEqual("root", token.dependency_relation)
+    self.assertEqual((mapped.Feature("SpaceAfter", "No"),),
+                     token.misc_feature)
+
+  def test_converts_to_proto(self):
+    sentence = list(mapped.sentence_views(_CONLLU))[1].to_proto()
+    expected = twt_pb2.Sentence(
+        sentence_id="s2",
+        text="Evet",
+        token=[
+            twt_pb2.Token(
+                form="Evet",
+                lemma="evet",
+                tag=twt_pb2.Tag(coarse="INTJ", fine="UH"),
+                head=0,
+                dependency_relation="root",
+            )
+        ],
+    )
+    self.assertEqual(expected, sentence)
+
+  @parameterized.named_parameters([
+      {
+          "testcase_name": "TooFewLines",
+          "conllu": b"# sent_id = s1\n# text = Evet",
+          "error": "Expecting a sentence to be at least 3 lines",
+      },
+      {
+          "testcase_name": "MissingSentenceId",
+          "conllu": b"# text = Evet\n# text = Evet\n" + _TOKEN_LINE,
+          "error": "does not have a valid sentence id annotation",
+      },
+      {
+          "testcase_name": "MissingText",
+          "conllu": b"# sent_id = s1\n# sent_id = s1\n" + _TOKEN_LINE,
+          "error": "does not have a valid sentence text annotation",
+      },
+  ])
+  def test_raises_exception_for_illformed_sentence(self, conllu, error):
+    view = next(mapped.sentence_views(conllu))
+    with self.assertRaisesRegex(ValueError, error):
+      view.sentence_id
+
+  @parameterized.parameters([b"1\tEvet\tevet", _TOKEN_LINE + b"\t_"])
+  def test_raises_exception_for_illformed_token(self, line):
+    view = next(mapped.sentence_views(b"# sent_id = s\n# text = t\n" + line))
+    with self.assertRaisesRegex(ValueError, "Illformed CoNNL-U format token"):
+      view.token[0].form
+
+
+if __name__ == "__main__":
+  absltest.main()
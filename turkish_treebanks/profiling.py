@@ -0,0 +1,248 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-stage timers and counters of the treebank reading pipeline.
+
+Reading is only instrumented while a profile is active (see profile), and
+streams of the pipeline are only wrapped when they are created while a
+profile is active, so the overhead of instrumentation is a single check per
+stream when profiling is disabled.
+
+Stages of the pipeline are:
+
+  fingerprint: hashing treebank files (and their sentence annotations) to
+      check caches.
+  read: reading treebank files and splitting them into sentence annotations.
+  validate: validating sentence annotations that are not parsed.
+  parse: validating and parsing sentence annotations, which is done in a
+      single pass (waiting for worker processes if sentences are parsed in
+      parallel).
+  cache_load: loading and deserializing cached sentences.
+  cache_write: serializing and writing cached sentences.
+
+Time of a stage is exclusive of the time of the stages nested in it, for
+example the time of parsing sentence annotations does not include the time of
+reading them. Counters are:
+
+  bytes_read: size of the treebank files that are read.
+  sentences: number of sentences (or sentence annotations) that are read.
+  tokens: number of tokens of the sentences.
+  features: number of morphological features of the tokens of the sentences.
+  cache_hits: number of treebank files whose sentences are read from cache.
+  cache_misses: number of treebank files whose sentences are not cached.
+  memory_hits: number of cache hits whose sentences are read from memory
+      rather than from disk.
+  reused_sentences: number of cached sentences that are reused when the
+      treebank file they are cached from changes, since their annotations are
+      unchanged.
+"""
+
+import collections
+import contextlib
+import threading
+import time
+from typing import (Callable, DefaultDict, Generator, Iterable, Iterator, List,
+                    Optional, TypeVar, Union)
+
+_T = TypeVar("_T")
+
+Observer = Callable[[str, Union[int, float]], None]
+
+
+class Report:
+  """Timers and counters of the pipeline stages within a profile.
+
+  Attributes:
+    seconds: exclusive time spent in each stage, in seconds.
+    counts: value of each counter.
+    observer: optional, function that is called with the name of the stage or
+        counter, and the time spent in the stage or the increment of the
+        counter, each time one is reported.
+  """
+
+  __slots__ = ("seconds", "counts", "observer")
+
+  def __init__(self, observer: Optional[Observer] = None):
+    self.seconds: DefaultDict[str, float] = collections.defaultdict(float)
+    self.counts: DefaultDict[str, int] = collections.defaultdict(int)
+    self.observer = observer
+
+  def __repr__(self) -> str:
+    return f"Report(seconds={dict(self.seconds)}, counts={dict(self.counts)})"
+
+  def summary(self) -> str:
+    """Formats timers and counters into a human readable table."""
+    total = sum(self.seconds.values())
+    lines = [
+        f"{stage:>12} {seconds * 1000:>10.2f} ms"
+        f" {seconds / total if total else 0.0:>7.1%}"
+        for stage, seconds in sorted(
+            self.seconds.items(), key=lambda s: -s[1])
+    ]
+    lines.extend(f"{counter:>12} {value:>10}"
+                 for counter, value in sorted(self.counts.items()))
+    return "\n".join(lines)
+
+
+# Reports of the active profiles, innermost last.
+_reports: List[Report] = []
+# Guards reports, which are updated from the threads that read treebank files.
+_lock = threading.Lock()
+# Stack of the time spent in the stages nested in each open timed region of
+# the thread, innermost last.
+_regions = threading.local()
+
+
+def enabled() -> bool:
+  """Checks if a profile is active."""
+  return bool(_reports)
+
+
+def _notify(observers: List[Observer], name: str,
+            value: Union[int, float]) -> None:
+  """Calls observers of the reports, once the lock is released."""
+  for observer in observers:
+    observer(name, value)
+
+
+def _add_seconds(stage: str, seconds: float) -> None:
+  """Adds time spent in the stage to the active profiles."""
+  with _lock:
+    for report in _reports:
+      report.seconds[stage] += seconds
+    observers = [r.observer for r in _reports if r.observer is not None]
+  _notify(observers, stage, seconds)
+
+
+def count(counter: str, value: int = 1) -> None:
+  """Increments the counter of the active profiles, if there are any."""
+  if not _reports:
+    return
+
+  with _lock:
+    for report in _reports:
+      report.counts[counter] += value
+    observers = [r.observer for r in _reports if r.observer is not None]
+  _notify(observers, counter, value)
+
+
+@contextlib.contextmanager
+def timer(stage: str) -> Iterator[None]:
+  """Times the stage within the context, if a profile is active.
+
+  Args:
+    stage: name of the stage.
+
+  Yields:
+    Nothing.
+  """
+  if not _reports:
+    yield
+    return
+
+  nested_seconds = getattr(_regions, "nested_seconds", None)
+  if nested_seconds is None:
+    nested_seconds = _regions.nested_seconds = []
+  nested_seconds.append(0.0)
+  start = time.perf_counter()
+  try:
+    yield
+  finally:
+    seconds = time.perf_counter() - start
+    nested = nested_seconds.pop()
+    if nested_seconds:
+      nested_seconds[-1] += seconds
+    _add_seconds(stage, seconds - nested)
+
+
+def _timed(stage: str, iterator: Iterator[_T]) -> Generator[_T, None, None]:
+  """Yields values of the iterator, timing each step of it as the stage."""
+  while True:
+    with timer(stage):
+      try:
+        value = next(iterator)
+      except StopIteration:
+        return
+    yield value
+
+
+def timed(stage: str, values: Iterable[_T]) -> Iterable[_T]:
+  """Times producing the values of a stream as the stage.
+
+  Args:
+    stage: name of the stage.
+    values: stream of values, such as a generator.
+
+  Returns:
+    Values of the stream, timed if a profile is active, or the stream itself
+    otherwise.
+  """
+  if not _reports:
+    return values
+
+  return _timed(stage, iter(values))
+
+
+def _counted(sentences: Iterable[_T]) -> Generator[_T, None, None]:
+  """Yields sentences, counting them together with their tokens."""
+  for sentence in sentences:
+    count("sentences")
+    if isinstance(sentence, str):
+      count("tokens", sentence.count("\n") - 1)
+    else:
+      count("tokens", len(sentence.token))
+      count("features", sum(len(t.feature) for t in sentence.token))
+    yield sentence
+
+
+def counted(sentences: Iterable[_T]) -> Iterable[_T]:
+  """Counts sentences of a stream together with their tokens and features.
+
+  Args:
+    sentences: stream of sentences, or of CoNLL-U format sentence annotations
+        whose features are not counted.
+
+  Returns:
+    Sentences of the stream, counted if a profile is active, or the stream
+    itself otherwise.
+  """
+  if not _reports:
+    return sentences
+
+  return _counted(sentences)
+
+
+@contextlib.contextmanager
+def profile(observer: Optional[Observer] = None) -> Iterator[Report]:
+  """Profiles reading within the context.
+
+  Profiles are process wide, including reading in other threads, and can be
+  nested, in which case reading is reported to all active profiles.
+
+  Args:
+    observer: optional, function that is called with the name of the stage or
+        counter, and the time spent in the stage or the increment of the
+        counter, each time one is reported (see Report).
+
+  Yields:
+    Report of timers and counters, which is updated as sentences are read
+    within the context.
+  """
+  report = Report(observer)
+  _reports.append(report)
+  try:
+    yield report
+  finally:
+    _reports.remove(report)
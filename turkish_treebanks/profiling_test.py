@@ -0,0 +1,110 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.profiling."""
+
+import time
+from unittest import mock
+
+from turkish_treebanks import profiling
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+
+
+def _clock(*times):
+  return mock.patch.object(time, "perf_counter", side_effect=times)
+
+
+class ProfilingTest(absltest.TestCase):
+
+  def test_is_disabled_without_profile(self):
+    self.assertFalse(profiling.enabled())
+    values = iter([1, 2])
+    self.assertIs(values, profiling.timed("read", values))
+    self.assertIs(values, profiling.counted(values))
+    with profiling.profile():
+      self.assertTrue(profiling.enabled())
+    self.assertFalse(profiling.enabled())
+
+  def test_times_stages_exclusively(self):
+    with profiling.profile() as report:
+      with _clock(0.0, 1.0, 3.0, 10.0):
+        with profiling.timer("parse"):
+          with profiling.timer("read"):
+            pass
+    self.assertEqual({"parse": 8.0, "read": 2.0}, report.seconds)
+
+  def test_times_nested_streams_exclusively(self):
+    with profiling.profile() as report:
+      with _clock(0.0, 1.0, 2.0, 5.0, 6.0, 7.0, 8.0, 9.0):
+        read = profiling.timed("read", iter(["a"]))
+        parsed = profiling.timed("parse", (s.upper() for s in read))
+        self.assertEqual(["A"], list(parsed))
+    self.assertEqual({"parse": 6.0, "read": 2.0}, report.seconds)
+
+  def test_counts_sentences_tokens_and_features(self):
+    sentence = twt_pb2.Sentence(token=[
+        twt_pb2.Token(feature=[twt_pb2.Feature(), twt_pb2.Feature()]),
+        twt_pb2.Token(feature=[twt_pb2.Feature()]),
+    ])
+    annotation = "# sent_id = 1\n# text = a b\n1\ta\n2\tb\n3\tc"
+    with profiling.profile() as report:
+      profiling.count("bytes_read", 10)
+      self.assertEqual([sentence, annotation],
+                       list(profiling.counted([sentence, annotation])))
+    self.assertEqual(
+        {"bytes_read": 10, "sentences": 2, "tokens": 5, "features": 3},
+        report.counts)
+
+  def test_reports_to_nested_profiles_and_observer(self):
+    observed = []
+    with profiling.profile() as outer:
+      profiling.count("sentences")
+      with profiling.profile(lambda *event: observed.append(event)) as inner:
+        profiling.count("sentences", 2)
+    profiling.count("sentences", 4)
+    self.assertEqual(3, outer.counts["sentences"])
+    self.assertEqual(2, inner.counts["sentences"])
+    self.assertEqual([("sentences", 2)], observed)
+
+  def test_observer_can_report_to_profiles(self):
+
+    def _observe(name, value):
+      if name == "sentences":
+        profiling.count("observed", value)
+
+    with profiling.profile(_observe) as report:
+      profiling.count("sentences", 2)
+    self.assertEqual({"sentences": 2, "observed": 2}, report.counts)
+
+  def test_does_not_lock_counters_without_profile(self):
+    with mock.patch.object(profiling, "_lock") as lock:
+      profiling.count("sentences")
+    lock.__enter__.assert_not_called()
+
+  def test_summarizes_report(self):
+    report = profiling.Report()
+    report.seconds["parse"] = 0.003
+    report.seconds["read"] = 0.001
+    report.counts["sentences"] = 7
+    self.assertEqual(
+        "       parse       3.00 ms   75.0%\n"
+        "        read       1.00 ms   25.0%\n"
+        "   sentences          7", report.summary())
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -13,20 +13,57 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Functions to read Turkish Web Treebank sentence annotations."""
+"""Functions to read Turkish Web Treebank sentence annotations.
 
+Importing this module does not import the protobuf runtime, which is imported
+the first time sentences are read as protobufs (or their caches are loaded),
+so that reading sentence annotations in CoNLL-U format starts quickly.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import functools
+import itertools
+import mmap
 import os
-import pathlib
-from typing import Generator, Iterable, List, Optional
+import threading
+from typing import (TYPE_CHECKING, Callable, ContextManager, Dict, Generator,
+                    Iterable, Iterator, List, NamedTuple, Optional, Sequence,
+                    TextIO, Tuple, TypeVar, Union)
 
 from turkish_treebanks import twt_pb2
 
-_Feature = twt_pb2.Feature
-_Sentence = twt_pb2.Sentence
-_Tag = twt_pb2.Tag
-_Token = twt_pb2.Token
+# Modules that are only needed by some of the functions are imported by them,
+# so that importing this module stays fast.
+if TYPE_CHECKING:
+  from turkish_treebanks import arrays as arrays_lib
+  from turkish_treebanks import batches as batches_lib
+  from turkish_treebanks import compact
+  from turkish_treebanks import evaluate as evaluate_lib
+  from turkish_treebanks import index as index_lib
+  from turkish_treebanks import lru
+  from turkish_treebanks import mapped
+  from turkish_treebanks import profiling
+  from turkish_treebanks import shared as shared_lib
+  from turkish_treebanks import sources as sources_lib
+  from turkish_treebanks import stats as stats_lib
+  from turkish_treebanks import trees as trees_lib
+
+  _Corpus = twt_pb2.Corpus
+  _Feature = twt_pb2.Feature
+  _Sentence = twt_pb2.Sentence
+  _SentenceOffsets = twt_pb2.SentenceOffsets
+  _Statistics = twt_pb2.Statistics
+  _Tag = twt_pb2.Tag
+  _Token = twt_pb2.Token
+  _CachedMessage = Union[_Corpus, _SentenceOffsets, _Statistics]
+
+  Index = index_lib.Index
+  Report = profiling.Report
 
-_ROOT_DIR = pathlib.Path(__file__).parent.parent
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _DATA_DIR = os.path.join(_ROOT_DIR, "data")
 _PATHS_BY_SECTION = {
     "web": os.path.join(_DATA_DIR, "web.conllu"),
@@ -37,6 +74,126 @@ _VALID_SPLIT_NAMES = [
     "dev",
     "test",
 ]
+_CACHE_DIR_ENV_VAR = "TURKISH_TREEBANKS_CACHE_DIR"
+_NO_CACHE_ENV_VAR = "TURKISH_TREEBANKS_NO_CACHE"
+_HASH_CHUNK_SIZE = 1 << 20
+_SENTENCE_ID_PREFIX = b"# sent_id = "
+_CORPUS_CACHE = "corpus"
+_OFFSETS_CACHE = "offsets"
+_VALIDATED_CACHE = "validated"
+_STATS_CACHE = "stats"
+_PARALLEL_CHUNK_SIZE = 64
+_WRITE_BUFFER_SIZE = 1 << 20
+_MEMORY_CACHE_MAX_ENTRIES = 4
+_MEMORY_CACHE_MAX_BYTES = 256 << 20
+_VALID_REPRESENTATIONS = [
+    "proto",
+    "compact",
+]
+_VALID_VALIDATION_MODES = [
+    "strict",
+    "collect",
+    "off",
+]
+
+
+class _Fingerprint(NamedTuple):
+  """Identifies the contents of a treebank file."""
+  size: int
+  mtime_ns: int
+  sha256: str
+
+
+class _KeptCorpus(NamedTuple):
+  """Corpus of a treebank file that is kept in memory."""
+  corpus: _Corpus
+  cached: bool  # Whether the corpus is also cached on disk.
+
+
+class _OffsetIndex(NamedTuple):
+  """Byte offsets of sentence annotations in a treebank file."""
+  offsets: _SentenceOffsets
+  ordinal_by_sentence_id: Dict[str, int]
+
+
+class StructuralError(NamedTuple):
+  """Structural error in a CoNLL-U format treebank file."""
+  path: str
+  line: int
+  message: str
+
+
+class CorpusChanges(NamedTuple):
+  """Changes to the sentences of a treebank file since its corpus is cached.
+
+  Attributes:
+    path: path to the treebank file.
+    added: ids of the sentences that are added, in the order they appear in
+        the treebank file.
+    removed: ids of the sentences that are removed, in the order they appeared
+        in the treebank file.
+    changed: ids of the sentences whose annotations changed, in the order they
+        appear in the treebank file.
+    resplit: ids of the sentences that moved into another split, since splits
+        are assigned by the position of sentences (for example when sentences
+        are inserted before them), in the order they appear in the treebank
+        file.
+  """
+  path: str
+  added: List[str]
+  removed: List[str]
+  changed: List[str]
+  resplit: List[str]
+
+
+class ValidationError(ValueError):
+  """Treebank files have structural errors, which are all collected.
+
+  Attributes:
+    errors: structural errors of the treebank files, in the order they appear.
+  """
+
+  def __init__(self, errors: Sequence[StructuralError]):
+    super().__init__("\n".join(f"{e.path}:{e.line}: {e.message}"
+                               for e in errors))
+    self.errors = list(errors)
+
+
+_T = TypeVar("_T")
+_U = TypeVar("_U")
+
+# Offset indices of treebank files that are loaded so far, keyed by path.
+_offset_indices: Dict[str, _OffsetIndex] = {}
+
+# Fingerprints of treebank files that are validated so far, keyed by path.
+_validated_files: Dict[str, _Fingerprint] = {}
+
+# Corpora of treebank files that are read so far, keyed by path, which are
+# sized by their serialized size, or None until it is first used (see
+# _memory_cache).
+_corpora: Optional[lru.Cache[str, _KeptCorpus]] = None
+_corpora_lock = threading.Lock()
+
+
+def __getattr__(name: str) -> type:
+  """Resolves the aliases of classes of the modules that are imported later."""
+  if name == "Index":
+    from turkish_treebanks import index as index_lib
+    return index_lib.Index
+  if name == "Report":
+    from turkish_treebanks import profiling
+    return profiling.Report
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _memory_cache() -> lru.Cache[str, _KeptCorpus]:
+  """Returns the corpora kept in memory, creating their cache if needed."""
+  global _corpora
+  with _corpora_lock:
+    if _corpora is None:
+      from turkish_treebanks import lru
+      _corpora = lru.Cache(_MEMORY_CACHE_MAX_ENTRIES, _MEMORY_CACHE_MAX_BYTES)
+    return _corpora
 
 
 def _whitespace_trimmed(string: str) -> str:
@@ -59,18 +216,65 @@ def _reconstruct_conll_from(sentences: Iterable[str]) -> str:
   return "\n\n".join(sentences)
 
 
-def _read_sentences_from(path: str) -> Generator[str, None, None]:
+def _decoded_annotation(block: bytes) -> str:
+  """Decodes a sentence annotation as if it was read in text mode.
+
+  Line breaks are translated into '\\n' as with universal newlines, and the
+  annotation is whitespace trimmed.
+
+  Args:
+    block: UTF-8 encoded CoNLL-U format sentence annotation.
+
+  Returns:
+    The sentence annotation, as it is read from the treebank file line by line.
+  """
+  sentence = block.decode("utf-8")
+  if "\r" in sentence:
+    sentence = sentence.replace("\r\n", "\n").replace("\r", "\n")
+  return _whitespace_trimmed(sentence)
+
+
+def _read_numbered_sentences_from(
+    path: str) -> Generator[Tuple[int, str], None, None]:
   """Reads and yields sentences of a CoNLL-U format treebank file from the path.
 
+  The file is read line by line and each sentence annotation is yielded as soon
+  as the blank line that terminates it is read, so that only a single sentence
+  annotation is held in memory at a time regardless of the size of the file.
+
   Args:
     path: path to a CoNLL-U format treebank file from which sentences will be
-        read.
+        read, which is decompressed as it is read if it is compressed (see
+        turkish_treebanks.sources).
 
   Yields:
-    Individual sentence annotations of a CoNLL-U format treebank file.
+    Line number of the first line of each sentence annotation in the file
+    (assuming first line has number 1), together with the individual sentence
+    annotation.
+  """
+  from turkish_treebanks import sources as sources_lib
+  with sources_lib.open_text(path) as reader:
+    lines = []
+    first_line_number = 0
+    for line_number, line in enumerate(reader, start=1):
+      if not line.isspace():
+        if not lines:
+          first_line_number = line_number
+        lines.append(line)
+      elif lines:
+        yield first_line_number, _whitespace_trimmed("".join(lines))
+        lines = []
+    if lines:
+      yield first_line_number, _whitespace_trimmed("".join(lines))
+
+
+def _read_sentences_from(path: str) -> Generator[str, None, None]:
+  """Reads and yields sentences of a CoNLL-U format treebank file from the path.
+
+  See _read_numbered_sentences_from.
   """
-  with open(path, "r", encoding="utf-8") as reader:
-    yield from _split_into_sentences(reader.read())
+  for _, sentence in _read_numbered_sentences_from(path):
+    yield sentence
 
 
 def _sentence_is_in_split(sentence_index: int, split: str) -> bool:
@@ -100,149 +304,2449 @@ def _sentence_is_in_split(sentence_index: int, split: str) -> bool:
     return True
 
 
-def _validate_sentence(sentence: str) -> None:
-  """Checks if a CoNLL-U format sentence annotation is structurally wellformed.
+def _report(errors: Optional[List[Tuple[int, str]]], line_index: int,
+            message: str) -> None:
+  """Raises a structural error, or collects it if errors are being collected.
 
   Args:
-    sentence: a CoNNL-U format sentence annotation.
+    errors: structural errors of a sentence annotation collected so far, as
+        line index and error message pairs, or None if errors are raised.
+    line_index: index of the line of the sentence annotation with the error.
+    message: error message.
 
   Raises:
-    ValueError: CoNNL-U format sentence annotation is illformed. It is either
-        missing sentence id or text annotation, or one of the lines that ought
-        to contain token annotations is structurally illformed.
+    ValueError: structural errors are not being collected.
   """
-  lines = _split_into_lines(sentence)
+  if errors is None:
+    raise ValueError(message)
+
+  errors.append((line_index, message))
+
+
+def _validate_header(lines: List[str], sentence: str,
+                     errors: Optional[List[Tuple[int, str]]]) -> None:
+  """Checks the sentence id and text lines of a sentence annotation.
+
+  Args:
+    lines: whitespace trimmed lines of a CoNNL-U format sentence annotation.
+    sentence: the CoNNL-U format sentence annotation.
+    errors: list into which structural errors are collected, or None if they
+        are raised, see _report.
 
+  Raises:
+    ValueError: sentence annotation is missing sentence id or text annotation
+        and structural errors are not being collected.
+  """
   if len(lines) <= 2:
-    raise ValueError(
+    _report(
+        errors, 0,
         f"Expecting a sentence to be at least 3 lines in CoNLL-U format,"
-        f" but found a {len(sentence)} line sentence annotation:\n{sentence}")
+        f" but found a {len(lines)} line sentence annotation:\n{sentence}")
+    return
 
   if not lines[0].startswith("# sent_id = "):
-    raise ValueError(
+    _report(
+        errors, 0,
         f"First line of the CoNNL-U format sentence annotation does not have a"
         f" valid sentence id annotation:\n{sentence}")
 
   if not lines[1].startswith("# text = "):
-    raise ValueError(
+    _report(
+        errors, 1,
         f"Second line of the CoNNL-U format sentence annotation does not have a"
         f" valid sentence text annotation:\n{sentence}")
 
-  def _validate_token_line(line: str) -> None:
-    if len(line.split("\t")) != 10:
-      raise ValueError(f"Illformed CoNNL-U format token annotation:\n{line}")
 
-  for line in lines[3:]:
-    _validate_token_line(line)
+def _validate_token(lines: List[str], index: int, column: List[str],
+                    errors: Optional[List[Tuple[int, str]]]) -> bool:
+  """Checks the columns of a token line of a sentence annotation.
 
-
-def _decompose_sentence(sentence: str) -> _Sentence:
-  """Parses CoNLL-U format sentence annotation in a sentence protobuf.
+  Both sentence annotations that are parsed and that are not are checked with
+  it, so that they are wellformed under the same conditions.
 
   Args:
-    sentence: a CoNNL-U format sentence annotation.
+    lines: whitespace trimmed lines of a CoNNL-U format sentence annotation.
+    index: index of the token line.
+    column: tab separated columns of the token line.
+    errors: list into which structural errors are collected, or None if they
+        are raised, see _report.
+
+  Raises:
+    ValueError: token line does not have 10 columns, or its head is not a
+        non-negative integer, and structural errors are not being collected.
 
   Returns:
-    Sentence protobuf that contains annotations for a sentence that is parsed
-    from CoNLL-U format sentence annotation.
+    True if the token line is wellformed. Otherwise, returns False.
   """
+  if len(column) == 10 and column[6].isdigit():
+    return True
+
+  _report(errors, index,
+          f"Illformed CoNNL-U format token annotation:\n{lines[index]}")
+  return False
 
-  def _decompose_comment(line: str, prefix: str) -> None:
-    """Decomposes a comment line of CoNNL-U format."""
-    return line[len(prefix):]
 
-  def _decompose_features(raw_features: str) -> Generator[_Feature, None, None]:
-    """Parses CoNLL-U format features annotations into Feature objects."""
-    category_value = (f.split("=") for f in raw_features.split("|") if f != "_")
-    yield from (_Feature(category=n, value=v) for n, v in category_value)
+def _validate_sentence(sentence: str,
+                       errors: Optional[List[Tuple[int, str]]] = None) -> None:
+  """Checks if a CoNLL-U format sentence annotation is structurally wellformed.
+
+  Only used when sentence annotations are not parsed, since _parse_sentence
+  validates sentence annotations as it parses them.
 
-  def _decompose_token(line: str) -> _Token:
-    """Parses CoNLL-U format token annotations into Token objects."""
-    column = line.split("\t")
-    return _Token(
-        form=column[1],
-        lemma=column[2],
-        tag=_Tag(coarse=column[3], fine=column[4]),
-        feature=_decompose_features(column[5]),
-        head=int(column[6]),
-        dependency_relation=column[7],
-        misc_feature=_decompose_features(column[9]),
-    )
+  Args:
+    sentence: a CoNNL-U format sentence annotation.
+    errors: optional, list into which structural errors are collected as line
+        index and error message pairs. If unspecified the first structural
+        error is raised.
 
+  Raises:
+    ValueError: CoNNL-U format sentence annotation is illformed and structural
+        errors are not being collected. It is either missing sentence id or
+        text annotation, or one of the lines that ought to contain token
+        annotations is structurally illformed.
+  """
   lines = _split_into_lines(sentence)
-  return _Sentence(
-      sentence_id=_decompose_comment(lines[0], "# sent_id = "),
-      text=_decompose_comment(lines[1], "# text = "),
-      token=tuple(_decompose_token(line) for line in lines[2:]),
+  _validate_header(lines, sentence, errors)
+  for index in range(2, len(lines)):
+    _validate_token(lines, index, lines[index].split("\t"), errors)
+
+
+def _decompose_features(raw_features: str) -> Generator[_Feature, None, None]:
+  """Parses CoNLL-U format features annotations into Feature objects."""
+  category_value = (f.split("=") for f in raw_features.split("|") if f != "_")
+  yield from (
+      twt_pb2.Feature(category=n, value=v) for n, v in category_value)
+
+
+def _token_from_columns(column: List[str]) -> _Token:
+  """Parses columns of a CoNLL-U format token annotation into a Token object."""
+  return twt_pb2.Token(
+      form=column[1],
+      lemma=column[2],
+      tag=twt_pb2.Tag(coarse=column[3], fine=column[4]),
+      feature=_decompose_features(column[5]),
+      head=int(column[6]),
+      dependency_relation=column[7],
+      misc_feature=_decompose_features(column[9]),
   )
 
 
-def as_conllu(section: Optional[str] = None,
-              split: Optional[str] = None) -> str:
-  """Reads sentence annotations of Turkish Web Treebank in CoNLL-U format.
+def _parse_sentence(
+    sentence: str,
+    interner: Optional[compact.Interner] = None,
+    validate: bool = True,
+    errors: Optional[List[Tuple[int, str]]] = None
+) -> Optional[Union[_Sentence, compact.Sentence]]:
+  """Validates and parses a CoNLL-U format sentence annotation in one pass.
+
+  Sentence annotation is split into lines, and each token line is split into
+  columns, only once. Columns are checked as they are parsed.
 
   Args:
-    section: optional, section of Turkish Web Treebank whose sentence
-        annotations will be read (could be either 'web' or 'wiki'). If
-        unspecified sentence annotations from web and Wikipedia sections will
-        be read.
-    split: optional, treebank split whose sentence annotations will be read
-        (could be 'train', 'test', 'dev'). If unspecified sentence annotations
-        from all three splits will be read.
+    sentence: a CoNNL-U format sentence annotation.
+    interner: optional, interner of the annotations of the compact sentence.
+        If unspecified the sentence annotation is parsed into a sentence
+        protobuf.
+    validate: optional, if False the sentence annotation is trusted to be
+        wellformed and is not checked.
+    errors: optional, list into which structural errors are collected as line
+        index and error message pairs. If unspecified the first structural
+        error is raised.
 
   Raises:
-    ValueError: invalid section name or split specifier, or source treebank
-        files from which the sentence annotations are read is not valid with
-        respect to the CoNLL-U format.
+    ValueError: CoNNL-U format sentence annotation is illformed and structural
+        errors are not being collected.
 
   Returns:
-    Sentence annotations for the specified treebank and split in CoNNL-U
-    treebank file format.
+    Sentence protobuf, or compact sentence if an interner is given, that
+    contains annotations of the sentence annotation. None if structural errors
+    of the sentence annotation are collected instead.
+  """
+  lines = _split_into_lines(sentence)
+  error_count = 0 if errors is None else len(errors)
+  if validate:
+    _validate_header(lines, sentence, errors)
+
+  if interner is None:
+    token_from_columns = _token_from_columns
+  else:
+    from turkish_treebanks import compact
+    token_from_columns = functools.partial(
+        compact.token_from_columns, interner=interner)
+
+  tokens = []
+  for index in range(2, len(lines)):
+    column = lines[index].split("\t")
+    if validate and not _validate_token(lines, index, column, errors):
+      continue
+    tokens.append(token_from_columns(column))
+
+  if errors is not None and len(errors) > error_count:
+    return None
+
+  sentence_id = lines[0][len("# sent_id = "):]
+  text = lines[1][len("# text = "):]
+  if interner is None:
+    return twt_pb2.Sentence(
+        sentence_id=sentence_id, text=text, token=tokens)
+
+  return compact.Sentence(sentence_id=sentence_id, text=text,
+                          token=tuple(tokens))
+
+
+def _path_for(section: str) -> str:
+  """Returns path to the treebank file of the section.
+
+  Args:
+    section: section of Turkish Web Treebank (could be either 'web' or
+        'wiki').
+
+  Raises:
+    ValueError: invalid section name.
+
+  Returns:
+    Path to the CoNLL-U format treebank file of the section.
   """
-  if section and section not in _PATHS_BY_SECTION:
+  if section not in _PATHS_BY_SECTION:
     raise ValueError(f"Invalid section name '{section}'."
                      f" It can only be one of: 'web', 'wiki'.")
 
+  return _PATHS_BY_SECTION[section]
+
+
+def _paths_for(
+    section: Optional[str],
+    split: Optional[str],
+    sources: Optional[sources_lib.Sources] = None) -> List[str]:
+  """Returns paths to the treebank files that make up the section.
+
+  Args:
+    section: optional, section of Turkish Web Treebank (could be either 'web'
+        or 'wiki'). If unspecified paths to both sections are returned.
+    split: optional, treebank split (could be 'train', 'test', 'dev'). Only
+        used for validation.
+    sources: optional, paths or glob patterns of treebank files (see
+        turkish_treebanks.sources), whose paths are returned in place of the
+        ones of the sections.
+
+  Raises:
+    ValueError: invalid section name or split specifier, both section and
+        sources are given, or sources do not resolve into treebank files.
+
+  Returns:
+    Sorted paths to the CoNLL-U format treebank files of the section, or
+    paths to the treebank files of the sources in their resolved order.
+  """
+  from turkish_treebanks import sources as sources_lib
+  if sources is None:
+    paths = [_path_for(section)] if section else sorted(
+        _PATHS_BY_SECTION.values())
+  elif section:
+    raise ValueError("Either a section or sources can be read, not both.")
+  else:
+    paths = sources_lib.resolve(sources)
+
   if split and split not in _VALID_SPLIT_NAMES:
     raise ValueError(f"Invalid split specifier '{split}'."
                      f" It can only be one of: 'train', 'dev', 'test'")
 
-  if section:
-    paths = (p for s, p in _PATHS_BY_SECTION.items() if s == section)
+  return paths
+
+
+def _mapped(path: str) -> Optional[mmap.mmap]:
+  """Memory-maps the file for reading, or returns None if it is empty."""
+  if os.path.getsize(path) == 0:
+    return None  # Empty files can not be memory-mapped.
+
+  with open(path, "rb") as reader:
+    return mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _scan_sentences_in_split(path: str,
+                             split: str) -> Generator[str, None, None]:
+  """Reads sentences of a treebank file that belong to the split.
+
+  Sentence boundaries are found over the raw bytes of the memory-mapped
+  treebank file, so sentences that do not belong to the split are skipped
+  without being decoded.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    split: treebank split (could be 'train', 'test', 'dev').
+
+  Yields:
+    Annotations of the sentences of the treebank file which belong to the
+    split.
+  """
+  from turkish_treebanks import mapped
+  buffer = _mapped(path)
+  if buffer is None:
+    return
+
+  with buffer:
+    for index, (start, end) in enumerate(mapped.sentence_ranges(buffer)):
+      if _sentence_is_in_split(index, split):
+        yield _decoded_annotation(buffer[start:end])
+
+
+def _count_bytes_read(path: str) -> None:
+  """Counts the size of the treebank file as read, if profiling is enabled."""
+  from turkish_treebanks import profiling
+  if profiling.enabled():
+    profiling.count("bytes_read", os.path.getsize(path))
+
+
+def _sentences_in_split(path: str,
+                        split: Optional[str]) -> Generator[str, None, None]:
+  """Reads and filters sentences of a treebank file by split."""
+  from turkish_treebanks import profiling
+  from turkish_treebanks import sources as sources_lib
+  _count_bytes_read(path)
+  if not split:
+    yield from profiling.timed("read", _read_sentences_from(path))
+  elif sources_lib.is_compressed(path):
+    # Compressed treebank files can not be memory-mapped, so sentences that do
+    # not belong to the split are decoded and skipped.
+    yield from profiling.timed(
+        "read", (s for i, s in enumerate(_read_sentences_from(path))
+                 if _sentence_is_in_split(i, split)))
   else:
-    paths = _PATHS_BY_SECTION.values()
+    yield from profiling.timed("read", _scan_sentences_in_split(path, split))
 
-  def _filtered_sentences() -> Generator[str, None, None]:
-    for path in sorted(paths):
-      for index, sentence in enumerate(_read_sentences_from(path)):
-        if _sentence_is_in_split(index, split):
-          _validate_sentence(sentence)
-          yield sentence
 
-  return _reconstruct_conll_from(_filtered_sentences())
+def _collected(
+    path: str, split: Optional[str],
+    check: Callable[[str, List[Tuple[int, str]]], _T],
+    errors: List[StructuralError]) -> Generator[_T, None, None]:
+  """Checks sentences of a treebank file, collecting their structural errors.
 
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    split: optional, treebank split (could be 'train', 'test', 'dev') by which
+        sentences are filtered.
+    check: function that validates a sentence annotation, collecting its
+        structural errors into the given list as line index and error message
+        pairs, and returns what is yielded for it.
+    errors: list into which structural errors of the treebank file are
+        collected with their positions.
 
-def sentences(section: Optional[str] = None,
-              split: Optional[str] = None) -> Generator[_Sentence, None, None]:
-  """Reads and yields sentences of Turkish Web Treebank as sentence protobufs.
+  Yields:
+    Results of checking the sentence annotations that do not have structural
+    errors, in the order they appear in the treebank file.
+  """
+  from turkish_treebanks import profiling
+  _count_bytes_read(path)
+  numbered_sentences = profiling.timed("read",
+                                       _read_numbered_sentences_from(path))
+  for index, (line_number, sentence) in enumerate(numbered_sentences):
+    if not _sentence_is_in_split(index, split):
+      continue
+    sentence_errors = []
+    checked = check(sentence, sentence_errors)
+    if sentence_errors:
+      errors.extend(
+          StructuralError(path, line_number + i, message)
+          for i, message in sentence_errors)
+    else:
+      yield checked
+
+
+def _marking_validated(
+    path: str,
+    split: Optional[str],
+    use_cache: bool,
+    checked: Iterable[_T],
+    errors: Optional[List[StructuralError]] = None
+) -> Generator[_T, None, None]:
+  """Yields checked sentences, recording the file as validated once all are.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    split: optional, treebank split by which sentences are filtered. The file
+        is only recorded as validated if all of its sentences are checked.
+    use_cache: if False the file is not recorded as validated on disk.
+    checked: sentences of the treebank file, which are validated as they are
+        iterated.
+    errors: optional, list into which structural errors are collected. The
+        file is not recorded as validated if any are collected for it.
+
+  Yields:
+    Checked sentences.
+  """
+  if split:
+    yield from checked
+    return
+
+  stat = os.stat(path)
+  error_count = len(errors) if errors else 0
+  yield from checked
+  if errors and len(errors) != error_count:
+    return
+
+  # The file is hashed once all of its sentences are checked, so that the
+  # first sentence is not delayed by it, and it is not recorded as validated
+  # if it changed while its sentences were checked.
+  fingerprint = _fingerprint_of(path)
+  if (fingerprint.size, fingerprint.mtime_ns) == (stat.st_size,
+                                                  stat.st_mtime_ns):
+    _mark_validated(path, fingerprint, use_cache)
+
+
+def _checked_annotation(sentence: str,
+                        errors: List[Tuple[int, str]]) -> str:
+  """Validates the sentence annotation, collecting its structural errors."""
+  _validate_sentence(sentence, errors)
+  return sentence
+
+
+def _read_ahead(readings: Iterable[Iterable[_T]],
+                readers: Optional[int]) -> Generator[_T, None, None]:
+  """Reads treebank files, optionally several of them concurrently.
+
+  Args:
+    readings: lazy iterables, such as generators, that each read a treebank
+        file as they are iterated.
+    readers: number of treebank files that are read concurrently in threads,
+        or None to read them one after the other as they are iterated. Each
+        treebank file that is read concurrently is read as a whole before
+        what is read from it is yielded.
+
+  Raises:
+    Exception: any exception that reading one of the treebank files raises,
+        once what is read from the treebank files before it is yielded.
+
+  Yields:
+    What is read from each treebank file, in the order of the readings.
+  """
+  if readers is None or readers == 1:
+    for reading in readings:
+      yield from reading
+    return
+
+  from concurrent import futures
+  executor = futures.ThreadPoolExecutor(max_workers=readers)
+  pending = collections.deque()
+  try:
+    for reading in readings:
+      pending.append(executor.submit(list, reading))
+      if len(pending) >= readers:
+        yield from pending.popleft().result()
+    while pending:
+      yield from pending.popleft().result()
+  finally:
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _check_readers(readers: Optional[int]) -> None:
+  """Checks if the number of concurrently read treebank files is valid.
+
+  Args:
+    readers: number of concurrently read treebank files, or None.
+
+  Raises:
+    ValueError: number of concurrently read treebank files is not positive.
+  """
+  if readers is not None and readers < 1:
+    raise ValueError(f"Invalid number of readers {readers}."
+                     f" It should be a positive integer.")
+
+
+def _filtered_sentences_of(
+    path: str, split: Optional[str], validate: str, use_cache: bool,
+    errors: List[StructuralError]) -> Generator[str, None, None]:
+  """Reads, filters by split and validates sentences of a treebank file.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    split: optional, treebank split (could be 'train', 'test', 'dev').
+    validate: validation mode (see sentences).
+    use_cache: if False the file is not recorded as validated on disk.
+    errors: list into which structural errors are collected in 'collect'
+        validation mode.
+
+  Raises:
+    ValueError: one of the sentence annotations is not valid with respect to
+        the CoNLL-U format, in 'strict' validation mode.
+
+  Yields:
+    Annotations of the sentences of the treebank file which belong to the
+    split, except the ones with collected structural errors.
+  """
+  from turkish_treebanks import profiling
+  if validate == "off" or _is_validated(path, use_cache):
+    yield from _sentences_in_split(path, split)
+  elif validate == "collect":
+    yield from profiling.timed(
+        "validate",
+        _marking_validated(
+            path, split, use_cache,
+            _collected(path, split, _checked_annotation, errors), errors))
+  else:
+    yield from profiling.timed(
+        "validate",
+        _marking_validated(path, split, use_cache,
+                           (_checked_annotation(s, None)
+                            for s in _sentences_in_split(path, split))))
+
+
+def _filtered_sentences(
+    paths: Sequence[str],
+    split: Optional[str],
+    validate: str,
+    readers: Optional[int] = None) -> Generator[str, None, None]:
+  """Reads, filters by split and validates sentences of treebank files.
+
+  Args:
+    paths: paths to CoNLL-U format treebank files.
+    split: optional, treebank split (could be 'train', 'test', 'dev').
+    validate: validation mode (see sentences).
+    readers: optional, number of treebank files that are read concurrently.
+
+  Raises:
+    ValueError: one of the sentence annotations is not valid with respect to
+        the CoNLL-U format.
+    ValidationError: sentence annotations have structural errors, which are
+        collected.
+
+  Yields:
+    Annotations of the sentences of the treebank files which belong to the
+    split, except the ones with collected structural errors.
+  """
+  use_cache = _caching_enabled(use_cache=True)
+  errors_by_path = [[] for _ in paths]
+  yield from _read_ahead(
+      (_filtered_sentences_of(path, split, validate, use_cache, errors)
+       for path, errors in zip(paths, errors_by_path)), readers)
+
+  errors = list(itertools.chain.from_iterable(errors_by_path))
+  if errors:
+    raise ValidationError(errors)
+
+
+def _parse_serialized(sentences: List[str], validate: bool) -> List[bytes]:
+  """Validates and parses sentence annotations into serialized protobufs."""
+  return [
+      _parse_sentence(s, validate=validate).SerializeToString()
+      for s in sentences
+  ]
+
+
+def _chunked(values: Iterable[_T],
+             size: int) -> Generator[List[_T], None, None]:
+  """Groups values, such as sentence annotations, into chunks of given size."""
+  chunk = []
+  for value in values:
+    chunk.append(value)
+    if len(chunk) == size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+
+def _map_in_parallel(function: Callable[[List[_T]], _U],
+                     chunks: Iterable[List[_T]],
+                     workers: int) -> Generator[_U, None, None]:
+  """Applies the function to chunks across a process pool.
+
+  At most two chunks per worker are in flight at a time, and results are
+  yielded in the order of the chunks.
+
+  Args:
+    function: picklable function that is applied to each chunk.
+    chunks: chunks of picklable values.
+    workers: number of worker processes.
+
+  Raises:
+    Exception: any exception that the function raises for one of the chunks.
+
+  Yields:
+    Result of the function for each chunk.
+  """
+  from concurrent import futures
+  executor = futures.ProcessPoolExecutor(max_workers=workers)
+  pending = collections.deque()
+  try:
+    for chunk in chunks:
+      pending.append(executor.submit(function, chunk))
+      if len(pending) >= 2 * workers:
+        yield pending.popleft().result()
+    while pending:
+      yield pending.popleft().result()
+  finally:
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _parse_in_parallel(sentences: Iterable[str], workers: int,
+                       validate: bool) -> Generator[_Sentence, None, None]:
+  """Validates and parses sentence annotations across a process pool.
+
+  Sentence annotations are sent to worker processes in chunks, and parsed
+  sentences are sent back serialized, which is cheaper to pickle than
+  protobufs. At most two chunks per worker are in flight at a time, and
+  parsed sentences are yielded in the order of their annotations.
+
+  Args:
+    sentences: CoNLL-U format sentence annotations.
+    workers: number of worker processes.
+    validate: if False sentence annotations are not checked.
+
+  Raises:
+    ValueError: one of the sentence annotations is not valid with respect to
+        the CoNLL-U format.
+
+  Yields:
+    Sentence protobufs parsed from the sentence annotations.
+  """
+  chunks = _chunked(sentences, _PARALLEL_CHUNK_SIZE)
+  parse = functools.partial(_parse_serialized, validate=validate)
+  for chunk in _map_in_parallel(parse, chunks, workers):
+    for serialized in chunk:
+      yield twt_pb2.Sentence.FromString(serialized)
+
+
+def _check_workers(workers: Optional[int]) -> None:
+  """Checks if the number of worker processes is valid.
+
+  Args:
+    workers: number of worker processes, or None.
+
+  Raises:
+    ValueError: number of worker processes is not positive.
+  """
+  if workers is not None and workers < 1:
+    raise ValueError(f"Invalid number of workers {workers}."
+                     f" It should be a positive integer.")
+
+
+def _parsed_sentences(
+    sentences: Iterable[str],
+    workers: Optional[int],
+    interner: Optional[compact.Interner] = None,
+    validate: bool = True
+) -> Generator[Union[_Sentence, compact.Sentence], None, None]:
+  """Validates and parses sentence annotations, optionally in parallel.
+
+  Args:
+    sentences: CoNLL-U format sentence annotations.
+    workers: number of worker processes across which sentence annotations are
+        parsed, or None to parse them in the calling process.
+    interner: optional, interner of the annotations of compact sentences. If
+        unspecified sentences are parsed into sentence protobufs.
+    validate: optional, if False sentence annotations are trusted to be
+        wellformed and are not checked.
+
+  Raises:
+    ValueError: one of the sentence annotations is not valid with respect to
+        the CoNLL-U format.
+
+  Yields:
+    Sentence protobufs, or compact sentences if an interner is given, in the
+    order of their annotations.
+  """
+  if workers is not None and workers > 1:
+    for sentence in _parse_in_parallel(sentences, workers, validate):
+      yield _in_representation(sentence, interner)
+    return
+
+  for sentence in sentences:
+    yield _parse_sentence(sentence, interner, validate)
+
+
+def _in_representation(
+    sentence: _Sentence, interner: Optional[compact.Interner]
+) -> Union[_Sentence, compact.Sentence]:
+  """Converts sentence protobuf into a compact sentence if interner is given."""
+  if interner is None:
+    return sentence
+
+  from turkish_treebanks import compact
+  return compact.from_proto(sentence, interner)
+
+
+def _check_validate(validate: str) -> None:
+  """Checks if the validation mode is valid.
+
+  Args:
+    validate: validation mode.
+
+  Raises:
+    ValueError: invalid validation mode.
+  """
+  if validate not in _VALID_VALIDATION_MODES:
+    raise ValueError(f"Invalid validation mode '{validate}'."
+                     f" It can only be one of: 'strict', 'collect', 'off'.")
+
+
+def iter_conllu(section: Optional[str] = None,
+                split: Optional[str] = None,
+                validate: str = "strict",
+                sources: Optional[sources_lib.Sources] = None,
+                readers: Optional[int] = None) -> Iterator[str]:
+  """Reads and yields sentence annotations of Turkish Web Treebank one by one.
+
+  Unlike as_conllu, treebank files are read incrementally and each sentence
+  annotation is yielded as soon as it is read and validated, so memory usage
+  stays flat regardless of the size of the treebank files.
 
   Args:
     section: optional, section of Turkish Web Treebank whose sentence
         annotations will be read (could be either 'web' or 'wiki'). If
-        unspecified sentence annotations from both web and Wikipedia sections
-        will be read.
+        unspecified sentence annotations from web and Wikipedia sections will
+        be read.
     split: optional, treebank split whose sentence annotations will be read
         (could be 'train', 'test', 'dev'). If unspecified sentence annotations
         from all three splits will be read.
+    validate: optional, validation mode of the sentence annotations (see
+        sentences).
+    sources: optional, sources of treebank files to read in place of the
+        sections (see sentences).
+    readers: optional, number of treebank files that are read concurrently
+        (see sentences).
 
   Raises:
-    ValueError: invalid section name or split specifier, or source treebank
-        files from which the sentence annotations are read is not valid with
-        respect to the CoNLL-U format.
+    ValueError: invalid section name, split specifier, validation mode,
+        sources or number of readers, or source treebank files from which the
+        sentence annotations are read is not valid with respect to the
+        CoNLL-U format.
+    ValidationError: sentence annotations have structural errors, which are
+        collected in 'collect' validation mode.
 
-  Yields:
-    Sentence protobufs which contain annotations for the specified treebank
-    section and split.
+  Returns:
+    Iterator over CoNLL-U format annotations of individual sentences for the
+    specified treebank section and split.
+  """
+  from turkish_treebanks import profiling
+  _check_validate(validate)
+  _check_readers(readers)
+  return profiling.counted(
+      _filtered_sentences(
+          _paths_for(section, split, sources), split, validate, readers))
+
+
+def _cache_dir() -> str:
+  """Returns the directory in which parsed treebank files are cached."""
+  if os.environ.get(_CACHE_DIR_ENV_VAR):
+    return os.environ[_CACHE_DIR_ENV_VAR]
+
+  cache_home = os.environ.get("XDG_CACHE_HOME",
+                              os.path.join(os.path.expanduser("~"), ".cache"))
+  return os.path.join(cache_home, "turkish_treebanks")
+
+
+def _cache_path_for(path: str, kind: str) -> str:
+  """Returns the path of the cache file for the treebank file at the path."""
+  import hashlib
+  digest = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()
+  file_name = f"{os.path.basename(path)}.{digest[:16]}.{kind}.pb"
+  return os.path.join(_cache_dir(), file_name)
+
+
+def _sha256_of(path: str) -> str:
+  """Returns the hex encoded SHA-256 digest of the contents of the file."""
+  import hashlib
+  from turkish_treebanks import profiling
+  digest = hashlib.sha256()
+  with profiling.timer("fingerprint"), open(path, "rb") as reader:
+    for chunk in iter(lambda: reader.read(_HASH_CHUNK_SIZE), b""):
+      digest.update(chunk)
+  return digest.hexdigest()
+
+
+def _fingerprint_of(path: str) -> _Fingerprint:
+  """Computes the fingerprint of the treebank file at the path."""
+  stat = os.stat(path)
+  return _Fingerprint(stat.st_size, stat.st_mtime_ns, _sha256_of(path))
+
+
+def _stamp(cached: _CachedMessage, fingerprint: _Fingerprint) -> None:
+  """Records the fingerprint of the source treebank file on cached message."""
+  cached.source_size = fingerprint.size
+  cached.source_mtime_ns = fingerprint.mtime_ns
+  cached.source_sha256 = fingerprint.sha256
+
+
+def _refreshed(fingerprint: Optional[_Fingerprint],
+               path: str) -> Optional[_Fingerprint]:
+  """Checks if the fingerprint is of the current contents of the file.
+
+  Content hash of the treebank file is only computed if its size matches the
+  fingerprint but its modification time does not, so that touching the file
+  does not invalidate the fingerprint. In that case, the fingerprint is
+  refreshed with the current modification time so that the content hash is not
+  computed again.
+
+  Args:
+    fingerprint: fingerprint of the treebank file, or None if there is none.
+    path: path to the source CoNLL-U format treebank file.
+
+  Returns:
+    Fingerprint with the current modification time of the treebank file if it
+    is unchanged since the fingerprint. Otherwise, returns None.
+  """
+  if fingerprint is None:
+    return None
+
+  stat = os.stat(path)
+  if fingerprint.size != stat.st_size:
+    return None
+
+  if fingerprint.mtime_ns == stat.st_mtime_ns:
+    return fingerprint
+
+  if fingerprint.sha256 != _sha256_of(path):
+    return None
+
+  return fingerprint._replace(mtime_ns=stat.st_mtime_ns)
+
+
+def _is_fresh(cached: _CachedMessage, path: str) -> bool:
+  """Checks if cached message is built from current contents of the file.
+
+  The recorded modification time is updated if the file is touched since the
+  message is cached, see _refreshed.
+
+  Args:
+    cached: cached message which is built from the treebank file.
+    path: path to the source CoNLL-U format treebank file.
+
+  Returns:
+    True if the treebank file is unchanged since the message is cached.
+    Otherwise, returns False.
+  """
+  fingerprint = _refreshed(
+      _Fingerprint(cached.source_size, cached.source_mtime_ns,
+                   cached.source_sha256), path)
+  if fingerprint is None:
+    return False
+
+  cached.source_mtime_ns = fingerprint.mtime_ns
+  return True
+
+
+def _decode_error() -> type:
+  """Returns the exception that is raised for malformed protobufs.
+
+  The protobuf runtime is only imported when the exception is caught.
+  """
+  from google.protobuf import message
+  return message.DecodeError
+
+
+def _read_cache(path: str, kind: str,
+                message_type: type) -> Optional[_CachedMessage]:
+  """Reads the cached message of the treebank file, even if it is stale."""
+  try:
+    with open(_cache_path_for(path, kind), "rb") as reader:
+      return message_type.FromString(reader.read())
+  except OSError:
+    return None
+  except _decode_error():
+    return None  # Cache file is corrupt, and it is rebuilt.
+
+
+def _load_cache(path: str, kind: str,
+                message_type: type) -> Optional[_CachedMessage]:
+  """Loads the cached message of the treebank file if it is fresh."""
+  cached = _read_cache(path, kind, message_type)
+  return cached if cached is not None and _is_fresh(cached, path) else None
+
+
+def _write_cache(path: str, kind: str, cached: _CachedMessage) -> None:
+  """Atomically writes the message to the cache file of the treebank file."""
+  _write_cache_file(path, kind, cached.SerializeToString())
+
+
+def _write_cache_file(path: str, kind: str, contents: bytes) -> None:
+  """Atomically writes the contents to the cache file of the treebank file."""
+  cache_path = _cache_path_for(path, kind)
+  os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+  import tempfile
+  descriptor, temporary_path = tempfile.mkstemp(
+      dir=os.path.dirname(cache_path), suffix=".tmp")
+  try:
+    with os.fdopen(descriptor, "wb") as writer:
+      writer.write(contents)
+    os.replace(temporary_path, cache_path)
+  except BaseException:
+    os.remove(temporary_path)
+    raise
+
+
+def _reusable_sentences(previous: Optional[_Corpus]) -> Dict[bytes, _Sentence]:
+  """Maps digests of the sentence annotations of a corpus to their sentences."""
+  if previous is None or len(previous.block_sha256) != len(previous.sentence):
+    return {}  # Corpus is cached before digests are recorded.
+
+  return dict(zip(previous.block_sha256, previous.sentence))
+
+
+def _parsed_into(corpus: _Corpus, path: str, workers: Optional[int],
+                 previous: Optional[_Corpus],
+                 validate: bool) -> Generator[_Sentence, None, None]:
+  """Parses all sentences of the treebank file into the corpus.
+
+  Sentence annotations are addressed by their content, so that the sentences
+  of a previous corpus of the treebank file whose annotations are unchanged
+  are reused, and only new or modified sentence annotations are validated and
+  parsed. Sentences are added to the corpus as their annotations are read.
+
+  Args:
+    corpus: corpus into which sentences and digests of their annotations are
+        added.
+    path: path to a CoNLL-U format treebank file.
+    workers: number of worker processes across which sentences are parsed, or
+        None to parse them in the calling process.
+    previous: corpus that is built from an earlier version of the treebank
+        file, or None.
+    validate: if False sentence annotations are not checked.
+
+  Raises:
+    ValueError: treebank file is not valid with respect to the CoNLL-U format.
+
+  Yields:
+    Sentences of the treebank file, once each is added to the corpus.
+  """
+  import hashlib
+  from turkish_treebanks import profiling
+  reusable = _reusable_sentences(previous)
+  digests = collections.deque()
+
+  def _unparsed(annotations: Iterable[str]) -> Generator[str, None, None]:
+    for annotation in annotations:
+      digest = hashlib.sha256(annotation.encode("utf-8")).digest()
+      digests.append(digest)
+      if digest not in reusable:
+        yield annotation
+
+  parsed = profiling.timed(
+      "parse",
+      _parsed_sentences(
+          _unparsed(_sentences_in_split(path, split=None)),
+          workers,
+          validate=validate))
+  # Annotations are digested before they are parsed, so the digests that
+  # precede the digest of each parsed sentence are of reused sentences.
+  for sentence in itertools.chain(parsed, [None]):
+    while digests:
+      digest = digests.popleft()
+      reused = reusable.get(digest)
+      if reused is None:
+        break
+      profiling.count("reused_sentences")
+      corpus.block_sha256.append(digest)
+      corpus.sentence.append(reused)
+      yield reused
+    if sentence is not None:
+      corpus.block_sha256.append(digest)
+      corpus.sentence.append(sentence)
+      yield sentence
+
+
+def _parse_corpus(path: str,
+                  workers: Optional[int] = None,
+                  previous: Optional[_Corpus] = None) -> _Corpus:
+  """Parses and validates all sentences of the treebank file into a corpus.
+
+  See _parsed_into.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    workers: optional, number of worker processes across which sentences are
+        parsed. If unspecified sentences are parsed in the calling process.
+    previous: optional, corpus that is built from an earlier version of the
+        treebank file.
+
+  Raises:
+    ValueError: treebank file is not valid with respect to the CoNLL-U format.
+
+  Returns:
+    Corpus that contains all sentences of the treebank file together with the
+    fingerprint of the file.
+  """
+  fingerprint = _fingerprint_of(path)
+  validate = not _is_validated(path, use_cache=True)
+  corpus = twt_pb2.Corpus()
+  _stamp(corpus, fingerprint)
+  for _ in _parsed_into(corpus, path, workers, previous, validate):
+    pass
+  if validate:
+    _mark_validated(path, fingerprint, use_cache=True)
+  return corpus
+
+
+def _keep_corpus(path: str, corpus: _Corpus, use_cache: bool) -> None:
+  """Keeps the corpus of the treebank file in memory, and caches it on disk.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    corpus: corpus that contains all sentences of the treebank file.
+    use_cache: if False the corpus is not cached on disk.
+  """
+  from turkish_treebanks import profiling
+  cached = False
+  if _caching_enabled(use_cache):
+    try:
+      with profiling.timer("cache_write"):
+        _write_cache(path, _CORPUS_CACHE, corpus)
+      cached = True
+    except OSError:
+      pass  # Caching is best effort, parsed corpus is still usable.
+  _memory_cache().put(path, _KeptCorpus(corpus, cached), corpus.ByteSize())
+
+
+def _kept_corpus(
+    path: str,
+    use_cache: bool) -> Tuple[Optional[_Corpus], Optional[_Corpus]]:
+  """Gets the corpus of the treebank file from memory or loads it from disk.
+
+  Corpora are kept in memory once loaded or built (see set_memory_cache_limits)
+  until they are evicted or the treebank file changes, even if caching on disk
+  is disabled, so that reading a treebank file again, such as another split of
+  it, neither loads nor parses it again. Corpora that are kept in memory are
+  shared by the reads of their sentences, which must not modify them.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    use_cache: if False the corpus is neither read from nor written to the on
+        disk cache.
+
+  Returns:
+    Corpus that contains all sentences of the treebank file, which is shared
+    and must not be modified, or None if it is neither kept in memory nor
+    freshly cached on disk. In that case, the stale corpus that is cached on
+    disk is also returned, or None if there is none.
+  """
+  from turkish_treebanks import profiling
+  kept = _memory_cache().get(path)
+  if kept is not None and _is_fresh(kept.corpus, path):
+    profiling.count("cache_hits")
+    profiling.count("memory_hits")
+    if not kept.cached and _caching_enabled(use_cache):
+      # Corpus is built while caching on disk was disabled.
+      _keep_corpus(path, kept.corpus, use_cache)
+    return kept.corpus, None
+
+  if not _caching_enabled(use_cache):
+    return None, None
+
+  with profiling.timer("cache_load"):
+    cached = _read_cache(path, _CORPUS_CACHE, twt_pb2.Corpus)
+  if cached is None or not _is_fresh(cached, path):
+    profiling.count("cache_misses")
+    return None, cached
+
+  profiling.count("cache_hits")
+  _memory_cache().put(path, _KeptCorpus(cached, True), cached.ByteSize())
+  return cached, None
+
+
+def _building_corpus(
+    path: str, split: Optional[str], use_cache: bool, workers: Optional[int],
+    interner: Optional[compact.Interner], previous: Optional[_Corpus]
+) -> Generator[Union[_Sentence, compact.Sentence], None, None]:
+  """Parses and yields sentences of a treebank file, building its corpus.
+
+  Sentences are yielded as they are parsed, and the corpus of the treebank
+  file is only kept in memory, and cached on disk unless caching is disabled,
+  once all of its sentences are parsed, so that the first sentence is not
+  delayed by building it.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    split: optional, treebank split (could be 'train', 'test', 'dev').
+    use_cache: if False the corpus is not cached on disk.
+    workers: number of worker processes across which sentence annotations are
+        parsed, or None to parse them in the calling process.
+    interner: optional, interner of the annotations of compact sentences. If
+        unspecified sentences are parsed into sentence protobufs.
+    previous: corpus that is built from an earlier version of the treebank
+        file, whose unchanged sentences are reused, or None.
+
+  Raises:
+    ValueError: treebank file is not valid with respect to the CoNLL-U format.
+
+  Yields:
+    Sentence protobufs, or compact sentences if an interner is given, which
+    belong to the split.
+  """
+  stat = os.stat(path)
+  validate = not _is_validated(path, use_cache)
+  corpus = twt_pb2.Corpus()
+  sentences = _parsed_into(corpus, path, workers, previous, validate)
+  for index, sentence in enumerate(sentences):
+    if not split or _sentence_is_in_split(index, split):
+      yield _in_representation(sentence, interner)
+
+  # The file is fingerprinted once all of its sentences are parsed, and its
+  # corpus is not kept if it changed while its sentences were parsed.
+  fingerprint = _fingerprint_of(path)
+  if (fingerprint.size, fingerprint.mtime_ns) != (stat.st_size,
+                                                  stat.st_mtime_ns):
+    return
+
+  _stamp(corpus, fingerprint)
+  if validate:
+    _mark_validated(path, fingerprint, use_cache)
+  _keep_corpus(path, corpus, use_cache)
+
+
+def _caching_enabled(use_cache: bool) -> bool:
+  """Checks if parsed treebank files should be cached on disk."""
+  return use_cache and not os.environ.get(_NO_CACHE_ENV_VAR)
+
+
+def _read_validated(path: str) -> Optional[_Fingerprint]:
+  """Reads the fingerprint of the validated treebank file from its cache file.
+
+  Validated files are cached as plain text records of their fingerprint
+  instead of protobufs, so that reading sentence annotations in CoNLL-U format
+  does not import the protobuf runtime.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+
+  Returns:
+    Fingerprint of the treebank file when it was last validated, even if it is
+    stale, or None if it is not recorded.
+  """
+  try:
+    with open(_cache_path_for(path, _VALIDATED_CACHE), "rb") as reader:
+      size, mtime_ns, sha256 = reader.read().decode("ascii").split(" ")
+    return _Fingerprint(int(size), int(mtime_ns), sha256)
+  except OSError:
+    return None
+  except ValueError:  # UnicodeDecodeError is also a ValueError.
+    return None  # Cache file is corrupt, and it is rewritten.
+
+
+def _is_validated(path: str, use_cache: bool) -> bool:
+  """Checks if the treebank file is validated since it last changed.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    use_cache: if False validated files are not looked up on disk.
+
+  Returns:
+    True if all sentence annotations of the current contents of the treebank
+    file are validated. Otherwise, returns False.
+  """
+  validated = _refreshed(_validated_files.get(path), path)
+  if validated is None and _caching_enabled(use_cache):
+    validated = _refreshed(_read_validated(path), path)
+  if validated is None:
+    return False
+
+  _validated_files[path] = validated
+  return True
+
+
+def _mark_validated(path: str, fingerprint: _Fingerprint,
+                    use_cache: bool) -> None:
+  """Records that the treebank file with the fingerprint is validated.
+
+  Validated files are kept in memory, and also recorded on disk unless
+  caching is disabled, so that their sentence annotations are not validated
+  again until they change.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    fingerprint: fingerprint of the treebank file before it is validated.
+    use_cache: if False the validated file is not recorded on disk.
+  """
+  _validated_files[path] = fingerprint
+  if _caching_enabled(use_cache):
+    try:
+      _write_cache_file(
+          path, _VALIDATED_CACHE,
+          f"{fingerprint.size} {fingerprint.mtime_ns} {fingerprint.sha256}"
+          .encode("ascii"))
+    except OSError:
+      pass  # Caching is best effort, file is still recorded in memory.
+
+
+def _scan_sentence_blocks(
+    buffer: mapped.Buffer) -> Generator[Tuple[int, int, bytes], None, None]:
+  """Finds sentence annotations in a CoNLL-U format treebank file.
+
+  Sentence boundaries are the same as those of split reads, see
+  turkish_treebanks.mapped.sentence_ranges.
+
+  Args:
+    buffer: contents of a CoNLL-U format treebank file.
+
+  Yields:
+    Byte offset and byte length of each whitespace trimmed sentence annotation
+    in the file, together with the first line of the annotation.
+  """
+  from turkish_treebanks import mapped
+  for start, end in mapped.sentence_ranges(buffer):
+    line_ends = [
+        i for i in (buffer.find(b"\n", start, end),
+                    buffer.find(b"\r", start, end)) if i != -1
+    ]
+    yield start, end - start, buffer[start:min(line_ends, default=end)]
+
+
+def _build_sentence_offsets(path: str) -> _SentenceOffsets:
+  """Builds the byte offset index of sentences of the treebank file.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+
+  Raises:
+    ValueError: one of the sentence annotations of the treebank file does not
+        start with a sentence id annotation.
+
+  Returns:
+    Identifiers, byte offsets and byte lengths of the sentence annotations of
+    the treebank file, together with the fingerprint of the file.
+  """
+  offsets = twt_pb2.SentenceOffsets()
+  _stamp(offsets, _fingerprint_of(path))
+  buffer = _mapped(path)
+  if buffer is None:
+    return offsets
+
+  with buffer:
+    for offset, length, first_line in _scan_sentence_blocks(buffer):
+      if not first_line.startswith(_SENTENCE_ID_PREFIX):
+        raise ValueError(
+            f"First line of the CoNNL-U format sentence annotation at byte"
+            f" offset {offset} of '{path}' does not have a valid sentence id"
+            f" annotation:\n{first_line.decode('utf-8')}")
+      sentence_id = first_line[len(_SENTENCE_ID_PREFIX):].strip()
+      offsets.sentence_id.append(sentence_id.decode("utf-8"))
+      offsets.offset.append(offset)
+      offsets.length.append(length)
+  return offsets
+
+
+def _offset_index_for(path: str) -> _OffsetIndex:
+  """Loads the offset index of the treebank file, building it if needed.
+
+  Offset indices are kept in memory once loaded, and also cached on disk
+  unless caching is disabled. They are rebuilt when the treebank file changes.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+
+  Raises:
+    ValueError: one of the sentence annotations of the treebank file does not
+        start with a sentence id annotation.
+
+  Returns:
+    Offset index of the sentences of the treebank file.
+  """
+  index = _offset_indices.get(path)
+  if index is not None and _is_fresh(index.offsets, path):
+    return index
+
+  offsets = None
+  if _caching_enabled(use_cache=True):
+    offsets = _load_cache(path, _OFFSETS_CACHE, twt_pb2.SentenceOffsets)
+
+  if offsets is None:
+    offsets = _build_sentence_offsets(path)
+    if _caching_enabled(use_cache=True):
+      try:
+        _write_cache(path, _OFFSETS_CACHE, offsets)
+      except OSError:
+        pass  # Caching is best effort, offset index is still usable.
+
+  index = _OffsetIndex(
+      offsets=offsets,
+      ordinal_by_sentence_id={
+          sentence_id: ordinal
+          for ordinal, sentence_id in enumerate(offsets.sentence_id)
+      },
+  )
+  _offset_indices[path] = index
+  return index
+
+
+def _read_sentences_at(
+    path: str, offsets: _SentenceOffsets,
+    ordinals: Iterable[int]) -> Generator[Tuple[int, _Sentence], None, None]:
+  """Reads and parses sentences at given ordinal positions of the file.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    offsets: byte offset index of the sentences of the treebank file.
+    ordinals: ordinal positions of the sentences that will be read.
+
+  Raises:
+    ValueError: one of the sentence annotations is not valid with respect to
+        the CoNLL-U format.
+
+  Yields:
+    Ordinal position of each sentence together with the parsed sentence, in
+    the order the sentences appear in the file.
+  """
+  validate = not _is_validated(path, use_cache=True)
+  with open(path, "rb") as reader:
+    for ordinal in sorted(set(ordinals)):
+      reader.seek(offsets.offset[ordinal])
+      sentence = _decoded_annotation(reader.read(offsets.length[ordinal]))
+      yield ordinal, _parse_sentence(sentence, validate=validate)
+
+
+def get_sentences(sentence_ids: Iterable[str]) -> List[_Sentence]:
+  """Reads sentences of Turkish Web Treebank with the given sentence ids.
+
+  Only the annotations of the requested sentences are read and parsed, using
+  a byte offset index of the treebank files which is built on first use and
+  cached on disk together with the parsed sentences (see build_cache).
+
+  Args:
+    sentence_ids: identifiers of the sentences that will be read.
+
+  Raises:
+    KeyError: there is no sentence with one of the given sentence ids.
+    ValueError: source treebank files from which the sentence annotations are
+        read is not valid with respect to the CoNLL-U format.
+
+  Returns:
+    Sentence protobufs for each of the sentence ids, in the given order.
+  """
+  sentence_ids = list(sentence_ids)
+  paths = _paths_for(section=None, split=None)
+  indices = {}
+  ordinals_by_path = {}
+  for sentence_id in sentence_ids:
+    for path in paths:
+      # Treebank files are only indexed if the sentence is not found in the
+      # ones before them.
+      if path not in indices:
+        indices[path] = _offset_index_for(path)
+      ordinal = indices[path].ordinal_by_sentence_id.get(sentence_id)
+      if ordinal is not None:
+        ordinals_by_path.setdefault(path, []).append(ordinal)
+        break
+    else:
+      raise KeyError(f"Unknown sentence id '{sentence_id}'.")
+
+  sentences_by_id = {}
+  for path, ordinals in ordinals_by_path.items():
+    offsets = indices[path].offsets
+    for ordinal, sentence in _read_sentences_at(path, offsets, ordinals):
+      sentences_by_id[offsets.sentence_id[ordinal]] = sentence
+
+  return [sentences_by_id[sentence_id] for sentence_id in sentence_ids]
+
+
+def get_sentence(sentence_id: str) -> _Sentence:
+  """Reads the sentence of Turkish Web Treebank with the given sentence id.
+
+  See get_sentences.
+
+  Args:
+    sentence_id: identifier of the sentence that will be read.
+
+  Raises:
+    KeyError: there is no sentence with the given sentence id.
+    ValueError: source treebank file from which the sentence annotation is
+        read is not valid with respect to the CoNLL-U format.
+
+  Returns:
+    Sentence protobuf for the sentence id.
+  """
+  return get_sentences([sentence_id])[0]
+
+
+def get_sentence_at(section: str, index: int) -> _Sentence:
+  """Reads the sentence at the given position of a Turkish Web Treebank section.
+
+  Args:
+    section: section of Turkish Web Treebank from which the sentence will be
+        read (could be either 'web' or 'wiki').
+    index: sequential index of the sentence in the source CoNLL-U format
+        treebank file of the section (assuming first sentence has index 0).
+
+  Raises:
+    ValueError: invalid section name, or source treebank file from which the
+        sentence annotation is read is not valid with respect to the CoNLL-U
+        format.
+    IndexError: there is no sentence with the given index in the section.
+
+  Returns:
+    Sentence protobuf for the sentence at the given index.
+  """
+  path = _path_for(section)
+  offsets = _offset_index_for(path).offsets
+  if not -len(offsets.offset) <= index < len(offsets.offset):
+    raise IndexError(f"Sentence index {index} is out of range for section"
+                     f" '{section}' of {len(offsets.offset)} sentences.")
+
+  ordinal = index % len(offsets.offset)
+  return next(_read_sentences_at(path, offsets, [ordinal]))[1]
+
+
+def _split_of(sentence_index: int) -> str:
+  """Returns the split of the sentence with given positional index."""
+  return next(
+      s for s in _VALID_SPLIT_NAMES if _sentence_is_in_split(sentence_index, s))
+
+
+def _split_ranges(sentence_count: int, split: str) -> List[range]:
+  """Groups indices of sentences that belong to the split into ranges.
+
+  Args:
+    sentence_count: number of sentences in a treebank file.
+    split: treebank split (could be 'train', 'test', 'dev').
+
+  Returns:
+    Ascending, non-overlapping ranges of sequential indices of the sentences
+    of the treebank file which belong to the split.
+  """
+  ranges = []
+  start = None
+  for index in range(sentence_count + 1):
+    in_split = index < sentence_count and _sentence_is_in_split(index, split)
+    if in_split and start is None:
+      start = index
+    elif not in_split and start is not None:
+      ranges.append(range(start, index))
+      start = None
+  return ranges
+
+
+def split_manifest(section: str) -> Dict[str, List[range]]:
+  """Returns the indices of the sentences of a section that are in each split.
+
+  The number of sentences in the treebank file of the section is read from its
+  byte offset index (see get_sentence_at), which is built on first use.
+
+  Args:
+    section: section of Turkish Web Treebank (could be either 'web' or
+        'wiki').
+
+  Raises:
+    ValueError: invalid section name, or source treebank file of the section is
+        not valid with respect to the CoNLL-U format.
+
+  Returns:
+    Ascending, non-overlapping ranges of sequential indices of the sentences
+    in the treebank file of the section (assuming first sentence has index 0),
+    keyed by the name of the split they belong to.
+  """
+  sentence_count = len(_offset_index_for(_path_for(section)).offsets.offset)
+  return {
+      split: _split_ranges(sentence_count, split)
+      for split in _VALID_SPLIT_NAMES
+  }
+
+
+def build_cache(section: Optional[str] = None,
+                workers: Optional[int] = None) -> None:
+  """Parses treebank files and caches parsed sentences on disk.
+
+  Byte offset indices of the sentences of treebank files are also cached.
+  Cache files are written to the directory specified by the
+  TURKISH_TREEBANKS_CACHE_DIR environment variable, which defaults to
+  'turkish_treebanks' directory under the user cache directory. Existing cache
+  files are rebuilt.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentences will be
+        cached (could be either 'web' or 'wiki'). If unspecified sentences of
+        both web and Wikipedia sections will be cached.
+    workers: optional, number of worker processes across which sentence
+        annotations are parsed. If unspecified sentence annotations are parsed
+        in the calling process.
+
+  Raises:
+    ValueError: invalid section name or number of workers, or source treebank
+        files from which the sentence annotations are read is not valid with
+        respect to the CoNLL-U format.
+    OSError: cache files could not be written.
+  """
+  _check_workers(workers)
+  for path in _paths_for(section, split=None):
+    _write_cache(path, _CORPUS_CACHE, _parse_corpus(path, workers))
+    _write_cache(path, _OFFSETS_CACHE, _build_sentence_offsets(path))
+
+
+def _corpus_changes(path: str, previous: Optional[_Corpus],
+                    corpus: _Corpus) -> CorpusChanges:
+  """Compares the sentences of a corpus to those of its previous version."""
+  previous_by_id = {}
+  if previous is not None:
+    previous_by_id = {
+        s.sentence_id: (i, s) for i, s in enumerate(previous.sentence)
+    }
+  sentence_ids = {s.sentence_id for s in corpus.sentence}
+  added, changed, resplit = [], [], []
+  for index, sentence in enumerate(corpus.sentence):
+    if sentence.sentence_id not in previous_by_id:
+      added.append(sentence.sentence_id)
+      continue
+
+    previous_index, previous_sentence = previous_by_id[sentence.sentence_id]
+    if sentence != previous_sentence:
+      changed.append(sentence.sentence_id)
+    if _split_of(index) != _split_of(previous_index):
+      resplit.append(sentence.sentence_id)
+  removed = [i for i in previous_by_id if i not in sentence_ids]
+  return CorpusChanges(path, added, removed, changed, resplit)
+
+
+def update_cache(section: Optional[str] = None,
+                 workers: Optional[int] = None) -> List[CorpusChanges]:
+  """Updates cached sentences of treebank files that changed since cached.
+
+  Unlike build_cache, only the sentence annotations that are new or modified
+  since the sentences of a treebank file are cached are validated and parsed,
+  and the cached sentences of the other sentence annotations are reused.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose cached sentences
+        will be updated (could be either 'web' or 'wiki'). If unspecified
+        cached sentences of both web and Wikipedia sections will be updated.
+    workers: optional, number of worker processes across which sentence
+        annotations are parsed. If unspecified sentence annotations are parsed
+        in the calling process.
+
+  Raises:
+    ValueError: invalid section name or number of workers, or source treebank
+        files from which the sentence annotations are read is not valid with
+        respect to the CoNLL-U format.
+    OSError: cache files could not be written.
+
+  Returns:
+    Changes to the sentences of each treebank file since they are cached, all
+    of which are added if they are not cached.
+  """
+  _check_workers(workers)
+  changes = []
+  for path in _paths_for(section, split=None):
+    previous = _read_cache(path, _CORPUS_CACHE, twt_pb2.Corpus)
+    if previous is not None and _is_fresh(previous, path):
+      changes.append(CorpusChanges(path, [], [], [], []))
+      continue
+
+    corpus = _parse_corpus(path, workers, previous)
+    _write_cache(path, _CORPUS_CACHE, corpus)
+    changes.append(_corpus_changes(path, previous, corpus))
+  return changes
+
+
+def remove_cache(section: Optional[str] = None) -> None:
+  """Removes cached sentences of treebank files from disk.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose cached sentences
+        will be removed (could be either 'web' or 'wiki'). If unspecified
+        cached sentences of both web and Wikipedia sections will be removed.
+
+  Raises:
+    ValueError: invalid section name.
+  """
+  for path in _paths_for(section, split=None):
+    _memory_cache().pop(path)
+    _offset_indices.pop(path, None)
+    _validated_files.pop(path, None)
+    kinds = [_CORPUS_CACHE, _OFFSETS_CACHE, _VALIDATED_CACHE]
+    kinds.extend(_stats_cache_kind(s) for s in [None] + _VALID_SPLIT_NAMES)
+    for kind in kinds:
+      try:
+        os.remove(_cache_path_for(path, kind))
+      except FileNotFoundError:
+        pass
+
+
+def set_memory_cache_limits(max_sections: int = _MEMORY_CACHE_MAX_ENTRIES,
+                            max_bytes: int = _MEMORY_CACHE_MAX_BYTES) -> None:
+  """Limits the parsed sentences that are kept in memory between reads.
+
+  Sentences of each treebank file that are parsed, or read from the on disk
+  cache, are kept in memory even if caching on disk is disabled, so that
+  reading the treebank file again (such as another split of it) neither
+  parses nor loads them again. Sentence protobufs that are kept in memory are
+  shared by the reads, and are not copied for each of them. Sentences of the
+  least recently read treebank files are evicted once there are more treebank
+  files, or their sentences are larger, than the limits.
+
+  Args:
+    max_sections: optional, maximum number of treebank files (such as
+        sections) whose sentences are kept in memory, or 0 to not keep
+        sentences in memory.
+    max_bytes: optional, maximum total serialized size of the sentences that
+        are kept in memory, in bytes.
+
+  Raises:
+    ValueError: invalid limits.
+  """
+  _memory_cache().resize(max_sections, max_bytes)
+
+
+def clear_cache() -> None:
+  """Clears the sentences, offset indices and validated files kept in memory.
+
+  Caches on disk are kept (see remove_cache).
+  """
+  _memory_cache().clear()
+  _offset_indices.clear()
+  _validated_files.clear()
+
+
+def from_conllu(sentence: str, validate: bool = True) -> _Sentence:
+  """Parses a CoNLL-U format sentence annotation into a sentence protobuf.
+
+  Args:
+    sentence: a CoNNL-U format sentence annotation.
+    validate: optional, if False the sentence annotation is trusted to be
+        wellformed and is not checked, such as sentence annotations that are
+        already validated by iter_conllu.
+
+  Raises:
+    ValueError: sentence annotation is not valid with respect to the CoNLL-U
+        format.
+
+  Returns:
+    Sentence protobuf which contains annotations of the sentence.
+  """
+  return _parse_sentence(_whitespace_trimmed(sentence), validate=validate)
+
+
+def _features_to_conllu(features: Iterable[_Feature]) -> str:
+  """Renders features in CoNLL-U format features annotation."""
+  return "|".join(f"{f.category}={f.value}" for f in features) or "_"
+
+
+def to_conllu(sentence: Union[_Sentence, compact.Sentence]) -> str:
+  """Renders a sentence as a CoNLL-U format sentence annotation.
+
+  This is the inverse of from_conllu. Sentence annotations of the treebank
+  are rendered byte-identically, since token ids are sequential and enhanced
+  dependencies are not annotated in the treebank.
+
+  Args:
+    sentence: sentence protobuf or compact sentence.
+
+  Returns:
+    CoNLL-U format sentence annotation of the sentence, with all ten columns
+    of each token line, and without a trailing newline.
+  """
+  lines = [f"# sent_id = {sentence.sentence_id}", f"# text = {sentence.text}"]
+  for token_id, token in enumerate(sentence.token, start=1):
+    lines.append("\t".join((
+        str(token_id),
+        token.form,
+        token.lemma,
+        token.tag.coarse,
+        token.tag.fine,
+        _features_to_conllu(token.feature),
+        str(token.head),
+        token.dependency_relation,
+        "_",
+        _features_to_conllu(token.misc_feature),
+    )))
+  return "\n".join(lines)
+
+
+def _as_proto(sentence: Union[_Sentence, compact.Sentence]) -> _Sentence:
+  """Converts compact sentences into sentence protobufs."""
+  from turkish_treebanks import compact
+  if isinstance(sentence, compact.Sentence):
+    return sentence.to_proto()
+  return sentence
+
+
+def _render_serialized(sentences: List[bytes]) -> str:
+  """Renders serialized sentence protobufs in CoNLL-U format."""
+  return _reconstruct_conll_from(
+      to_conllu(twt_pb2.Sentence.FromString(s)) for s in sentences)
+
+
+def _rendered_chunks(sentences: Iterable[Union[_Sentence, compact.Sentence]],
+                     workers: Optional[int]) -> Generator[str, None, None]:
+  """Renders chunks of sentences in CoNLL-U format, optionally in parallel.
+
+  Args:
+    sentences: sentence protobufs or compact sentences.
+    workers: number of worker processes across which sentences are rendered,
+        or None to render them in the calling process.
+
+  Yields:
+    CoNLL-U format sentence annotations of each chunk of sentences, separated
+    by blank lines, in the order of the sentences.
+  """
+  chunks = _chunked(sentences, _PARALLEL_CHUNK_SIZE)
+  if workers is None or workers == 1:
+    for chunk in chunks:
+      yield _reconstruct_conll_from(to_conllu(s) for s in chunk)
+    return
+
+  serialized_chunks = ([_as_proto(s).SerializeToString() for s in chunk]
+                       for chunk in chunks)
+  yield from _map_in_parallel(_render_serialized, serialized_chunks, workers)
+
+
+def _write_chunks(chunks: Iterable[str], writers: Sequence[TextIO]) -> None:
+  """Writes chunks of sentence annotations round robin to the writers."""
+  written = [False] * len(writers)
+  for index, chunk in enumerate(chunks):
+    shard = index % len(writers)
+    if written[shard]:
+      writers[shard].write("\n\n")
+    writers[shard].write(chunk)
+    written[shard] = True
+
+
+def _open_for_writing(path: Union[str, os.PathLike],
+                      mode: str = "w") -> TextIO:
+  """Opens the file for buffered writing of CoNLL-U format annotations."""
+  return open(path, mode, encoding="utf-8", newline="",
+              buffering=_WRITE_BUFFER_SIZE)
+
+
+def _append_serialized(path: str, chunks: List[List[bytes]],
+                       separated: bool) -> None:
+  """Renders chunks of serialized sentence protobufs and appends them to a file.
+
+  Args:
+    path: path to the treebank file.
+    chunks: chunks of serialized sentence protobufs.
+    separated: if True the file already holds sentence annotations, from which
+        the first chunk is separated by a blank line.
+  """
+  with _open_for_writing(path, "a") as writer:
+    for chunk in chunks:
+      if separated:
+        writer.write("\n\n")
+      writer.write(_render_serialized(chunk))
+      separated = True
+
+
+def _write_shards_in_parallel(
+    sentences: Iterable[Union[_Sentence, compact.Sentence]],
+    paths: Sequence[str], workers: int) -> None:
+  """Renders and writes chunks of sentences round robin across a process pool.
+
+  Each sharded treebank file is written by at most one worker process at a
+  time, so that chunks are appended to it in order. Chunks of a shard whose
+  file is being written are held back, at most two at a time, and appended
+  together once the previous write completes.
+
+  Args:
+    sentences: sentence protobufs or compact sentences.
+    paths: paths to the sharded treebank files.
+    workers: number of worker processes.
+
+  Raises:
+    OSError: treebank files could not be written.
+  """
+  from concurrent import futures
+  for path in paths:
+    _open_for_writing(path).close()
+  executor = futures.ProcessPoolExecutor(max_workers=workers)
+  writing = [futures.Future() for _ in paths]
+  for future in writing:
+    future.set_result(None)
+  held = [[] for _ in paths]
+  separated = [False] * len(paths)
+
+  def append(shard: int) -> None:
+    writing[shard].result()
+    writing[shard] = executor.submit(_append_serialized, paths[shard],
+                                     held[shard], separated[shard])
+    held[shard] = []
+    separated[shard] = True
+
+  try:
+    chunks = _chunked(sentences, _PARALLEL_CHUNK_SIZE)
+    for index, chunk in enumerate(chunks):
+      shard = index % len(paths)
+      held[shard].append([_as_proto(s).SerializeToString() for s in chunk])
+      if writing[shard].done() or len(held[shard]) >= 2:
+        append(shard)
+    for shard, remaining in enumerate(held):
+      if remaining:
+        append(shard)
+    for future in writing:
+      future.result()
+  finally:
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+def write_conllu(sentences: Iterable[Union[_Sentence, compact.Sentence]],
+                 path_or_file: Union[str, os.PathLike, TextIO],
+                 shards: Optional[int] = None,
+                 workers: Optional[int] = None) -> None:
+  """Writes sentences into CoNLL-U format treebank files.
+
+  Sentences are rendered (see to_conllu) and written in chunks through a large
+  write buffer, as they are iterated. Sentence annotations are separated by
+  blank lines, so that sentences read from a treebank file are written back
+  byte-identically.
+
+  Args:
+    sentences: sentence protobufs or compact sentences.
+    path_or_file: path to the treebank file, or a text file object, into which
+        sentences will be written. If shards are specified, it is the prefix
+        of the paths of the sharded treebank files.
+    shards: optional, number of treebank files across which sentences will be
+        written, in chunks, round robin. The i-th of n files is written to
+        '{path}-{i:05d}-of-{n:05d}'. If unspecified sentences are written to a
+        single treebank file.
+    workers: optional, number of worker processes across which sentences are
+        rendered, in chunks. If shards are specified, worker processes also
+        write the sharded treebank files, one at a time per file. If
+        unspecified sentences are rendered and written in the calling process.
+
+  Raises:
+    ValueError: invalid number of workers or shards, or shards are specified
+        for a file object.
+    OSError: treebank files could not be written.
+  """
+  _check_workers(workers)
+  if shards is None:
+    chunks = _rendered_chunks(sentences, workers)
+    if isinstance(path_or_file, (str, os.PathLike)):
+      with _open_for_writing(path_or_file) as writer:
+        _write_chunks(chunks, [writer])
+    else:
+      _write_chunks(chunks, [path_or_file])
+    return
+
+  if shards < 1:
+    raise ValueError(f"Invalid number of shards {shards}."
+                     f" It should be a positive integer.")
+  if not isinstance(path_or_file, (str, os.PathLike)):
+    raise ValueError("Sharded treebank files can only be written to paths.")
+
+  paths = [
+      f"{os.fspath(path_or_file)}-{i:05d}-of-{shards:05d}"
+      for i in range(shards)
+  ]
+  if workers is not None and workers > 1:
+    _write_shards_in_parallel(sentences, paths, workers)
+    return
+
+  with contextlib.ExitStack() as stack:
+    writers = [stack.enter_context(_open_for_writing(p)) for p in paths]
+    _write_chunks(_rendered_chunks(sentences, None), writers)
+
+
+def as_conllu(section: Optional[str] = None,
+              split: Optional[str] = None,
+              sources: Optional[sources_lib.Sources] = None,
+              readers: Optional[int] = None) -> str:
+  """Reads sentence annotations of Turkish Web Treebank in CoNLL-U format.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentence
+        annotations will be read (could be either 'web' or 'wiki'). If
+        unspecified sentence annotations from web and Wikipedia sections will
+        be read.
+    split: optional, treebank split whose sentence annotations will be read
+        (could be 'train', 'test', 'dev'). If unspecified sentence annotations
+        from all three splits will be read.
+    sources: optional, sources of treebank files to read in place of the
+        sections (see sentences).
+    readers: optional, number of treebank files that are read concurrently
+        (see sentences).
+
+  Raises:
+    ValueError: invalid section name, split specifier, sources or number of
+        readers, or source treebank files from which the sentence annotations
+        are read is not valid with respect to the CoNLL-U format.
+
+  Returns:
+    Sentence annotations for the specified treebank and split in CoNNL-U
+    treebank file format.
+  """
+  return _reconstruct_conll_from(
+      iter_conllu(section, split, sources=sources, readers=readers))
+
+
+def _sentences_of(
+    path: str, split: Optional[str], use_cache: bool, workers: Optional[int],
+    interner: Optional[compact.Interner], validate: str,
+    errors: List[StructuralError]
+) -> Generator[Union[_Sentence, compact.Sentence], None, None]:
+  """Reads and yields sentences of a treebank file, see sentences.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    split: optional, treebank split (could be 'train', 'test', 'dev').
+    use_cache: if False parsed sentences are neither read from nor written to
+        the on disk cache.
+    workers: number of worker processes across which sentence annotations are
+        parsed, or None to parse them in the calling process.
+    interner: optional, interner of the annotations of compact sentences. If
+        unspecified sentences are parsed into sentence protobufs.
+    validate: validation mode of the sentence annotations.
+    errors: list into which structural errors are collected in 'collect'
+        validation mode.
+
+  Raises:
+    ValueError: treebank file is not valid with respect to the CoNLL-U format,
+        in 'strict' validation mode.
+
+  Yields:
+    Sentence protobufs, or compact sentences if an interner is given, which
+    belong to the split.
+  """
+  corpus, previous = _kept_corpus(path, use_cache)
+  if corpus is not None:
+    count = len(corpus.sentence)
+    for indices in _split_ranges(count, split) if split else [range(count)]:
+      for sentence in corpus.sentence[indices.start:indices.stop]:
+        yield _in_representation(sentence, interner)
+    return
+
+  yielded = 0
+  try:
+    for sentence in _building_corpus(path, split, use_cache, workers,
+                                     interner, previous):
+      yield sentence
+      yielded += 1
+    return
+  except ValueError:
+    pass  # Sentences that are not yielded yet are read as if not cached.
+
+  yield from itertools.islice(
+      _parsed_sentences_of(path, split, use_cache, workers, interner, validate,
+                           errors), yielded, None)
+
+
+def _parsed_sentences_of(
+    path: str, split: Optional[str], use_cache: bool, workers: Optional[int],
+    interner: Optional[compact.Interner], validate: str,
+    errors: List[StructuralError]
+) -> Generator[Union[_Sentence, compact.Sentence], None, None]:
+  """Parses and yields sentences of a treebank file without caching them.
+
+  See _sentences_of for the arguments.
+
+  Raises:
+    ValueError: treebank file is not valid with respect to the CoNLL-U format,
+        in 'strict' validation mode.
+
+  Yields:
+    Sentence protobufs, or compact sentences if an interner is given, which
+    belong to the split.
+  """
+  from turkish_treebanks import profiling
+  if validate == "off" or _is_validated(path, use_cache):
+    yield from profiling.timed(
+        "parse",
+        _parsed_sentences(
+            _sentences_in_split(path, split), workers, interner,
+            validate=False))
+  elif validate == "collect":
+    yield from profiling.timed(
+        "parse",
+        _marking_validated(
+            path, split, use_cache,
+            _collected(path, split,
+                       lambda s, e: _parse_sentence(s, interner, errors=e),
+                       errors), errors))
+  else:
+    yield from profiling.timed(
+        "parse",
+        _marking_validated(
+            path, split, use_cache,
+            _parsed_sentences(_sentences_in_split(path, split), workers,
+                              interner)))
+
+
+def sentences(
+    section: Optional[str] = None,
+    split: Optional[str] = None,
+    use_cache: bool = True,
+    workers: Optional[int] = None,
+    representation: str = "proto",
+    validate: str = "strict",
+    sources: Optional[sources_lib.Sources] = None,
+    readers: Optional[int] = None
+) -> Generator[Union[_Sentence, compact.Sentence], None, None]:
+  """Reads and yields sentences of Turkish Web Treebank as sentence protobufs.
+
+  Unless caching is disabled, parsed sentences of each treebank file are
+  cached on disk the first time it is read through (see build_cache), and
+  later reads deserialize the cached sentences instead of parsing the treebank
+  file again. Sentences are yielded as they are parsed while the cache is
+  built, which is only written once all sentences of the treebank file are
+  parsed (including the ones of other splits), so the first sentence is
+  yielded right after its annotation is read. Cached sentences are invalidated
+  when the treebank file changes. Sentences of the most recently read treebank
+  files are also kept in memory, even if caching is disabled (see
+  set_memory_cache_limits), so reading another split of a treebank file
+  neither parses nor loads it again. Sentence protobufs that are read from
+  memory are shared with later reads instead of being copied, so they must be
+  treated as read-only, and copied (such as with CopyFrom) to be modified.
+
+  Sentence annotations are validated as they are parsed. Once all sentence
+  annotations of a treebank file are validated, the fingerprint of the file
+  is recorded (in memory, and on disk unless caching is disabled), and its
+  sentence annotations are not validated again until it changes.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentence
+        annotations will be read (could be either 'web' or 'wiki'). If
+        unspecified sentence annotations from both web and Wikipedia sections
+        will be read.
+    split: optional, treebank split whose sentence annotations will be read
+        (could be 'train', 'test', 'dev'). If unspecified sentence annotations
+        from all three splits will be read.
+    use_cache: optional, if False parsed sentences are neither read from nor
+        written to the on disk cache, but they are still kept in memory.
+        Caching can also be disabled by setting the
+        TURKISH_TREEBANKS_NO_CACHE environment variable.
+    workers: optional, number of worker processes across which sentence
+        annotations are parsed, in chunks. Sentences are still yielded in the
+        order they appear in the treebank files. If unspecified sentence
+        annotations are parsed in the calling process.
+    representation: optional, representation of the yielded sentences (could
+        be 'proto' or 'compact'). Compact sentences (see
+        turkish_treebanks.compact) use less memory than sentence protobufs,
+        and can be converted into sentence protobufs when needed.
+    validate: optional, validation mode of the sentence annotations (could be
+        'strict', 'collect' or 'off'). In 'strict' mode the first structural
+        error is raised. In 'collect' mode sentences with structural errors
+        are skipped, and all structural errors are raised together with
+        their file and line positions once all sentences are read. Sentences
+        are parsed in the calling process in 'collect' mode. In 'off' mode
+        sentence annotations are trusted to be wellformed and are not
+        checked.
+    sources: optional, paths or glob patterns of treebank files, such as the
+        shards of a treebank, which are read in place of the sections (see
+        turkish_treebanks.sources). Treebank files that are compressed with
+        gzip, xz or bzip2 are decompressed as they are read. Treebank files
+        are read in the order of the sources, and each treebank file is split
+        by the position of its sentences, as sections are.
+    readers: optional, number of treebank files that are read concurrently in
+        threads, each of which is read as a whole ahead of the sentences that
+        are yielded. Sentences are still yielded in the order of the treebank
+        files. If unspecified treebank files are read one after the other.
+
+  Raises:
+    ValueError: invalid section name, split specifier, representation,
+        validation mode, sources, or number of workers or readers, or source
+        treebank files from which the sentence annotations are read is not
+        valid with respect to the CoNLL-U format.
+    ValidationError: sentence annotations have structural errors, which are
+        collected in 'collect' validation mode.
+
+  Yields:
+    Sentence protobufs (or compact sentences) which contain annotations for
+    the specified treebank section and split.
+  """
+  from turkish_treebanks import compact
+  from turkish_treebanks import profiling
+  _check_workers(workers)
+  _check_readers(readers)
+  if representation not in _VALID_REPRESENTATIONS:
+    raise ValueError(f"Invalid representation '{representation}'."
+                     f" It can only be one of: 'proto', 'compact'.")
+
+  _check_validate(validate)
+
+  interner = compact.Interner() if representation == "compact" else None
+  paths = _paths_for(section, split, sources)
+  errors_by_path = [[] for _ in paths]
+  yield from profiling.counted(
+      _read_ahead((_sentences_of(path, split, use_cache, workers, interner,
+                                 validate, errors)
+                   for path, errors in zip(paths, errors_by_path)), readers))
+
+  errors = list(itertools.chain.from_iterable(errors_by_path))
+  if errors:
+    raise ValidationError(errors)
+
+
+def sentence_views(
+    section: Optional[str] = None,
+    split: Optional[str] = None
+) -> Generator[mapped.SentenceView, None, None]:
+  """Reads and yields lazily decoded views of Turkish Web Treebank sentences.
+
+  Treebank files are memory-mapped and sentence, line and column boundaries
+  are found over their raw bytes. Views refer to the mapped file contents
+  without copying them and only decode the fields that are read, so that
+  memory usage stays close to the size of the treebank files, whose pages are
+  shared by all processes that map them. Sentence annotations are validated
+  lazily, when the fields of views are read.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentence
+        annotations will be read (could be either 'web' or 'wiki'). If
+        unspecified sentence annotations from both web and Wikipedia sections
+        will be read.
+    split: optional, treebank split whose sentence annotations will be read
+        (could be 'train', 'test', 'dev'). If unspecified sentence annotations
+        from all three splits will be read.
+
+  Raises:
+    ValueError: invalid section name or split specifier, or source treebank
+        files from which the sentence annotations are read is not valid with
+        respect to the CoNLL-U format.
+
+  Yields:
+    Views of the sentence annotations for the specified treebank section and
+    split. Views keep the treebank file mapped as long as they are referenced.
+  """
+  from turkish_treebanks import mapped
+  for path in _paths_for(section, split):
+    buffer = _mapped(path)
+    if buffer is None:
+      continue
+
+    for index, (start, end) in enumerate(mapped.sentence_ranges(buffer)):
+      if _sentence_is_in_split(index, split):
+        yield mapped.SentenceView(buffer, start, end)
+
+
+def as_arrays(section: Optional[str] = None,
+              split: Optional[str] = None) -> "arrays_lib.Arrays":
+  """Reads sentences of Turkish Web Treebank into columnar NumPy arrays.
+
+  Requires NumPy. See turkish_treebanks.arrays for the layout of the arrays,
+  and for saving them into and loading them from .npz files.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentence
+        annotations will be read (could be either 'web' or 'wiki'). If
+        unspecified sentence annotations from both web and Wikipedia sections
+        will be read.
+    split: optional, treebank split whose sentence annotations will be read
+        (could be 'train', 'test', 'dev'). If unspecified sentence annotations
+        from all three splits will be read.
+
+  Raises:
+    ValueError: invalid section name or split specifier, or source treebank
+        files from which the sentence annotations are read is not valid with
+        respect to the CoNLL-U format.
+
+  Returns:
+    Columnar annotations of the sentences for the specified treebank section
+    and split.
+  """
+  # NumPy is an optional dependency, only imported when arrays are read.
+  from turkish_treebanks import arrays as arrays_lib
+
+  return arrays_lib.from_sentences(sentences(section, split))
+
+
+def share(section: Optional[str] = None,
+          split: Optional[str] = None,
+          name: Optional[str] = None) -> shared_lib.SharedCorpus:
+  """Publishes Turkish Web Treebank sentences into shared memory.
+
+  Requires NumPy. Sentences are read once into columnar arrays (see
+  as_arrays) and are published into a shared memory block, so that worker
+  processes (such as those of a data loader) do not each read and hold their
+  own copy of them. Worker processes attach to the block by its name with
+  turkish_treebanks.shared.attach, and read sentences through views of the
+  shared arrays. The block is released once the returned corpus and all
+  corpora that are attached to it are closed.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentences will be
+        published (could be either 'web' or 'wiki'). If unspecified sentences
+        from both web and Wikipedia sections will be published.
+    split: optional, treebank split whose sentences will be published (could
+        be 'train', 'test', 'dev'). If unspecified sentences from all three
+        splits will be published.
+    name: optional, name of the shared memory block. If unspecified a unique
+        name is chosen.
+
+  Raises:
+    ValueError: invalid section name or split specifier, or source treebank
+        files from which the sentence annotations are read is not valid with
+        respect to the CoNLL-U format.
+    FileExistsError: shared memory block with given name already exists.
+
+  Returns:
+    Corpus of the sentences for the specified treebank section and split,
+    whose name is the name of the shared memory block.
+  """
+  # NumPy is an optional dependency, only imported when sentences are shared.
+  from turkish_treebanks import shared as shared_lib
+
+  return shared_lib.publish(as_arrays(section, split), name)
+
+
+def as_trees(section: Optional[str] = None,
+             split: Optional[str] = None) -> "trees_lib.Trees":
+  """Reads dependency tree structures of Turkish Web Treebank sentences.
+
+  Requires NumPy. See turkish_treebanks.trees for the tree structures, and for
+  saving them into and loading them from .npz files. Token positions in the
+  tree structures are the same as in the columnar arrays that are read by
+  as_arrays for the same section and split.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentences will be
+        read (could be either 'web' or 'wiki'). If unspecified sentences from
+        both web and Wikipedia sections will be read.
+    split: optional, treebank split whose sentences will be read (could be
+        'train', 'test', 'dev'). If unspecified sentences from all three
+        splits will be read.
+
+  Raises:
+    ValueError: invalid section name or split specifier, source treebank files
+        from which the sentence annotations are read is not valid with respect
+        to the CoNLL-U format, or heads of tokens do not form trees.
+
+  Returns:
+    Dependency tree structures of the sentences for the specified treebank
+    section and split.
+  """
+  # NumPy is an optional dependency, only imported when trees are read.
+  from turkish_treebanks import trees as trees_lib
+
+  return trees_lib.from_sentences(
+      sentences(section, split, representation="compact"))
+
+
+def batches(section: Optional[str] = None,
+            split: Optional[str] = None,
+            max_tokens: int = 4096,
+            buckets: Optional[Sequence[int]] = None,
+            shuffle_seed: Optional[int] = None,
+            epochs: Optional[int] = 1) -> Iterator["batches_lib.Batch"]:
+  """Reads Turkish Web Treebank sentences in length-bucketed padded batches.
+
+  Requires NumPy. Sentences are read into columnar arrays once (see as_arrays)
+  and are batched again in each epoch without being parsed again. See
+  turkish_treebanks.batches for how sentences are bucketed and batched.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentences will be
+        read (could be either 'web' or 'wiki'). If unspecified sentences from
+        both web and Wikipedia sections will be read.
+    split: optional, treebank split whose sentences will be read (could be
+        'train', 'test', 'dev'). If unspecified sentences from all three
+        splits will be read.
+    max_tokens: token budget of a batch, that is, the maximum number of
+        sentences of a batch times the upper bound of their length.
+    buckets: optional, strictly increasing upper bounds of the length of the
+        sentences of each bucket. If unspecified
+        turkish_treebanks.batches.DEFAULT_BUCKETS are used.
+    shuffle_seed: optional, seed of the shuffling of sentences and batches in
+        each epoch. If unspecified batches follow the order of the sentences.
+    epochs: optional, number of passes over the sentences. If None batches are
+        yielded indefinitely.
+
+  Raises:
+    ValueError: invalid section name, split specifier, token budget, bucket
+        boundaries or number of epochs, or source treebank files from which
+        the sentence annotations are read is not valid with respect to the
+        CoNLL-U format.
+
+  Returns:
+    Iterator over padded batches of the sentences for the specified treebank
+    section and split, whose token annotations are ids into the vocabularies
+    of as_arrays(section, split).
+  """
+  # NumPy is an optional dependency, only imported when batches are read.
+  from turkish_treebanks import batches as batches_lib
+
+  return batches_lib.from_arrays(
+      as_arrays(section, split), max_tokens, buckets, shuffle_seed, epochs)
+
+
+def _read_predictions(
+    predictions: List[sources_lib.Sources]) -> List[evaluate_lib.Predictions]:
+  """Reads predicted heads and dependency relations of prediction files."""
+  from turkish_treebanks import evaluate as evaluate_lib
+
+  return [
+      evaluate_lib.predictions_from_conllu(
+          iter_conllu(validate="off", sources=p)) for p in predictions
+  ]
+
+
+def evaluate(predictions: Sequence[sources_lib.Sources],
+             section: Optional[str] = None,
+             split: Optional[str] = None,
+             workers: Optional[int] = None) -> List[evaluate_lib.Scores]:
+  """Scores dependency parses of Turkish Web Treebank sentences.
+
+  Requires NumPy. Gold annotations of the sentences are read once, and the
+  predictions of all prediction files are scored against them at once, see
+  turkish_treebanks.evaluate for the scores.
+
+  Args:
+    predictions: CoNLL-U format prediction files, such as those of many
+        parser checkpoints, each of which is a source (see
+        turkish_treebanks.sources) whose sentences are predictions of the
+        sentences of the section and split, in the same order.
+    section: optional, section of Turkish Web Treebank whose sentences are
+        predicted (could be either 'web' or 'wiki'). If unspecified sentences
+        of web and Wikipedia sections are predicted, in this order, and are
+        also scored separately.
+    split: optional, treebank split whose sentences are predicted (could be
+        'train', 'test', 'dev'). If unspecified sentences of all three splits
+        are predicted.
+    workers: optional, number of worker processes across which prediction
+        files are read. If unspecified prediction files are read in the
+        calling process.
+
+  Raises:
+    ValueError: invalid section name, split specifier, sources or number of
+        workers, or prediction files are not of the sentences or tokens of
+        the section and split.
+
+  Returns:
+    Scores of each prediction file, in order.
+  """
+  _check_workers(workers)
+  # NumPy is an optional dependency, only imported when parses are scored.
+  from turkish_treebanks import evaluate as evaluate_lib
+
+  sections = [section] if section else list(_PATHS_BY_SECTION)
+  gold = evaluate_lib.gold_from_arrays(
+      {s: as_arrays(s, split) for s in sections})
+  chunks = ([p] for p in predictions)
+  if workers is not None and workers > 1:
+    predicted = itertools.chain.from_iterable(
+        _map_in_parallel(_read_predictions, chunks, workers))
+  else:
+    predicted = itertools.chain.from_iterable(map(_read_predictions, chunks))
+  return evaluate_lib.score(gold, list(predicted))
+
+
+def index(section: Optional[str] = None,
+          split: Optional[str] = None) -> Index:
+  """Builds an inverted index of Turkish Web Treebank token annotations.
+
+  See turkish_treebanks.index for the queries that the index answers. Tokens
+  are identified by the ordinal position of their sentence in the indexed
+  sentences, which are read by sentences, and their index in the sentence.
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose sentences will be
+        indexed (could be either 'web' or 'wiki'). If unspecified sentences of
+        both web and Wikipedia sections will be indexed.
+    split: optional, treebank split whose sentences will be indexed (could be
+        'train', 'test', 'dev'). If unspecified sentences from all three
+        splits will be indexed.
+
+  Raises:
+    ValueError: invalid section name or split specifier, or source treebank
+        files from which the sentence annotations are read is not valid with
+        respect to the CoNLL-U format.
+
+  Returns:
+    Inverted index of the token annotations of the sentences for the specified
+    treebank section and split.
+  """
+  from turkish_treebanks import index as index_lib
+  return index_lib.from_sentences(
+      sentences(section, split, representation="compact"))
+
+
+def _stats_cache_kind(split: Optional[str]) -> str:
+  """Returns the kind of the cache file of statistics of the split."""
+  return f"{_STATS_CACHE}.{split or 'all'}"
+
+
+def _file_stats(path: str, split: Optional[str],
+                use_cache: bool) -> stats_lib.Stats:
+  """Loads statistics of the treebank file, computing them if needed.
+
+  Args:
+    path: path to a CoNLL-U format treebank file.
+    split: optional, treebank split (could be 'train', 'test', 'dev').
+    use_cache: if False statistics are neither read from nor written to the
+        on disk cache.
+
+  Raises:
+    ValueError: treebank file is not valid with respect to the CoNLL-U format.
+
+  Returns:
+    Frequency statistics of the sentences of the treebank file which belong
+    to the split.
+  """
+  from turkish_treebanks import compact
+  from turkish_treebanks import stats as stats_lib
+  kind = _stats_cache_kind(split)
+  if _caching_enabled(use_cache):
+    cached = _load_cache(path, kind, twt_pb2.Statistics)
+    if cached is not None:
+      return stats_lib.from_proto(cached)
+
+  fingerprint = _fingerprint_of(path)
+  file_stats = stats_lib.from_sentences(
+      _sentences_of(path, split, use_cache, None, compact.Interner(),
+                    "strict", []))
+  if _caching_enabled(use_cache):
+    cached = stats_lib.to_proto(file_stats)
+    _stamp(cached, fingerprint)
+    try:
+      _write_cache(path, kind, cached)
+    except OSError:
+      pass  # Caching is best effort, computed statistics are still usable.
+
+  return file_stats
+
+
+def stats(section: Optional[str] = None,
+          split: Optional[str] = None,
+          use_cache: bool = True) -> stats_lib.Stats:
+  """Computes frequency statistics of Turkish Web Treebank sentences.
+
+  Statistics of each treebank file and split are computed in a single pass
+  over its sentences, and unless caching is disabled, are cached on disk
+  together with the parsed sentences (see build_cache), so that they are only
+  computed again when the treebank file changes. Statistics of treebank files
+  are merged (see turkish_treebanks.stats.merge).
+
+  Args:
+    section: optional, section of Turkish Web Treebank whose statistics will
+        be computed (could be either 'web' or 'wiki'). If unspecified
+        statistics of both web and Wikipedia sections will be computed.
+    split: optional, treebank split whose statistics will be computed (could
+        be 'train', 'test', 'dev'). If unspecified statistics of all three
+        splits will be computed.
+    use_cache: optional, if False statistics are neither read from nor written
+        to the on disk cache. Caching can also be disabled by setting the
+        TURKISH_TREEBANKS_NO_CACHE environment variable.
+
+  Raises:
+    ValueError: invalid section name or split specifier, or source treebank
+        files from which the sentence annotations are read is not valid with
+        respect to the CoNLL-U format.
+
+  Returns:
+    Frequency statistics of the sentences for the specified treebank section
+    and split.
+  """
+  from turkish_treebanks import stats as stats_lib
+  return stats_lib.merge(
+      _file_stats(path, split, use_cache)
+      for path in _paths_for(section, split))
+
+
+def profile(
+    observer: Optional[profiling.Observer] = None) -> ContextManager[Report]:
+  """Profiles reading of the treebank within the context.
+
+  Reading is instrumented with per-stage timers (such as reading, validating
+  and parsing sentence annotations) and counters (such as bytes read and the
+  number of sentences, tokens and features) while a profile is active. See
+  turkish_treebanks.profiling for the stages and counters. For example:
+
+    with read.profile() as report:
+      sentences = list(read.sentences("web", use_cache=False))
+    print(report.summary())
+
+  Only streams of sentences that are created within the context are profiled,
+  and reading is not instrumented when no profile is active.
+
+  Args:
+    observer: optional, function that is called with the name of the stage or
+        counter, and the time spent in the stage or the increment of the
+        counter, each time one is reported.
+
+  Returns:
+    Context manager which yields the report of timers and counters, which is
+    updated as sentences are read within the context.
   """
-  for sentence in _split_into_sentences(as_conllu(section, split)):
-    yield _decompose_sentence(sentence)
+  from turkish_treebanks import profiling
+  return profiling.profile(observer)
@@ -15,9 +15,26 @@
 
 """Tests for turkish_treebanks.read."""
 
+import bz2
+import gzip
+import io
 import itertools
+import json
+import lzma
+import os
+import subprocess
+import sys
+from typing import List
+from unittest import mock
 
+from turkish_treebanks import arrays
+from turkish_treebanks import compact
+from turkish_treebanks import index
+from turkish_treebanks import profiling
 from turkish_treebanks import read
+from turkish_treebanks import shared
+from turkish_treebanks import sources
+from turkish_treebanks import stats
 from turkish_treebanks import twt_pb2
 
 from absl.testing import absltest
@@ -26,6 +43,13 @@ from absl.testing import parameterized
 
 class SentencesTest(parameterized.TestCase):
 
+  def setUp(self):
+    super().setUp()
+    self.enter_context(
+        mock.patch.dict(os.environ, {
+            "TURKISH_TREEBANKS_CACHE_DIR": self.create_tempdir().full_path,
+        }))
+
   @parameterized.named_parameters([
       {
           "testcase_name": "Unfiltered",
@@ -244,6 +268,104 @@ class SentencesTest(parameterized.TestCase):
     actual_token = sentence.token[0]
     self.assertEqual(expected_token, actual_token)
 
+  @parameterized.named_parameters([
+      {
+          "testcase_name": "Web",
+          "section": "web",
+          "split": None,
+          "expected_sentence_count": 2541,
+      },
+      {
+          "testcase_name": "WebDevSplit",
+          "section": "web",
+          "split": "dev",
+          "expected_sentence_count": 254,
+      },
+  ])
+  def test_iterates_conllu(self, section, split, expected_sentence_count):
+    conllu = list(read.iter_conllu(section, split))
+    self.assertLen(conllu, expected_sentence_count)
+    self.assertEqual(read.as_conllu(section, split), "\n\n".join(conllu))
+    for annotation, sentence in zip(conllu, read.sentences(section, split)):
+      self.assertStartsWith(annotation,
+                            f"# sent_id = {sentence.sentence_id}\n")
+
+  def test_reads_sentence_views(self):
+    expected = list(read.sentences("web", "test", use_cache=False))
+    views = list(read.sentence_views("web", "test"))
+    self.assertEqual(expected, [v.to_proto() for v in views])
+
+  @parameterized.parameters([None, "dev"])
+  def test_reads_sentences_in_parallel(self, split):
+    expected = list(read.sentences("web", split, use_cache=False))
+    actual = list(read.sentences("web", split, use_cache=False, workers=3))
+    self.assertEqual(expected, actual)
+
+  def test_reads_arrays(self):
+    expected = list(read.sentences("web", "dev"))
+    actual = read.as_arrays("web", "dev")
+    self.assertLen(actual.sentence_id, 254)
+    self.assertLen(actual.form, 3260)
+    self.assertEqual(expected[3], arrays.to_sentence(actual, 3))
+
+  @parameterized.parameters([True, False])
+  def test_reads_compact_sentences(self, use_cache):
+    expected = list(read.sentences("web", "dev", use_cache=False))
+    actual = list(
+        read.sentences(
+            "web", "dev", use_cache=use_cache, representation="compact"))
+    self.assertIsInstance(actual[0], compact.Sentence)
+    self.assertEqual(expected, [s.to_proto() for s in actual])
+
+  def test_reads_trees(self):
+    sentence_arrays = read.as_arrays("web", "dev")
+    sentence_trees = read.as_trees("web", "dev")
+    self.assertEqual(sentence_arrays.sentence_offset.tolist(),
+                     sentence_trees.sentence_offset.tolist())
+    roots = sentence_trees.head == -1
+    self.assertEqual((sentence_arrays.head == 0).tolist(), roots.tolist())
+    self.assertEqual(roots.tolist(), (sentence_trees.depth == 0).tolist())
+
+  def test_reads_batches(self):
+    sentence_arrays = read.as_arrays("web", "dev")
+    batched = list(read.batches("web", "dev", max_tokens=64, shuffle_seed=1))
+    self.assertCountEqual(
+        range(len(sentence_arrays.sentence_id)),
+        itertools.chain.from_iterable(b.sentence_index for b in batched))
+    offset = sentence_arrays.sentence_offset
+    for batch in batched:
+      for row, sentence in enumerate(batch.sentence_index):
+        tokens = slice(offset[sentence], offset[sentence + 1])
+        self.assertEqual(sentence_arrays.form[tokens].tolist(),
+                         batch.form[row][batch.mask[row]].tolist())
+
+  def test_indexes_sentences(self):
+    sentences = list(read.sentences("web", "dev", use_cache=False))
+    expected = [(i, j)
+                for i, sentence in enumerate(sentences)
+                for j, token in enumerate(sentence.token)
+                if token.tag.fine == "NOMP" and any(
+                    f.category == "Copula" and f.value == "PresCop"
+                    for f in token.feature)]
+    treebank_index = read.index("web", "dev")
+    query = (index.Term("fine", "NOMP")
+             & index.Term("feature", "Copula=PresCop"))
+    self.assertNotEmpty(expected)
+    self.assertEqual(expected, treebank_index.search(query))
+    self.assertEqual([s.sentence_id for s in sentences],
+                     list(treebank_index.sentence_id))
+
+  def test_reads_splits_consistently_with_unfiltered_sentences(self):
+    unfiltered = list(read.iter_conllu("web"))
+    self.assertEqual(unfiltered[8::10], list(read.iter_conllu("web", "dev")))
+    self.assertEqual(unfiltered[9::10], list(read.iter_conllu("web", "test")))
+    train = [s for i, s in enumerate(unfiltered) if i % 10 < 8]
+    self.assertEqual(train, list(read.iter_conllu("web", "train")))
+
+  def test_iter_conllu_raises_exception_eagerly(self):
+    with self.assertRaisesRegex(ValueError, "Invalid section name 'foo'."):
+      read.iter_conllu("foo")
+
   @parameterized.named_parameters([
       {
           "testcase_name": "InvalidSection",
@@ -264,6 +386,767 @@ class SentencesTest(parameterized.TestCase):
     with self.assertRaisesRegexp(exception, error):
       next(read.sentences(section, split))
 
+  def test_raises_exception_for_invalid_number_of_workers(self):
+    with self.assertRaisesRegex(ValueError, "Invalid number of workers 0."):
+      next(read.sentences("web", workers=0))
+
+  def test_raises_exception_for_invalid_validation_mode(self):
+    with self.assertRaisesRegex(ValueError, "Invalid validation mode 'foo'."):
+      next(read.sentences("web", validate="foo"))
+
+  def test_raises_exception_for_invalid_representation(self):
+    with self.assertRaisesRegex(ValueError, "Invalid representation 'foo'."):
+      next(read.sentences("web", representation="foo"))
+
+
+class _SmallTreebankTestCase(parameterized.TestCase):
+  """Reads from small treebank files in place of the web and wiki sections."""
+
+  def setUp(self):
+    super().setUp()
+    with mock.patch.dict(os.environ, {"TURKISH_TREEBANKS_NO_CACHE": "1"}):
+      annotations = read.as_conllu("web").split("\n\n")
+    self.cache_dir = self.create_tempdir()
+    self.enter_context(
+        mock.patch.dict(os.environ, {
+            "TURKISH_TREEBANKS_CACHE_DIR": self.cache_dir.full_path,
+        }))
+    self.treebank = self.create_tempfile(
+        "web.conllu", content="\n\n".join(annotations[:20]))
+    self.wiki_treebank = self.create_tempfile(
+        "wiki.conllu", content="\n\n".join(annotations[20:30]) + "\n")
+    self.enter_context(
+        mock.patch.dict(read._PATHS_BY_SECTION, {
+            "web": self.treebank.full_path,
+            "wiki": self.wiki_treebank.full_path,
+        }))
+    self.addCleanup(read.clear_cache)
+
+
+class CacheTest(_SmallTreebankTestCase):
+
+  def test_builds_cache_on_first_use(self):
+    self.assertEmpty(os.listdir(self.cache_dir.full_path))
+    expected = list(read.sentences("web", use_cache=False))
+    self.assertEmpty(os.listdir(self.cache_dir.full_path))
+    self.assertEqual(expected, list(read.sentences("web")))
+    self.assertNotEmpty(os.listdir(self.cache_dir.full_path))
+    self.assertEqual(expected, list(read.sentences("web")))
+
+  def test_yields_sentences_while_building_cache(self):
+    with mock.patch.object(
+        read, "_parse_sentence", wraps=read._parse_sentence) as parse:
+      sentences = read.sentences("web")
+      next(sentences)
+    self.assertEqual(1, parse.call_count)
+    self.assertEmpty(os.listdir(self.cache_dir.full_path))
+    self.assertLen(list(sentences), 19)
+    self.assertNotEmpty(os.listdir(self.cache_dir.full_path))
+
+  def test_reads_split_without_cache_if_other_split_is_illformed(self):
+    annotations = self.treebank.read_text().split("\n\n")
+    annotations[12] = annotations[12].replace("\t", " ", 1)
+    self.treebank.write_text("\n\n".join(annotations))
+    self.assertEqual(
+        list(read.sentences("web", "dev", use_cache=False)),
+        list(read.sentences("web", "dev")))
+    self.assertEmpty(os.listdir(self.cache_dir.full_path))
+    with self.assertRaisesRegex(ValueError, "Illformed CoNNL-U format token"):
+      list(read.sentences("web", "train"))
+
+  def test_builds_cache_in_parallel(self):
+    read.build_cache("web", workers=2)
+    with mock.patch.object(read, "_parse_sentence") as parse:
+      actual = list(read.sentences("web"))
+    parse.assert_not_called()
+    self.assertEqual(list(read.sentences("web", use_cache=False)), actual)
+
+  def test_reads_splits_from_cache(self):
+    read.build_cache("web")
+    for split in ("train", "dev", "test"):
+      self.assertEqual(
+          list(read.sentences("web", split, use_cache=False)),
+          list(read.sentences("web", split)))
+
+  def test_does_not_parse_cached_sentences(self):
+    read.build_cache("web")
+    with mock.patch.object(read, "_parse_sentence") as parse:
+      self.assertLen(list(read.sentences("web")), 20)
+    parse.assert_not_called()
+
+  def test_invalidates_cache_when_source_changes(self):
+    read.build_cache("web")
+    conllu = self.treebank.read_text()
+    self.treebank.write_text(conllu.replace("\tBurda\t", "\tBurada\t", 1))
+    sentence = next(read.sentences("web"))
+    self.assertEqual("Burada", sentence.token[0].form)
+
+  def _edit_treebank(self) -> List[str]:
+    """Inserts a first sentence, modifies the third and removes the last.
+
+    Returns:
+      Sentence ids of the sentences of the treebank before it is edited.
+    """
+    annotations = self.treebank.read_text().split("\n\n")
+    sentence_ids = [a.split("\n")[0].split(" = ")[1] for a in annotations]
+    inserted = annotations[0].split("\n")
+    inserted[0] = "# sent_id = inserted"
+    modified = annotations[2].split("\n")
+    columns = modified[2].split("\t")
+    columns[1] = "Değişti"
+    modified[2] = "\t".join(columns)
+    annotations[2] = "\n".join(modified)
+    annotations = ["\n".join(inserted)] + annotations[:-1]
+    self.treebank.write_text("\n\n".join(annotations))
+    return sentence_ids
+
+  def test_parses_only_changed_sentences_when_source_changes(self):
+    read.build_cache("web")
+    self._edit_treebank()
+    with mock.patch.object(
+        read, "_parse_sentence", wraps=read._parse_sentence) as parse:
+      actual = list(read.sentences("web"))
+    self.assertEqual(2, parse.call_count)
+    self.assertEqual(list(read.sentences("web", use_cache=False)), actual)
+    self.assertEqual("Değişti", actual[3].token[0].form)
+
+  def test_updates_cache_with_changes_of_source(self):
+    read.build_cache("web")
+    sentence_ids = self._edit_treebank()
+    with read.profile() as report:
+      changes = read.update_cache("web")
+    self.assertEqual([
+        read.CorpusChanges(
+            path=self.treebank.full_path,
+            added=["inserted"],
+            removed=[sentence_ids[19]],
+            changed=[sentence_ids[2]],
+            resplit=[sentence_ids[i] for i in (7, 8, 9, 17, 18)],
+        )
+    ], changes)
+    self.assertEqual(18, report.counts["reused_sentences"])
+    for split in ("train", "dev", "test"):
+      self.assertEqual(
+          list(read.sentences("web", split, use_cache=False)),
+          list(read.sentences("web", split)))
+
+  def test_updates_cache_without_changes(self):
+    read.build_cache("web")
+    self.assertEqual(
+        [read.CorpusChanges(self.treebank.full_path, [], [], [], [])],
+        read.update_cache("web"))
+
+  def test_updates_cache_of_uncached_source(self):
+    changes = read.update_cache("web")
+    self.assertLen(changes[0].added, 20)
+    with mock.patch.object(read, "_parse_sentence") as parse:
+      self.assertLen(list(read.sentences("web")), 20)
+    parse.assert_not_called()
+
+  def test_reuses_cache_when_source_is_touched(self):
+    read.build_cache("web")
+    with mock.patch.object(read, "_parse_sentence") as parse:
+      next(read.sentences("web"))
+    parse.assert_not_called()
+
+  def test_reads_splits_from_memory(self):
+    expected = list(read.sentences("web", use_cache=False))
+    self.assertEqual(expected, list(read.sentences("web")))
+    with read.profile() as report, mock.patch.object(read,
+                                                     "_read_cache") as load:
+      actual = [list(read.sentences("web", s)) for s in ("train", "dev")]
+    load.assert_not_called()
+    self.assertEqual(2, report.counts["memory_hits"])
+    self.assertEqual(expected[:8] + expected[10:18], actual[0])
+    self.assertEqual([expected[8], expected[18]], actual[1])
+
+  @parameterized.parameters([
+      {"use_cache": False, "environment": {}},
+      {"use_cache": True, "environment": {"TURKISH_TREEBANKS_NO_CACHE": "1"}},
+  ])
+  def test_reads_splits_from_memory_without_cache_on_disk(
+      self, use_cache, environment):
+    with mock.patch.dict(os.environ, environment):
+      expected = list(read.sentences("web", use_cache=use_cache))
+      with read.profile() as report, mock.patch.object(
+          read, "_parse_sentence") as parse:
+        actual = list(read.sentences("web", "dev", use_cache=use_cache))
+    parse.assert_not_called()
+    self.assertEqual(1, report.counts["memory_hits"])
+    self.assertEqual([expected[8], expected[18]], actual)
+    self.assertEmpty(os.listdir(self.cache_dir.full_path))
+
+  def test_caches_sentences_kept_in_memory_on_disk(self):
+    expected = list(read.sentences("web", use_cache=False))
+    self.assertEqual(expected, list(read.sentences("web")))
+    read.clear_cache()
+    with read.profile() as report:
+      self.assertEqual(expected, list(read.sentences("web")))
+    self.assertEqual(1, report.counts["cache_hits"])
+    self.assertEqual(0, report.counts["memory_hits"])
+
+  def test_rereads_changed_source_from_memory(self):
+    next(read.sentences("web"))
+    conllu = self.treebank.read_text()
+    self.treebank.write_text(conllu.replace("\tBurda\t", "\tBurada\t", 1))
+    self.assertEqual("Burada", next(read.sentences("web")).token[0].form)
+
+  def test_evicts_least_recently_read_sections_from_memory(self):
+    self.addCleanup(read.set_memory_cache_limits)
+    read.set_memory_cache_limits(max_sections=1)
+    list(read.sentences("web"))
+    list(read.sentences("wiki"))
+    with read.profile() as report:
+      list(read.sentences("wiki"))
+      list(read.sentences("web"))
+    self.assertEqual(1, report.counts["memory_hits"])
+    self.assertEqual(2, report.counts["cache_hits"])
+
+  def test_clears_sentences_from_memory(self):
+    list(read.sentences("web"))
+    read.clear_cache()
+    with read.profile() as report:
+      list(read.sentences("web"))
+    self.assertEqual(0, report.counts["memory_hits"])
+
+  def test_raises_exception_for_invalid_memory_cache_limits(self):
+    with self.assertRaisesRegex(ValueError, "Invalid maximum size -1."):
+      read.set_memory_cache_limits(max_bytes=-1)
+
+  def test_opts_out_of_cache_with_environment_variable(self):
+    with mock.patch.dict(os.environ, {"TURKISH_TREEBANKS_NO_CACHE": "1"}):
+      list(read.sentences("web"))
+    self.assertEmpty(os.listdir(self.cache_dir.full_path))
+
+  def test_removes_cache(self):
+    read.build_cache("web")
+    read.remove_cache("web")
+    self.assertEmpty(os.listdir(self.cache_dir.full_path))
+
+
+class RandomAccessTest(_SmallTreebankTestCase):
+
+  def test_gets_sentence_by_id(self):
+    for expected in read.sentences(use_cache=False):
+      self.assertEqual(expected, read.get_sentence(expected.sentence_id))
+
+  def test_gets_sentences_by_id_in_given_order(self):
+    expected = list(read.sentences(use_cache=False))[::-3]
+    actual = read.get_sentences(s.sentence_id for s in expected)
+    self.assertEqual(expected, actual)
+
+  @parameterized.parameters([("web", 0), ("web", 19), ("web", -1),
+                             ("wiki", 0), ("wiki", 9), ("wiki", -10)])
+  def test_gets_sentence_by_index(self, section, index):
+    expected = list(read.sentences(section, use_cache=False))[index]
+    self.assertEqual(expected, read.get_sentence_at(section, index))
+
+  def test_persists_offset_index(self):
+    sentence_id = next(read.sentences("web", use_cache=False)).sentence_id
+    read.get_sentence(sentence_id)
+    read._offset_indices.clear()
+    with mock.patch.object(read, "_scan_sentence_blocks") as scan:
+      read.get_sentence(sentence_id)
+    scan.assert_not_called()
+
+  def test_reindexes_changed_treebank_file(self):
+    sentence_id = next(read.sentences("wiki", use_cache=False)).sentence_id
+    read.get_sentence(sentence_id)
+    self.wiki_treebank.write_text("\n" + self.wiki_treebank.read_text())
+    self.assertEqual(sentence_id, read.get_sentence(sentence_id).sentence_id)
+
+  def test_raises_exception_for_unknown_sentence_id(self):
+    with self.assertRaisesRegex(KeyError, "Unknown sentence id 'foo'."):
+      read.get_sentence("foo")
+
+  def test_raises_exception_for_out_of_range_index(self):
+    with self.assertRaisesRegex(IndexError, "Sentence index 20 is out of"):
+      read.get_sentence_at("web", 20)
+
+
+class ValidationTest(_SmallTreebankTestCase):
+
+  def _corrupt_treebank(self, token_line: bool = True) -> List[int]:
+    """Corrupts the fifth sentence, and optionally the first token line.
+
+    Args:
+      token_line: if False only the text line of the fifth sentence is
+          corrupted.
+
+    Returns:
+      Line numbers of the corrupted lines.
+    """
+    lines = self.treebank.read_text().split("\n")
+    text_line = [i for i, l in enumerate(lines) if l.startswith("# text")][4]
+    lines[text_line] = lines[text_line].replace("# text = ", "# txt = ")
+    corrupted = [text_line + 1]
+    if token_line:
+      lines[2] = lines[2].replace("\t", " ", 1)
+      corrupted.insert(0, 3)
+    self.treebank.write_text("\n".join(lines))
+    return corrupted
+
+  @parameterized.parameters([True, False])
+  def test_collects_all_structural_errors(self, use_cache):
+    corrupted = self._corrupt_treebank()
+    actual = []
+    with self.assertRaises(read.ValidationError) as raised:
+      for sentence in read.sentences(
+          "web", use_cache=use_cache, validate="collect"):
+        actual.append(sentence)
+    self.assertLen(actual, 18)
+    errors = raised.exception.errors
+    self.assertEqual(corrupted, [e.line for e in errors])
+    self.assertEqual({self.treebank.full_path}, {e.path for e in errors})
+    self.assertIn("Illformed CoNNL-U format token", errors[0].message)
+    self.assertIn("valid sentence text annotation", errors[1].message)
+
+  def test_collects_all_structural_errors_of_annotations(self):
+    corrupted = self._corrupt_treebank()
+    actual = []
+    with self.assertRaises(read.ValidationError) as raised:
+      for sentence in read.iter_conllu("web", validate="collect"):
+        actual.append(sentence)
+    self.assertLen(actual, 18)
+    self.assertEqual(corrupted, [e.line for e in raised.exception.errors])
+
+  def test_raises_first_structural_error(self):
+    self._corrupt_treebank()
+    with self.assertRaisesRegex(ValueError, "Illformed CoNNL-U format token"):
+      list(read.sentences("web", use_cache=False))
+
+  @parameterized.named_parameters([
+      ("Sentences", lambda: read.sentences("web", use_cache=False)),
+      ("Annotations", lambda: read.iter_conllu("web")),
+  ])
+  def test_validates_heads_of_tokens(self, read_web):
+    lines = self.treebank.read_text().split("\n")
+    column = lines[2].split("\t")
+    column[6] = "x"
+    lines[2] = "\t".join(column)
+    self.treebank.write_text("\n".join(lines))
+    with self.assertRaisesRegex(ValueError, "Illformed CoNNL-U format token"):
+      list(read_web())
+
+  def test_does_not_validate_when_validation_is_off(self):
+    self._corrupt_treebank(token_line=False)
+    self.assertLen(list(read.sentences("web", validate="off")), 20)
+
+  def test_does_not_validate_unchanged_file_again(self):
+    list(read.iter_conllu("web"))
+    read._validated_files.clear()
+    with mock.patch.object(read, "_validate_header") as validate:
+      list(read.iter_conllu("web"))
+      list(read.sentences("web", use_cache=False))
+    validate.assert_not_called()
+
+  def test_fingerprints_file_after_validating_it(self):
+    with mock.patch.object(read, "_sha256_of",
+                           wraps=read._sha256_of) as sha256_of:
+      sentences = read.iter_conllu("web")
+      next(sentences)
+      sha256_of.assert_not_called()
+      list(sentences)
+    sha256_of.assert_called_once_with(self.treebank.full_path)
+    with mock.patch.object(read, "_validate_header") as validate:
+      list(read.iter_conllu("web"))
+    validate.assert_not_called()
+
+  def test_does_not_record_file_changed_while_validating_as_validated(self):
+    sentences = read.iter_conllu("web")
+    next(sentences)
+    self.treebank.write_text(self.treebank.read_text() + "\n")
+    list(sentences)
+    self.assertNotIn(self.treebank.full_path, read._validated_files)
+
+  def test_validates_again_if_validated_file_record_is_malformed(self):
+    list(read.iter_conllu("web"))
+    read._validated_files.clear()
+    for name in os.listdir(self.cache_dir.full_path):
+      if ".validated." in name:
+        self.cache_dir.create_file(name, content="foo")
+    with mock.patch.object(
+        read, "_validate_header", wraps=read._validate_header) as validate:
+      list(read.iter_conllu("web"))
+    self.assertLen(validate.call_args_list, 20)
+
+  def test_validates_changed_file_again(self):
+    list(read.sentences("web", use_cache=False))
+    self._corrupt_treebank()
+    with self.assertRaisesRegex(ValueError, "Illformed CoNNL-U format token"):
+      list(read.sentences("web", use_cache=False))
+
+  def test_parses_sentence_annotation(self):
+    annotation = next(read.iter_conllu("web"))
+    self.assertEqual(next(read.sentences("web")), read.from_conllu(annotation))
+
+  def test_raises_exception_for_illformed_sentence_annotation(self):
+    with self.assertRaisesRegex(ValueError, "at least 3 lines"):
+      read.from_conllu("# sent_id = foo\n# text = foo")
+
+
+class StatsTest(_SmallTreebankTestCase):
+
+  def test_computes_statistics(self):
+    expected = stats.from_sentences(read.sentences(use_cache=False))
+    self.assertEqual(expected, read.stats(use_cache=False))
+    self.assertEqual(expected, read.stats())
+    self.assertEqual(30, expected.sentence_count)
+
+  def test_merges_statistics_of_sections_and_splits(self):
+    self.assertEqual(
+        read.stats(),
+        stats.merge(
+            read.stats(section, split)
+            for section in ("web", "wiki")
+            for split in ("train", "dev", "test")))
+
+  def test_caches_statistics(self):
+    expected = read.stats("web", "dev")
+    with mock.patch.object(stats, "from_sentences") as from_sentences:
+      self.assertEqual(expected, read.stats("web", "dev"))
+    from_sentences.assert_not_called()
+    read.remove_cache("web")
+    self.assertEmpty(os.listdir(self.cache_dir.full_path))
+
+  def test_invalidates_statistics_when_source_changes(self):
+    before = read.stats("web")
+    conllu = self.treebank.read_text()
+    self.treebank.write_text(conllu.replace("\tbur\t", "\tburada\t", 1))
+    after = read.stats("web")
+    self.assertNotEqual(before, after)
+    self.assertEqual(1, after.lemma["burada"] - before.lemma["burada"])
+
+
+class ProfileTest(_SmallTreebankTestCase):
+
+  def test_profiles_reading_stages(self):
+    with read.profile() as report:
+      actual = list(read.sentences("web", use_cache=False))
+    self.assertGreater(report.seconds["read"], 0)
+    self.assertGreater(report.seconds["parse"], 0)
+    self.assertEqual(
+        {
+            "bytes_read": len(self.treebank.read_bytes()),
+            "sentences": 20,
+            "tokens": sum(len(s.token) for s in actual),
+            "features": sum(
+                len(t.feature) for s in actual for t in s.token),
+        }, report.counts)
+
+  def test_profiles_cache(self):
+    with read.profile() as report:
+      list(read.sentences("web"))
+      list(read.sentences("web"))
+    self.assertEqual(1, report.counts["cache_misses"])
+    self.assertEqual(1, report.counts["cache_hits"])
+    self.assertEqual(40, report.counts["sentences"])
+    self.assertIn("cache_load", report.seconds)
+    self.assertIn("cache_write", report.seconds)
+
+  def test_profiles_validation_of_sentence_annotations(self):
+    with read.profile() as report:
+      self.assertLen(list(read.iter_conllu("web", "dev")), 2)
+    self.assertEqual(2, report.counts["sentences"])
+    self.assertIn("validate", report.seconds)
+    self.assertNotIn("parse", report.seconds)
+
+  def test_notifies_observer(self):
+    observed = []
+    with read.profile(lambda name, value: observed.append(name)):
+      list(read.sentences("web", use_cache=False))
+    self.assertEqual(20, observed.count("sentences"))
+    self.assertIn("parse", observed)
+
+  def test_does_not_profile_outside_of_context(self):
+    with read.profile() as report:
+      pass
+    list(read.sentences("web", use_cache=False))
+    self.assertEmpty(report.seconds)
+    self.assertEmpty(report.counts)
+
+
+class SourcesTest(_SmallTreebankTestCase):
+
+  def setUp(self):
+    super().setUp()
+    # Sentences of the web section are split into shards of 10, 5, 3 and 2
+    # sentences, which are compressed in different formats.
+    annotations = list(read.iter_conllu("web"))
+    self.shard_dir = self.create_tempdir()
+    self.shards = []
+    self.openers = []
+    for shard, (start, end, suffix, opener) in enumerate([
+        (0, 10, ".gz", gzip.open),
+        (10, 15, ".xz", lzma.open),
+        (15, 18, ".bz2", bz2.open),
+        (18, 20, "", open),
+    ]):
+      path = os.path.join(self.shard_dir.full_path,
+                          f"treebank-{shard:05d}.conllu{suffix}")
+      with opener(path, "wt", encoding="utf-8") as writer:
+        writer.write("\n\n".join(annotations[start:end]))
+      self.shards.append(path)
+      self.openers.append(opener)
+
+  @parameterized.parameters(None, 2)
+  def test_reads_sharded_compressed_treebank_files(self, readers):
+    pattern = os.path.join(self.shard_dir.full_path, "treebank-*")
+    self.assertEqual(
+        list(read.sentences("web")),
+        list(read.sentences(sources=pattern, readers=readers)))
+    self.assertEqual(
+        read.as_conllu("web"), read.as_conllu(sources=pattern, readers=readers))
+
+  @parameterized.parameters(None, 3)
+  def test_reads_splits_by_position_in_treebank_files(self, readers):
+    web = list(read.sentences("web"))
+    for split, expected in [("train", web[0:8] + web[10:20]),
+                            ("dev", web[8:9]),
+                            ("test", web[9:10])]:
+      self.assertEqual(
+          expected,
+          list(read.sentences(split=split, sources=self.shards,
+                              readers=readers)))
+      self.assertEqual(
+          [read.to_conllu(s) for s in expected],
+          list(read.iter_conllu(split=split, sources=self.shards,
+                                readers=readers)))
+
+  def test_reads_treebank_files_in_order_of_sources(self):
+    actual = list(read.sentences(sources=self.shards[::-1], use_cache=False))
+    self.assertEqual(list(read.sentences("web"))[18:], actual[:2])
+
+  @parameterized.parameters(None, 2)
+  def test_collects_structural_errors_in_order_of_treebank_files(
+      self, readers):
+    for shard, opener in zip(self.shards[:2], self.openers):
+      with sources.open_text(shard) as reader:
+        annotations = reader.read()
+      with opener(shard, "wt", encoding="utf-8") as writer:
+        writer.write(annotations.replace("# text = ", "# txt = ", 1))
+    with self.assertRaises(read.ValidationError) as error:
+      list(read.sentences(sources=self.shards, validate="collect",
+                          readers=readers))
+    self.assertEqual(self.shards[:2],
+                     [e.path for e in error.exception.errors])
+
+  def test_raises_exception_for_section_and_sources(self):
+    with self.assertRaisesRegex(ValueError, "Either a section or sources"):
+      next(read.sentences("web", sources=self.shards))
+
+  def test_raises_exception_for_invalid_number_of_readers(self):
+    with self.assertRaisesRegex(ValueError, "Invalid number of readers 0."):
+      read.iter_conllu(sources=self.shards, readers=0)
+
+
+class WriteTest(_SmallTreebankTestCase):
+
+  def test_renders_sentence_annotation(self):
+    for annotation in read.iter_conllu("web"):
+      self.assertEqual(annotation, read.to_conllu(read.from_conllu(annotation)))
+
+  @parameterized.parameters(None, 2)
+  def test_writes_treebank_file_byte_identically(self, workers):
+    path = os.path.join(self.create_tempdir().full_path, "web.conllu")
+    read.write_conllu(read.sentences("web"), path, workers=workers)
+    with open(path, "rb") as written:
+      self.assertEqual(self.treebank.read_bytes(), written.read())
+
+  def test_writes_compact_sentences(self):
+    path = os.path.join(self.create_tempdir().full_path, "web.conllu")
+    read.write_conllu(read.sentences("web", representation="compact"), path)
+    with open(path, "rb") as written:
+      self.assertEqual(self.treebank.read_bytes(), written.read())
+
+  def test_writes_to_file_object(self):
+    writer = io.StringIO()
+    read.write_conllu(read.sentences("web"), writer)
+    self.assertEqual(read.as_conllu("web"), writer.getvalue())
+
+  @parameterized.parameters(None, 2)
+  def test_writes_sharded_treebank_files(self, workers):
+    directory = self.create_tempdir().full_path
+    sentences = list(read.sentences())
+    read.write_conllu(sentences, os.path.join(directory, "treebank"),
+                      shards=3, workers=workers)
+    self.assertCountEqual([
+        "treebank-00000-of-00003",
+        "treebank-00001-of-00003",
+        "treebank-00002-of-00003",
+    ], os.listdir(directory))
+    written = []
+    for name in sorted(os.listdir(directory)):
+      with open(os.path.join(directory, name), encoding="utf-8") as reader:
+        written.extend(
+            read.from_conllu(a) for a in reader.read().split("\n\n") if a)
+    self.assertCountEqual(sentences, written)
+
+  def test_writes_same_sharded_treebank_files_in_worker_processes(self):
+    sentences = list(read.sentences("web")) * 5
+    contents = []
+    for workers in (None, 2):
+      directory = self.create_tempdir().full_path
+      read.write_conllu(sentences, os.path.join(directory, "treebank"),
+                        shards=3, workers=workers)
+      shards = []
+      for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), "rb") as written:
+          shards.append((name, written.read()))
+      contents.append(shards)
+    self.assertEqual(contents[0], contents[1])
+
+  @parameterized.parameters(0, -1)
+  def test_raises_exception_for_invalid_shards(self, shards):
+    with self.assertRaisesRegex(ValueError, "Invalid number of shards"):
+      read.write_conllu([], "treebank", shards=shards)
+
+  def test_raises_exception_for_sharded_file_object(self):
+    with self.assertRaisesRegex(ValueError, "only be written to paths"):
+      read.write_conllu([], io.StringIO(), shards=2)
+
+
+class SplitManifestTest(_SmallTreebankTestCase):
+
+  def test_returns_split_manifest(self):
+    expected = {
+        "train": [range(0, 8), range(10, 18)],
+        "dev": [range(8, 9), range(18, 19)],
+        "test": [range(9, 10), range(19, 20)],
+    }
+    self.assertEqual(expected, read.split_manifest("web"))
+
+  def test_returns_split_manifest_of_partial_split(self):
+    expected = {
+        "train": [range(0, 8)],
+        "dev": [range(8, 9)],
+        "test": [range(9, 10)],
+    }
+    self.assertEqual(expected, read.split_manifest("wiki"))
+
+  def test_raises_exception_for_invalid_section(self):
+    with self.assertRaisesRegex(ValueError, "Invalid section name 'foo'."):
+      read.split_manifest("foo")
+
+  @parameterized.parameters(True, False)
+  def test_reads_splits_of_crlf_treebank_file(self, use_cache):
+    annotations = list(read.iter_conllu("web"))
+    sentences = list(read.sentences("web", use_cache=False))
+    self.treebank.write_bytes(
+        "\r\n \r\n".join(annotations).replace("\n", "\r\n").replace(
+            "\r\r\n", "\r\n").encode("utf-8"))
+    read.clear_cache()
+
+    self.assertEqual(annotations, list(read.iter_conllu("web")))
+    self.assertEqual(sentences, list(read.sentences("web",
+                                                    use_cache=use_cache)))
+    manifest = read.split_manifest("web")
+    for split in ("train", "dev", "test"):
+      indices = [i for r in manifest[split] for i in r]
+      self.assertEqual([annotations[i] for i in indices],
+                       list(read.iter_conllu("web", split)))
+      self.assertEqual([sentences[i] for i in indices],
+                       list(read.sentences("web", split,
+                                           use_cache=use_cache)))
+    self.assertEqual(sentences[-1],
+                     read.get_sentence(sentences[-1].sentence_id))
+
+
+class ShareTest(_SmallTreebankTestCase):
+
+  def test_shares_sentences(self):
+    with read.share("web", "dev") as corpus:
+      with shared.attach(corpus.name) as attached:
+        self.assertEqual(
+            list(read.sentences("web", "dev")),
+            [s.to_proto() for s in attached])
+
+  def test_raises_exception_for_existing_name(self):
+    with read.share("wiki", "dev") as corpus:
+      with self.assertRaises(FileExistsError):
+        read.share("wiki", "dev", name=corpus.name)
+
+
+class EvaluateTest(_SmallTreebankTestCase):
+
+  @parameterized.parameters(None, 2)
+  def test_evaluates_prediction_files(self, workers):
+    annotations = list(read.iter_conllu(split="dev"))
+    perfect = self.create_tempfile(
+        "perfect.conllu", content="\n\n".join(annotations))
+    unlabeled = self.create_tempfile(
+        "unlabeled.conllu",
+        content="\n\n".join(
+            "\n".join(
+                "\t".join(c[:7] + ["dep"] + c[8:]) if len(c) == 10 else line
+                for line in a.split("\n")
+                for c in [line.split("\t")])
+            for a in annotations))
+    tokens = [t for s in read.sentences(split="dev") for t in s.token]
+    dep_fraction = sum(t.dependency_relation == "dep" for t in tokens) / len(
+        tokens)
+
+    perfect_scores, unlabeled_scores = read.evaluate(
+        [perfect.full_path, unlabeled.full_path], split="dev", workers=workers)
+    self.assertEqual((len(tokens), 1.0, 1.0), perfect_scores.all)
+    self.assertEqual({"web", "wiki"}, set(perfect_scores.by_section))
+    self.assertEqual(1.0, unlabeled_scores.all.unlabeled)
+    self.assertAlmostEqual(dep_fraction, unlabeled_scores.all.labeled)
+
+  def test_raises_exception_for_prediction_files_of_other_split(self):
+    predictions = self.create_tempfile(
+        "test.conllu", content="\n\n".join(read.iter_conllu(split="test")))
+    with self.assertRaisesRegex(ValueError, "do not match the gold sentences"):
+      read.evaluate([predictions.full_path], split="dev")
+
+
+class ImportTest(_SmallTreebankTestCase):
+
+  def test_imports_protobuf_runtime_on_first_use(self):
+    code = f"""
+import json
+import sys
+from turkish_treebanks import read
+imported = []
+def record():
+  imported.append([m for m in ("google.protobuf", "google.protobuf.descriptor",
+                               "concurrent.futures") if m in sys.modules])
+record()
+read.as_conllu(sources={self.treebank.full_path!r})
+record()
+next(read.sentences(sources={self.treebank.full_path!r}))
+record()
+print(json.dumps(imported))
+"""
+    completed = subprocess.run([sys.executable, "-c", code],
+                               check=True,
+                               capture_output=True,
+                               text=True,
+                               env=dict(os.environ,
+                                        PYTHONPATH=os.pathsep.join(sys.path)))
+    self.assertEqual(
+        [[], [], ["google.protobuf", "google.protobuf.descriptor"]],
+        json.loads(completed.stdout))
+
+  def test_imports_modules_of_functions_on_first_use(self):
+    code = """
+import json
+import sys
+from turkish_treebanks import read
+print(json.dumps(sorted(m for m in sys.modules
+                        if m.startswith("turkish_treebanks."))))
+"""
+    completed = subprocess.run([sys.executable, "-c", code],
+                               check=True,
+                               capture_output=True,
+                               text=True,
+                               env=dict(os.environ,
+                                        PYTHONPATH=os.pathsep.join(sys.path)))
+    self.assertEqual(["turkish_treebanks.read", "turkish_treebanks.twt_pb2"],
+                     json.loads(completed.stdout))
+    self.assertIs(index.Index, read.Index)
+    self.assertIs(profiling.Report, read.Report)
+
 
 if __name__ == "__main__":
   absltest.main()
@@ -0,0 +1,425 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Turkish Web Treebank sentences in memory shared across processes.
+
+Sentences are published once into a shared memory block, as the flat token
+and feature arrays of turkish_treebanks.arrays that are delimited by offset
+tables. String annotations (sentence ids, texts and vocabularies) are stored
+as UTF-8 encoded bytes, delimited by offsets. Other processes, such as the
+worker processes of a data loader, attach to the block by its name and read
+sentences through views, which decode annotations from the shared arrays
+without copying them.
+
+Shared memory blocks are reference counted: the process that publishes a
+block and each process that attaches to it hold a reference until they close
+it, and the block is released when the last reference is closed. References
+of processes that exit without closing them are not released. On Windows,
+where the operating system releases shared memory blocks once no process has
+them open, references are not counted.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import tempfile
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from turkish_treebanks import arrays as arrays_lib
+from turkish_treebanks import mapped
+from turkish_treebanks import twt_pb2
+
+Feature = mapped.Feature
+Tag = mapped.Tag
+
+# Byte length of the JSON manifest of the columns, which follows it.
+_HEADER = struct.Struct("<Q")
+_ALIGNMENT = 8
+_REFERENCE_COUNT = struct.Struct("<q")
+_COUNTS_REFERENCES = os.name == "posix"
+# Before Python 3.13 shared memory blocks that are attached to are tracked
+# (and released when the attaching process exits) by the resource tracker.
+_TRACKS_ATTACHED_MEMORY = sys.version_info < (3, 13)
+_STRING_SUFFIX = "_utf8"
+_STRING_OFFSET_SUFFIX = "_utf8_offset"
+
+
+def _encoded(strings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+  """Encodes strings into UTF-8 bytes, delimited by offsets."""
+  encoded = [s.encode("utf-8") for s in strings.tolist()]
+  offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+  np.cumsum(np.array([len(e) for e in encoded], dtype=np.int64),
+            out=offsets[1:])
+  return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _columns_of(arrays: arrays_lib.Arrays) -> Dict[str, np.ndarray]:
+  """Lays columnar annotations out into flat numeric columns."""
+  columns = {}
+  for field, column in arrays._asdict().items():
+    if column.dtype.kind == "U":
+      (columns[field + _STRING_SUFFIX],
+       columns[field + _STRING_OFFSET_SUFFIX]) = _encoded(column)
+    else:
+      columns[field] = np.ascontiguousarray(column)
+  return columns
+
+
+def _aligned(offset: int) -> int:
+  """Rounds the byte offset up to the alignment of the columns."""
+  return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _data_start(manifest_size: int) -> int:
+  """Returns the byte offset of the columns, which follow the manifest."""
+  return _aligned(_HEADER.size + manifest_size)
+
+
+def _count_path(name: str) -> str:
+  """Returns the path to the reference count of a shared memory block."""
+  return os.path.join(tempfile.gettempdir(),
+                      f"turkish_treebanks_{name.lstrip('/')}.refcount")
+
+
+def _add_reference(name: str, delta: int) -> int:
+  """Adds to the reference count of a shared memory block.
+
+  Args:
+    name: name of the shared memory block.
+    delta: number of references to add, or to remove if negative.
+
+  Raises:
+    FileNotFoundError: shared memory block is already released.
+
+  Returns:
+    Reference count of the shared memory block after adding the references.
+  """
+  import fcntl
+
+  path = _count_path(name)
+  descriptor = os.open(path, os.O_RDWR)
+  try:
+    # The lock serializes updates of the count, and releasing the block when
+    # it drops to zero, across processes.
+    fcntl.flock(descriptor, fcntl.LOCK_EX)
+    count, = _REFERENCE_COUNT.unpack(
+        os.pread(descriptor, _REFERENCE_COUNT.size, 0))
+    if not count:
+      raise FileNotFoundError(f"Shared corpus {name} is released.")
+
+    count += delta
+    os.pwrite(descriptor, _REFERENCE_COUNT.pack(count), 0)
+    if not count:
+      os.remove(path)
+    return count
+  finally:
+    os.close(descriptor)
+
+
+def _open_memory(name: Optional[str], create: bool,
+                 size: int = 0) -> shared_memory.SharedMemory:
+  """Opens a shared memory block, whose lifetime is managed by its count."""
+  memory = shared_memory.SharedMemory(name, create=create, size=size)
+  if _COUNTS_REFERENCES and _TRACKS_ATTACHED_MEMORY:
+    # pylint: disable=protected-access
+    resource_tracker.unregister(memory._name, "shared_memory")
+    # pylint: enable=protected-access
+  return memory
+
+
+def _release_memory(memory: shared_memory.SharedMemory) -> None:
+  """Releases a shared memory block that is no longer referenced."""
+  if _COUNTS_REFERENCES and _TRACKS_ATTACHED_MEMORY:
+    # Unlinking unregisters the block from the resource tracker.
+    # pylint: disable=protected-access
+    resource_tracker.register(memory._name, "shared_memory")
+    # pylint: enable=protected-access
+  memory.unlink()
+
+
+class _Columns:
+  """Columns of a shared corpus, which are no longer readable once closed."""
+
+  __slots__ = ("_columns",)
+
+  def __init__(self, columns: Dict[str, np.ndarray]):
+    self._columns: Optional[Dict[str, np.ndarray]] = columns
+
+  def __getitem__(self, field: str) -> np.ndarray:
+    if self._columns is None:
+      raise ValueError("Shared corpus is closed.")
+    return self._columns[field]
+
+  def string(self, field: str, index: int) -> str:
+    """Decodes the string with given index of a string column."""
+    offset = self[field + _STRING_OFFSET_SUFFIX]
+    return str(self[field + _STRING_SUFFIX][offset[index]:offset[index + 1]],
+               "utf-8")
+
+  def close(self) -> None:
+    self._columns = None
+
+
+class TokenView:
+  """Token annotations in a shared corpus, see twt_pb2.Token."""
+
+  __slots__ = ("_columns", "_index")
+
+  def __init__(self, columns: _Columns, index: int):
+    self._columns = columns
+    self._index = index
+
+  def _string(self, field: str) -> str:
+    """Decodes the annotation of the token with given vocabulary."""
+    return self._columns.string(f"{field}_vocabulary",
+                                self._columns[field][self._index])
+
+  def _features(self, prefix: str) -> Tuple[Feature, ...]:
+    """Decodes features of the token with given column prefix."""
+    offset = self._columns[f"{prefix}_offset"]
+    category = self._columns[f"{prefix}_category"]
+    value = self._columns[f"{prefix}_value"]
+    return tuple(
+        Feature(
+            self._columns.string("feature_category_vocabulary", category[f]),
+            self._columns.string("feature_value_vocabulary", value[f]))
+        for f in range(offset[self._index], offset[self._index + 1]))
+
+  @property
+  def form(self) -> str:
+    return self._string("form")
+
+  @property
+  def lemma(self) -> str:
+    return self._string("lemma")
+
+  @property
+  def tag(self) -> Tag:
+    return Tag(coarse=self._string("coarse"), fine=self._string("fine"))
+
+  @property
+  def feature(self) -> Tuple[Feature, ...]:
+    return self._features("feature")
+
+  @property
+  def head(self) -> int:
+    return int(self._columns["head"][self._index])
+
+  @property
+  def dependency_relation(self) -> str:
+    return self._string("dependency_relation")
+
+  @property
+  def misc_feature(self) -> Tuple[Feature, ...]:
+    return self._features("misc_feature")
+
+  def to_proto(self) -> twt_pb2.Token:
+    """Decodes all annotations of the token into a token protobuf."""
+    coarse, fine = self.tag
+    return twt_pb2.Token(
+        form=self.form,
+        lemma=self.lemma,
+        tag=twt_pb2.Tag(coarse=coarse, fine=fine),
+        feature=(twt_pb2.Feature(category=c, value=v)
+                 for c, v in self.feature),
+        head=self.head,
+        dependency_relation=self.dependency_relation,
+        misc_feature=(twt_pb2.Feature(category=c, value=v)
+                      for c, v in self.misc_feature),
+    )
+
+
+class SentenceView:
+  """Sentence annotations in a shared corpus, see twt_pb2.Sentence."""
+
+  __slots__ = ("_columns", "_index")
+
+  def __init__(self, columns: _Columns, index: int):
+    self._columns = columns
+    self._index = index
+
+  @property
+  def sentence_id(self) -> str:
+    return self._columns.string("sentence_id", self._index)
+
+  @property
+  def text(self) -> str:
+    return self._columns.string("text", self._index)
+
+  @property
+  def token(self) -> Tuple[TokenView, ...]:
+    offset = self._columns["sentence_offset"]
+    return tuple(
+        TokenView(self._columns, t)
+        for t in range(offset[self._index], offset[self._index + 1]))
+
+  def to_proto(self) -> twt_pb2.Sentence:
+    """Decodes all annotations of the sentence into a sentence protobuf."""
+    return twt_pb2.Sentence(
+        sentence_id=self.sentence_id,
+        text=self.text,
+        token=(t.to_proto() for t in self.token),
+    )
+
+
+class SharedCorpus:
+  """Sentences in a shared memory block, which is referenced until closed.
+
+  Views of the sentences can not be read once the corpus is closed.
+  """
+
+  def __init__(self, memory: shared_memory.SharedMemory):
+    """Maps the columns of a shared memory block that is referenced.
+
+    Args:
+      memory: shared memory block that sentences are published into, whose
+          reference is held by the corpus.
+    """
+    self._memory: Optional[shared_memory.SharedMemory] = memory
+    manifest_size, = _HEADER.unpack_from(memory.buf)
+    manifest = json.loads(
+        bytes(memory.buf[_HEADER.size:_HEADER.size + manifest_size]))
+    self._size: int = manifest["sentences"]
+    start = _data_start(manifest_size)
+    self._columns = _Columns({
+        field: np.ndarray((length,), dtype=np.dtype(dtype),
+                          buffer=memory.buf, offset=start + offset)
+        for field, (dtype, length, offset) in manifest["columns"].items()
+    })
+
+  def __enter__(self) -> SharedCorpus:
+    return self
+
+  def __exit__(self, *unused_exc_info) -> None:
+    self.close()
+
+  def __len__(self) -> int:
+    return self._size
+
+  def __getitem__(self, index: int) -> SentenceView:
+    if not -self._size <= index < self._size:
+      raise IndexError(f"Invalid sentence index {index}.")
+    return SentenceView(self._columns, index % self._size)
+
+  def __iter__(self) -> Iterator[SentenceView]:
+    return (SentenceView(self._columns, i) for i in range(self._size))
+
+  @property
+  def name(self) -> str:
+    """Name of the shared memory block, which other processes attach to."""
+    if self._memory is None:
+      raise ValueError("Shared corpus is closed.")
+    return self._memory.name
+
+  def close(self) -> None:
+    """Releases the reference of the corpus to the shared memory block.
+
+    The shared memory block is released if this is its last reference.
+    Closing a corpus that is already closed has no effect.
+    """
+    if self._memory is None:
+      return
+
+    memory, self._memory = self._memory, None
+    # Columns are only referenced through the corpus (and its views), so the
+    # block can be unmapped once they are closed.
+    self._columns.close()
+    memory.close()
+    if _COUNTS_REFERENCES and not _add_reference(memory.name, -1):
+      _release_memory(memory)
+
+
+def publish(arrays: arrays_lib.Arrays,
+            name: Optional[str] = None) -> SharedCorpus:
+  """Publishes sentences into a new shared memory block.
+
+  Args:
+    arrays: columnar annotations of the sentences.
+    name: optional, name of the shared memory block. If unspecified a unique
+        name is chosen.
+
+  Raises:
+    FileExistsError: shared memory block with given name already exists.
+
+  Returns:
+    Corpus of the published sentences, which holds the first reference to the
+    shared memory block.
+  """
+  columns = _columns_of(arrays)
+  layout = {}
+  size = 0
+  for field, column in columns.items():
+    size = _aligned(size)
+    layout[field] = (column.dtype.str, len(column), size)
+    size += column.nbytes
+
+  manifest = json.dumps({
+      "sentences": len(arrays.sentence_id),
+      "columns": layout
+  }).encode("utf-8")
+  start = _data_start(len(manifest))
+
+  memory = _open_memory(name, create=True, size=max(start + size, 1))
+  try:
+    _HEADER.pack_into(memory.buf, 0, len(manifest))
+    memory.buf[_HEADER.size:_HEADER.size + len(manifest)] = manifest
+    for field, column in columns.items():
+      _, length, offset = layout[field]
+      shared = np.ndarray((length,), dtype=column.dtype, buffer=memory.buf,
+                          offset=start + offset)
+      shared[:] = column
+      del shared
+    if _COUNTS_REFERENCES:
+      descriptor = os.open(
+          _count_path(memory.name), os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+      try:
+        os.write(descriptor, _REFERENCE_COUNT.pack(1))
+      finally:
+        os.close(descriptor)
+  except BaseException:
+    memory.close()
+    _release_memory(memory)
+    raise
+  return SharedCorpus(memory)
+
+
+def attach(name: str) -> SharedCorpus:
+  """Attaches to sentences that are published into a shared memory block.
+
+  Args:
+    name: name of the shared memory block, see SharedCorpus.name.
+
+  Raises:
+    FileNotFoundError: shared memory block does not exist, or is released.
+
+  Returns:
+    Corpus of the published sentences, which holds a new reference to the
+    shared memory block.
+  """
+  if _COUNTS_REFERENCES:
+    _add_reference(name, 1)
+  try:
+    return SharedCorpus(_open_memory(name, create=False))
+  except BaseException:
+    if _COUNTS_REFERENCES:
+      _add_reference(name, -1)
+    raise
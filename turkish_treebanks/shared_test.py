@@ -0,0 +1,105 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.shared."""
+
+import multiprocessing
+
+from turkish_treebanks import arrays
+from turkish_treebanks import shared
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+
+_SENTENCES = [
+    twt_pb2.Sentence(
+        sentence_id="a",
+        text="Güzel gün.",
+        token=[
+            twt_pb2.Token(
+                form="Güzel",
+                lemma="güzel",
+                tag=twt_pb2.Tag(coarse="ADJ", fine="Adj"),
+                head=2,
+                dependency_relation="amod",
+                misc_feature=[twt_pb2.Feature(category="SpaceAfter",
+                                              value="Yes")]),
+            twt_pb2.Token(
+                form="gün",
+                lemma="gün",
+                tag=twt_pb2.Tag(coarse="NOUN", fine="Noun"),
+                feature=[
+                    twt_pb2.Feature(category="Case", value="Nom"),
+                    twt_pb2.Feature(category="Number", value="Sing"),
+                ],
+                head=0,
+                dependency_relation="root"),
+        ]),
+    twt_pb2.Sentence(sentence_id="b", text=""),
+]
+
+
+def _read_sentence_ids(name):
+  with shared.attach(name) as corpus:
+    return [s.sentence_id for s in corpus]
+
+
+class SharedCorpusTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.corpus = shared.publish(arrays.from_sentences(_SENTENCES))
+    self.addCleanup(self.corpus.close)
+
+  def test_reads_published_sentences(self):
+    self.assertLen(self.corpus, 2)
+    self.assertEqual(_SENTENCES, [s.to_proto() for s in self.corpus])
+    token = self.corpus[0].token[1]
+    self.assertEqual(("NOUN", "Noun"), token.tag)
+    self.assertEqual((("Case", "Nom"), ("Number", "Sing")), token.feature)
+    self.assertEqual(_SENTENCES[1], self.corpus[-1].to_proto())
+
+  def test_attaches_to_published_sentences(self):
+    with shared.attach(self.corpus.name) as corpus:
+      self.assertEqual(_SENTENCES, [s.to_proto() for s in corpus])
+
+  def test_attaches_from_other_processes(self):
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+      self.assertEqual([["a", "b"]] * 2,
+                       pool.map(_read_sentence_ids, [self.corpus.name] * 2))
+
+  def test_releases_memory_when_last_reference_is_closed(self):
+    name = self.corpus.name
+    attached = shared.attach(name)
+    self.corpus.close()
+    self.assertEqual("a", attached[0].sentence_id)
+    attached.close()
+    with self.assertRaises(FileNotFoundError):
+      shared.attach(name)
+
+  def test_raises_exception_for_closed_corpus(self):
+    sentence = self.corpus[0]
+    self.corpus.close()
+    self.corpus.close()
+    with self.assertRaisesRegex(ValueError, "Shared corpus is closed"):
+      sentence.sentence_id  # pylint: disable=pointless-statement
+
+  def test_raises_exception_for_invalid_index(self):
+    with self.assertRaisesRegex(IndexError, "Invalid sentence index 2"):
+      self.corpus[2]  # pylint: disable=pointless-statement
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,105 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Sources of CoNLL-U format treebank files beyond the treebank sections.
+
+A source is a path to a treebank file or a glob pattern that matches the
+paths of treebank files, such as the shards of a treebank. Treebank files
+that are compressed with gzip, xz or bzip2 (as told by their '.gz', '.xz' or
+'.bz2' suffix) are decompressed as they are read.
+
+Sources resolve into paths in a deterministic order, which is the order the
+sources are given in, and the sorted order of the paths that each glob
+pattern matches. Since treebank splits are assigned by the position of
+sentences in their treebank file, splits of the sentences of the sources are
+reproducible as long as their treebank files do not change.
+"""
+
+import bz2
+import glob
+import gzip
+import lzma
+import os
+from typing import IO, Callable, Dict, Iterable, List, Union
+
+Source = Union[str, os.PathLike]
+Sources = Union[Source, Iterable[Source]]
+
+_GLOB_CHARACTERS = frozenset("*?[")
+_OPENERS_BY_SUFFIX: Dict[str, Callable[..., IO[str]]] = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+    ".bz2": bz2.open,
+}
+
+
+def is_compressed(path: str) -> bool:
+  """Checks if the treebank file at the path is compressed."""
+  return os.path.splitext(path)[1] in _OPENERS_BY_SUFFIX
+
+
+def open_text(path: str) -> IO[str]:
+  """Opens the treebank file at the path for reading text.
+
+  Args:
+    path: path to a CoNLL-U format treebank file, which is decompressed as it
+        is read if it is compressed.
+
+  Raises:
+    OSError: treebank file could not be opened.
+
+  Returns:
+    Text file object that reads the UTF-8 decoded contents of the file.
+  """
+  opener = _OPENERS_BY_SUFFIX.get(os.path.splitext(path)[1], open)
+  return opener(path, "rt", encoding="utf-8")
+
+
+def resolve(sources: Sources) -> List[str]:
+  """Resolves sources into paths of treebank files.
+
+  Args:
+    sources: path to a treebank file, glob pattern (which can use '**' to
+        match paths recursively), or an iterable of paths and patterns.
+
+  Raises:
+    ValueError: no sources are given, a glob pattern does not match any
+        files, or a path is not a file.
+
+  Returns:
+    Paths of the treebank files of the sources, in the order of the sources,
+    and in sorted order for each glob pattern.
+  """
+  if isinstance(sources, (str, os.PathLike)):
+    sources = [sources]
+
+  paths = []
+  for source in sources:
+    source = os.fspath(source)
+    if _GLOB_CHARACTERS.intersection(source):
+      matches = sorted(
+          p for p in glob.glob(source, recursive=True) if os.path.isfile(p))
+      if not matches:
+        raise ValueError(f"Glob pattern '{source}' does not match any"
+                         f" treebank files.")
+      paths.extend(matches)
+    elif os.path.isfile(source):
+      paths.append(source)
+    else:
+      raise ValueError(f"Treebank file '{source}' does not exist.")
+
+  if not paths:
+    raise ValueError("No treebank file sources are given.")
+  return paths
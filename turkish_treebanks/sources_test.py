@@ -0,0 +1,91 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.sources."""
+
+import bz2
+import gzip
+import lzma
+import os
+import pathlib
+
+from turkish_treebanks import sources
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+_CONTENT = "# sent_id = 1\n# text = Evet\n1\tEvet\n\n"
+
+
+class SourcesTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.directory = self.create_tempdir()
+    for name in ("b-00001.conllu", "b-00000.conllu", "a.conllu"):
+      self.directory.create_file(name, content=_CONTENT)
+    self.directory.create_file("nested/c-00000.conllu", content=_CONTENT)
+
+  def _path(self, name):
+    return os.path.join(self.directory.full_path, name)
+
+  def test_resolves_paths_in_order_of_sources(self):
+    expected = [self._path("b-00001.conllu"), self._path("a.conllu")]
+    self.assertEqual(expected, sources.resolve(expected))
+
+  def test_resolves_single_path(self):
+    path = pathlib.Path(self._path("a.conllu"))
+    self.assertEqual([str(path)], sources.resolve(path))
+
+  def test_resolves_glob_patterns_in_sorted_order(self):
+    self.assertEqual(
+        [
+            self._path("a.conllu"),
+            self._path("b-00000.conllu"),
+            self._path("b-00001.conllu"),
+            self._path("b-00000.conllu"),
+            self._path("nested/c-00000.conllu"),
+        ],
+        sources.resolve([
+            self._path("*.conllu"),
+            self._path("**/*-00000.conllu"),
+        ]))
+
+  @parameterized.parameters("missing.conllu", "missing-*.conllu", "nested")
+  def test_raises_exception_for_missing_treebank_files(self, name):
+    with self.assertRaisesRegex(ValueError, "does not (exist|match)"):
+      sources.resolve(self._path(name))
+
+  def test_raises_exception_for_no_sources(self):
+    with self.assertRaisesRegex(ValueError, "No treebank file sources"):
+      sources.resolve([])
+
+  @parameterized.parameters(
+      ("treebank.conllu", open, False),
+      ("treebank.conllu.gz", gzip.open, True),
+      ("treebank.conllu.xz", lzma.open, True),
+      ("treebank.conllu.bz2", bz2.open, True),
+  )
+  def test_opens_treebank_files(self, name, opener, compressed):
+    path = self._path(name)
+    with opener(path, "wt", encoding="utf-8") as writer:
+      writer.write(_CONTENT)
+    self.assertEqual(compressed, sources.is_compressed(path))
+    with sources.open_text(path) as reader:
+      self.assertEqual(_CONTENT, reader.read())
+
+
+if __name__ == "__main__":
+  absltest.main()
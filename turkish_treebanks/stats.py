@@ -0,0 +1,136 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Mergeable frequency statistics of Turkish Web Treebank sentences.
+
+Statistics are exact counts, so statistics of disjoint sets of sentences (for
+example, of sections, splits or shards that are computed in separate
+processes) merge into the same statistics as if they were computed at once.
+"""
+
+from __future__ import annotations
+
+import collections
+from typing import TYPE_CHECKING, Counter, Iterable, NamedTuple, Union
+
+from turkish_treebanks import twt_pb2
+
+if TYPE_CHECKING:
+  from turkish_treebanks import compact
+
+  _Sentence = Union[twt_pb2.Sentence, compact.Sentence]
+
+# Fields of statistics which are frequency tables.
+_COUNTERS = ("coarse", "fine", "dependency_relation", "feature_category",
+             "feature", "lemma", "head_distance", "sentence_length")
+
+
+class Stats(NamedTuple):
+  """Frequency statistics of a set of sentences.
+
+  Attributes:
+    sentence_count: number of sentences.
+    token_count: number of tokens.
+    coarse: number of tokens with each coarse part-of-speech tag.
+    fine: number of tokens with each fine part-of-speech tag.
+    dependency_relation: number of tokens with each dependency relation.
+    feature_category: number of morphological features with each category.
+    feature: number of morphological features with each category=value pair,
+        such as 'Case=Loc'.
+    lemma: number of tokens with each lemma.
+    head_distance: number of tokens with each signed distance from the token
+        to its head (positive if the head follows the token). Root tokens are
+        not counted.
+    sentence_length: number of sentences with each number of tokens.
+  """
+  sentence_count: int
+  token_count: int
+  coarse: Counter[str]
+  fine: Counter[str]
+  dependency_relation: Counter[str]
+  feature_category: Counter[str]
+  feature: Counter[str]
+  lemma: Counter[str]
+  head_distance: Counter[int]
+  sentence_length: Counter[int]
+
+
+def empty() -> Stats:
+  """Returns statistics of no sentences."""
+  return Stats(0, 0, *(collections.Counter() for _ in _COUNTERS))
+
+
+def from_sentences(sentences: Iterable[_Sentence]) -> Stats:
+  """Computes statistics of sentences in a single streaming pass.
+
+  Args:
+    sentences: sentence protobufs or compact sentences.
+
+  Returns:
+    Frequency statistics of the sentences.
+  """
+  stats = empty()
+  sentence_count = token_count = 0
+  for sentence in sentences:
+    sentence_count += 1
+    token_count += len(sentence.token)
+    stats.sentence_length[len(sentence.token)] += 1
+    for position, token in enumerate(sentence.token, start=1):
+      stats.coarse[token.tag.coarse] += 1
+      stats.fine[token.tag.fine] += 1
+      stats.dependency_relation[token.dependency_relation] += 1
+      stats.lemma[token.lemma] += 1
+      if token.head:
+        stats.head_distance[token.head - position] += 1
+      for feature in token.feature:
+        stats.feature_category[feature.category] += 1
+        stats.feature[f"{feature.category}={feature.value}"] += 1
+  return stats._replace(sentence_count=sentence_count, token_count=token_count)
+
+
+def merge(partial_stats: Iterable[Stats]) -> Stats:
+  """Merges statistics of disjoint sets of sentences.
+
+  Args:
+    partial_stats: statistics of disjoint sets of sentences.
+
+  Returns:
+    Statistics of the union of the sets of sentences.
+  """
+  merged = empty()
+  sentence_count = token_count = 0
+  for stats in partial_stats:
+    sentence_count += stats.sentence_count
+    token_count += stats.token_count
+    for field in _COUNTERS:
+      getattr(merged, field).update(getattr(stats, field))
+  return merged._replace(sentence_count=sentence_count,
+                         token_count=token_count)
+
+
+def to_proto(stats: Stats) -> twt_pb2.Statistics:
+  """Converts statistics into a statistics protobuf."""
+  message = twt_pb2.Statistics(sentence_count=stats.sentence_count,
+                               token_count=stats.token_count)
+  for field in _COUNTERS:
+    getattr(message, field).update(getattr(stats, field))
+  return message
+
+
+def from_proto(message: twt_pb2.Statistics) -> Stats:
+  """Converts a statistics protobuf into statistics."""
+  return Stats(message.sentence_count, message.token_count,
+               *(collections.Counter(dict(getattr(message, f)))
+                 for f in _COUNTERS))
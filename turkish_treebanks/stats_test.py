@@ -0,0 +1,65 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.stats."""
+
+from turkish_treebanks import stats
+from turkish_treebanks import test_util
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+
+
+_SENTENCES = (
+    twt_pb2.Sentence(token=[
+        test_util.token("ev", "NOUN", 2, "npadvmod", Case="Loc"),
+        test_util.token("uyu", "VERB", 0, "ROOT"),
+    ]),
+    twt_pb2.Sentence(token=[
+        test_util.token("okul", "NOUN", 3, "nmod", Case="Loc"),
+        test_util.token("kitap", "NOUN", 3, "dobj", Case="Bare"),
+        test_util.token("oku", "VERB", 0, "ROOT"),
+        test_util.token(".", "PUNCT", 3, "punct"),
+    ]),
+)
+
+
+class StatsTest(absltest.TestCase):
+
+  def test_computes_statistics(self):
+    actual = stats.from_sentences(_SENTENCES)
+    self.assertEqual(2, actual.sentence_count)
+    self.assertEqual(6, actual.token_count)
+    self.assertEqual({"NOUN": 3, "VERB": 2, "PUNCT": 1}, actual.coarse)
+    self.assertEqual({"Case": 3}, actual.feature_category)
+    self.assertEqual({"Case=Loc": 2, "Case=Bare": 1}, actual.feature)
+    self.assertEqual({1: 2, 2: 1, -1: 1}, actual.head_distance)
+    self.assertEqual({2: 1, 4: 1}, actual.sentence_length)
+
+  def test_merges_statistics_exactly(self):
+    expected = stats.from_sentences(_SENTENCES)
+    shards = [stats.from_sentences(_SENTENCES[:1]),
+              stats.from_sentences(_SENTENCES[1:]),
+              stats.empty()]
+    self.assertEqual(expected, stats.merge(shards))
+    self.assertEqual(expected, stats.merge([expected]))
+
+  def test_converts_statistics_to_and_from_proto(self):
+    expected = stats.from_sentences(_SENTENCES)
+    self.assertEqual(expected, stats.from_proto(stats.to_proto(expected)))
+
+
+if __name__ == "__main__":
+  absltest.main()
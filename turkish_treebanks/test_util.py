@@ -0,0 +1,52 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fixtures shared by the tests of turkish_treebanks."""
+
+from typing import Optional
+
+from turkish_treebanks import twt_pb2
+
+
+def token(form: str,
+          coarse: str,
+          head: int,
+          dependency_relation: str,
+          lemma: Optional[str] = None,
+          **features: str) -> twt_pb2.Token:
+  """Creates a token protobuf for tests.
+
+  Args:
+    form: surface form of the token.
+    coarse: part-of-speech tag of the token, which is used as both its coarse
+        and fine tag.
+    head: head of the token.
+    dependency_relation: dependency relation of the token.
+    lemma: optional, lemma of the token. If unspecified the lowercased form is
+        used.
+    **features: morphological features of the token, by category.
+
+  Returns:
+    Token protobuf with given annotations.
+  """
+  return twt_pb2.Token(
+      form=form,
+      lemma=form.lower() if lemma is None else lemma,
+      tag=twt_pb2.Tag(coarse=coarse, fine=coarse),
+      feature=(twt_pb2.Feature(category=c, value=v)
+               for c, v in features.items()),
+      head=head,
+      dependency_relation=dependency_relation,
+  )
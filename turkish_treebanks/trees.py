@@ -0,0 +1,259 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Dependency tree structures of Turkish Web Treebank sentences.
+
+Tree structures of all sentences are computed at once from the heads of their
+tokens with vectorized NumPy operations, one pass per tree level, and are
+stored in flat arrays that are indexed by token positions. As in
+turkish_treebanks.arrays, tokens are identified by their position in the
+sequence of all tokens of the sentences, and sentences are delimited by
+offsets into it.
+"""
+
+from typing import Iterable, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from turkish_treebanks import compact
+from turkish_treebanks import twt_pb2
+
+_Sentence = Union[twt_pb2.Sentence, compact.Sentence]
+
+
+class Trees(NamedTuple):
+  """Dependency tree structures of a sequence of sentences.
+
+  Attributes:
+    sentence_offset: offsets of the first token of each sentence, followed by
+        the total number of tokens. Tokens of the i-th sentence are in
+        [sentence_offset[i], sentence_offset[i + 1]).
+    head: position of the head of each token, or -1 for the root.
+    child_offset: offsets of the first child of each token into child,
+        followed by the total number of children. Children of token t are
+        child[child_offset[t]:child_offset[t + 1]].
+    child: positions of the children of each token, in ascending order.
+    depth: depth of each token in its tree, 0 for the root.
+    subtree_start: position of the first token in the subtree of each token.
+    subtree_end: position after the last token in the subtree of each token.
+    subtree_size: number of tokens in the subtree of each token.
+    preorder: rank of each token in the preorder traversal of the trees, so
+        that the subtree of token t has ranks in
+        [preorder[t], preorder[t] + subtree_size[t]).
+    projective: whether the tree of each sentence is projective, that is,
+        whether none of its arcs cross, including the arcs of its roots which
+        are from an artificial root before the first token.
+  """
+  sentence_offset: np.ndarray
+  head: np.ndarray
+  child_offset: np.ndarray
+  child: np.ndarray
+  depth: np.ndarray
+  subtree_start: np.ndarray
+  subtree_end: np.ndarray
+  subtree_size: np.ndarray
+  preorder: np.ndarray
+  projective: np.ndarray
+
+
+def _levels(head: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray]]:
+  """Computes depths of tokens and groups token positions by their depth.
+
+  Args:
+    head: position of the head of each token, or -1 for the root.
+
+  Raises:
+    ValueError: heads of some of the tokens form a cycle.
+
+  Returns:
+    Depth of each token, together with ascending positions of the tokens at
+    each depth, starting from the roots.
+  """
+  depth = np.full(len(head), -1, dtype=np.int32)
+  has_head = head >= 0
+  safe_head = np.where(has_head, head, 0)
+  levels = []
+  level = np.flatnonzero(~has_head)
+  while level.size:
+    depth[level] = len(levels)
+    levels.append(level)
+    level = np.flatnonzero(has_head & (depth == -1)
+                           & (depth[safe_head] == len(levels) - 1))
+
+  if np.any(depth == -1):
+    raise ValueError(f"Heads of the tokens at positions"
+                     f" {np.flatnonzero(depth == -1).tolist()} form a cycle.")
+  return depth, levels
+
+
+def from_heads(head: Sequence[int], sentence_offset: Sequence[int]) -> Trees:
+  """Computes dependency tree structures from heads of tokens.
+
+  Args:
+    head: head of each token, as annotated (1-based index of the head token
+        within the sentence, or 0 for the root).
+    sentence_offset: offsets of the first token of each sentence into head,
+        followed by the total number of tokens.
+
+  Raises:
+    ValueError: heads of some of the tokens are out of the range of their
+        sentence, or form a cycle.
+
+  Returns:
+    Dependency tree structures of the sentences.
+  """
+  sentence_offset = np.asarray(sentence_offset, dtype=np.int64)
+  head = np.asarray(head, dtype=np.int64)
+  length = np.diff(sentence_offset)
+  token_count = len(head)
+  sentence = np.repeat(np.arange(len(length)), length)
+  out_of_range = np.flatnonzero((head < 0) | (head > length[sentence]))
+  if out_of_range.size:
+    raise ValueError(f"Heads of the tokens at positions {out_of_range.tolist()}"
+                     f" are out of the range of their sentence.")
+
+  head = np.where(head > 0, sentence_offset[:-1][sentence] + head - 1, -1)
+  dependent = np.flatnonzero(head >= 0)
+  child = dependent[np.argsort(head[dependent], kind="stable")]
+  child_offset = np.zeros(token_count + 1, dtype=np.int64)
+  np.cumsum(np.bincount(head[dependent], minlength=token_count),
+            out=child_offset[1:])
+
+  depth, levels = _levels(head)
+
+  # Subtrees are accumulated bottom up, from the deepest level.
+  position = np.arange(token_count, dtype=np.int64)
+  subtree_start = position.copy()
+  subtree_end = position + 1
+  subtree_size = np.ones(token_count, dtype=np.int64)
+  for level in reversed(levels[1:]):
+    level_head = head[level]
+    np.minimum.at(subtree_start, level_head, subtree_start[level])
+    np.maximum.at(subtree_end, level_head, subtree_end[level])
+    np.add.at(subtree_size, level_head, subtree_size[level])
+
+  # Preorder ranks are assigned top down. Each child is ranked after its head
+  # and the subtrees of its preceding siblings.
+  preorder = np.zeros(token_count, dtype=np.int64)
+  if levels:
+    roots = levels[0]
+    preorder[roots] = np.cumsum(subtree_size[roots]) - subtree_size[roots]
+  for level in levels[1:]:
+    level_head = head[level]
+    siblings = level[np.argsort(level_head, kind="stable")]
+    sibling_head = head[siblings]
+    preceding = np.cumsum(subtree_size[siblings]) - subtree_size[siblings]
+    first = np.ones(len(siblings), dtype=bool)
+    first[1:] = sibling_head[1:] != sibling_head[:-1]
+    first_sibling = np.maximum.accumulate(
+        np.where(first, np.arange(len(siblings)), 0))
+    preorder[siblings] = (preorder[sibling_head] + 1 + preceding
+                          - preceding[first_sibling])
+
+  # A tree is projective if and only if subtrees of all of its tokens are
+  # contiguous.
+  discontiguous = subtree_end - subtree_start != subtree_size
+  projective = np.bincount(sentence[discontiguous],
+                           minlength=len(length)) == 0
+
+  return Trees(
+      sentence_offset=sentence_offset,
+      head=head,
+      child_offset=child_offset,
+      child=child,
+      depth=depth,
+      subtree_start=subtree_start,
+      subtree_end=subtree_end,
+      subtree_size=subtree_size,
+      preorder=preorder,
+      projective=projective,
+  )
+
+
+def from_sentences(sentences: Iterable[_Sentence]) -> Trees:
+  """Computes dependency tree structures of sentences.
+
+  Args:
+    sentences: sentence protobufs or compact sentences.
+
+  Raises:
+    ValueError: heads of some of the tokens are out of the range of their
+        sentence, or form a cycle.
+
+  Returns:
+    Dependency tree structures of the sentences.
+  """
+  head = []
+  sentence_offset = [0]
+  for sentence in sentences:
+    head.extend(t.head for t in sentence.token)
+    sentence_offset.append(len(head))
+  return from_heads(head, sentence_offset)
+
+
+def children(trees: Trees, token: int) -> np.ndarray:
+  """Returns positions of the children of the token, in ascending order."""
+  return trees.child[trees.child_offset[token]:trees.child_offset[token + 1]]
+
+
+def ancestors(trees: Trees, token: int) -> List[int]:
+  """Returns positions of the ancestors of the token, from its head upwards."""
+  path = []
+  token = trees.head[token]
+  while token >= 0:
+    path.append(int(token))
+    token = trees.head[token]
+  return path
+
+
+def is_ancestor(trees: Trees, ancestor: Union[int, np.ndarray],
+                descendant: Union[int, np.ndarray]) -> Union[bool, np.ndarray]:
+  """Checks if tokens are proper ancestors of other tokens in constant time.
+
+  Args:
+    trees: dependency tree structures.
+    ancestor: position of a token, or an array of positions.
+    descendant: position of a token, or an array of positions.
+
+  Returns:
+    Whether the ancestor token is a proper ancestor of the descendant token,
+    element-wise if arrays of positions are given.
+  """
+  start = trees.preorder[ancestor]
+  rank = trees.preorder[descendant]
+  return (start < rank) & (rank < start + trees.subtree_size[ancestor])
+
+
+def save(trees: Trees, path: str) -> None:
+  """Saves dependency tree structures into a NumPy .npz file.
+
+  Args:
+    trees: dependency tree structures.
+    path: path to the .npz file.
+  """
+  np.savez(path, **trees._asdict())
+
+
+def load(path: str) -> Trees:
+  """Loads dependency tree structures from a NumPy .npz file.
+
+  Args:
+    path: path to an .npz file that is written by save.
+
+  Returns:
+    Dependency tree structures that are stored in the file.
+  """
+  with np.load(path, allow_pickle=False) as stored:
+    return Trees(**{field: stored[field] for field in Trees._fields})
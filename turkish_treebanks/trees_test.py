@@ -0,0 +1,128 @@
+# coding=utf-8
+# Copyright 2020 The Google Research Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for turkish_treebanks.trees."""
+
+import os
+
+import numpy as np
+from turkish_treebanks import trees
+from turkish_treebanks import twt_pb2
+
+from absl.testing import absltest
+
+# Heads of a projective sentence, an empty sentence and a non-projective
+# sentence, whose arcs 3 -> 1 and 4 -> 2 cross.
+_HEADS = [[2, 0, 2], [], [3, 4, 0, 3]]
+
+
+def _sentences():
+  return [
+      twt_pb2.Sentence(token=[twt_pb2.Token(head=h) for h in heads])
+      for heads in _HEADS
+  ]
+
+
+class TreesTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.trees = trees.from_sentences(_sentences())
+
+  def test_computes_heads_and_children(self):
+    np.testing.assert_array_equal([1, -1, 1, 5, 6, -1, 5], self.trees.head)
+    self.assertEqual([0, 2], trees.children(self.trees, 1).tolist())
+    self.assertEqual([3, 6], trees.children(self.trees, 5).tolist())
+    self.assertEqual([4], trees.children(self.trees, 6).tolist())
+    self.assertEqual([], trees.children(self.trees, 0).tolist())
+
+  def test_computes_depths(self):
+    np.testing.assert_array_equal([1, 0, 1, 1, 2, 0, 1], self.trees.depth)
+
+  def test_computes_subtrees(self):
+    np.testing.assert_array_equal([0, 0, 2, 3, 4, 3, 4],
+                                  self.trees.subtree_start)
+    np.testing.assert_array_equal([1, 3, 3, 4, 5, 7, 7],
+                                  self.trees.subtree_end)
+    np.testing.assert_array_equal([1, 3, 1, 1, 1, 4, 2],
+                                  self.trees.subtree_size)
+
+  def test_finds_ancestors(self):
+    self.assertEqual([6, 5], trees.ancestors(self.trees, 4))
+    self.assertEqual([], trees.ancestors(self.trees, 5))
+    self.assertTrue(trees.is_ancestor(self.trees, 5, 4))
+    self.assertFalse(trees.is_ancestor(self.trees, 4, 5))
+    self.assertFalse(trees.is_ancestor(self.trees, 5, 5))
+    self.assertFalse(trees.is_ancestor(self.trees, 1, 4))
+    np.testing.assert_array_equal(
+        [True, False, True],
+        trees.is_ancestor(self.trees, np.array([1, 3, 6]),
+                          np.array([0, 4, 4])))
+
+  def test_checks_projectivity(self):
+    np.testing.assert_array_equal([True, True, False], self.trees.projective)
+
+  def test_agrees_with_walking_random_trees(self):
+    random = np.random.default_rng(0)
+    heads = []
+    for _ in range(50):
+      length = random.integers(1, 12)
+      # Each token, in a random order, is attached to a token before it.
+      order = random.permutation(length)
+      head = [0] * length
+      for i in range(1, length):
+        head[order[i]] = int(order[random.integers(0, i)]) + 1
+      heads.append(head)
+    random_trees = trees.from_heads(
+        [h for head in heads for h in head],
+        np.cumsum([0] + [len(head) for head in heads]))
+
+    for token in range(len(random_trees.head)):
+      token_ancestors = trees.ancestors(random_trees, token)
+      self.assertLen(token_ancestors, random_trees.depth[token])
+      descendants = [
+          t for t in range(len(random_trees.head))
+          if token in trees.ancestors(random_trees, t)
+      ]
+      self.assertLen(descendants, random_trees.subtree_size[token] - 1)
+      self.assertEqual(
+          descendants,
+          np.flatnonzero(trees.is_ancestor(
+              random_trees, token, np.arange(len(random_trees.head)))).tolist())
+
+    for sentence, head in enumerate(heads):
+      # Root arcs are from position 0.
+      arcs = [(min(d, h), max(d, h)) for d, h in enumerate(head, start=1)]
+      crossing = any(a < c < b < d for a, b in arcs for c, d in arcs)
+      self.assertEqual(not crossing, random_trees.projective[sentence])
+
+  def test_saves_and_loads_trees(self):
+    path = os.path.join(self.create_tempdir().full_path, "trees.npz")
+    trees.save(self.trees, path)
+    loaded = trees.load(path)
+    for expected, actual in zip(self.trees, loaded):
+      np.testing.assert_array_equal(expected, actual)
+
+  def test_raises_exception_for_cycles(self):
+    with self.assertRaisesRegex(ValueError, r"positions \[0, 1\] form a cycle"):
+      trees.from_heads([2, 1, 0], [0, 3])
+
+  def test_raises_exception_for_out_of_range_heads(self):
+    with self.assertRaisesRegex(ValueError, r"positions \[1\] are out of"):
+      trees.from_heads([0, 3], [0, 2])
+
+
+if __name__ == "__main__":
+  absltest.main()